@@ -0,0 +1,76 @@
+# =============================================================================
+#  Filename: bench_dedup.py
+#
+#  Short Description: Benchmark near-duplicate detection on recorded results
+#
+#  Creation date: 2025-10-08
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Benchmark for NewsLetter2.dedup on a fixture of realistic Google News results.
+
+The fixture labels every result with the story it covers ("_story"), so the
+benchmark reports pairwise precision/recall of the collapsed groups, the
+number of Editor generations saved, and the time spent collapsing.
+
+Usage:
+    uv run python benchmarks/bench_dedup.py [--distance N] [--repeat N]
+"""
+
+import argparse
+import json
+import time
+from itertools import combinations
+from pathlib import Path
+
+from NewsLetter2.dedup import NEAR_DUP_MAX_DISTANCE, find_duplicate_groups, story_text
+from NewsLetter2.models import RawNewsArticle
+from NewsLetter2.tools import _to_article
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "google_news_nvidia.json"
+
+
+def _pairs(groups: list[list[int]]) -> set[tuple[int, int]]:
+    """Return all index pairs that share a group."""
+    return {pair for group in groups for pair in combinations(sorted(group), 2)}
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--distance", type=int, default=NEAR_DUP_MAX_DISTANCE)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    
+    items = json.loads(FIXTURE.read_text())["news_results"]
+    articles = [RawNewsArticle(**_to_article(item)) for item in items]
+    texts = [story_text(a.title, a.snippet) for a in articles]
+    
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        groups = find_duplicate_groups(texts, args.distance)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+    
+    stories: dict[str, list[int]] = {}
+    for idx, item in enumerate(items):
+        stories.setdefault(item["_story"], []).append(idx)
+    
+    predicted = _pairs(groups)
+    expected = _pairs(list(stories.values()))
+    true_positives = len(predicted & expected)
+    precision = true_positives / len(predicted) if predicted else 1.0
+    recall = true_positives / len(expected) if expected else 1.0
+    
+    print(f"Fixture:            {FIXTURE.name} ({len(items)} results, {len(stories)} stories)")
+    print(f"Max distance:       {args.distance} bits")
+    print(f"Collapsed to:       {len(groups)} articles")
+    print(f"Editor calls saved: {len(items) - len(groups)}")
+    print(f"Pair precision:     {precision:.2f}")
+    print(f"Pair recall:        {recall:.2f}")
+    print(f"Time per run:       {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
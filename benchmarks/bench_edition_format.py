@@ -0,0 +1,116 @@
+# =============================================================================
+#  Filename: bench_edition_format.py
+#
+#  Short Description: Benchmark cached edition formats (JSON vs block)
+#
+#  Creation date: 2025-10-10
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Benchmark of the on-disk edition formats used by CacheManager.
+
+Builds an archive of synthetic editions (articles from the Google News
+fixture, with editorial and detailed articles of realistic length) in both
+the legacy pretty-printed JSON format and the compressed block format, then
+reports disk footprint and read latency for a full load, the landing-page
+load, and opening a single article.
+
+Usage:
+    uv run python benchmarks/bench_edition_format.py [--editions N] [--repeat N]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.models import Editorial, Newsletter, ProcessedNewsArticle
+from NewsLetter2.tools import _to_article
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "google_news_nvidia.json"
+
+
+def _sentences(rng: random.Random, words: list[str], count: int) -> str:
+    """Return count pseudo-random sentences built from the fixture vocabulary."""
+    sentences = []
+    for _ in range(count):
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(14, 26)))
+        sentences.append(sentence.capitalize() + ".")
+    return " ".join(sentences)
+
+
+def build_newsletter(rng: random.Random, items: list[dict]) -> Newsletter:
+    """Build one synthetic edition with realistic text lengths."""
+    words = " ".join(f"{item['title']} {item['snippet']}" for item in items).split()
+    articles = []
+    for item in rng.sample(items, 10):
+        raw = _to_article(item)
+        raw.pop("thumbnail")
+        articles.append(
+            ProcessedNewsArticle(
+                **raw,
+                short_summary=_sentences(rng, words, 3),
+                detailed_article=_sentences(rng, words, 25),
+            )
+        )
+    editorial = Editorial(
+        headline=_sentences(rng, words, 1)[:80],
+        narrative=_sentences(rng, words, 45),
+        trend_analysis=_sentences(rng, words, 8),
+        product_leader_insights=_sentences(rng, words, 8),
+        competition_analysis=_sentences(rng, words, 8),
+    )
+    return Newsletter(editorial=editorial, articles=articles)
+
+
+def _time_ms(func, repeat: int) -> float:
+    """Return the mean wall time of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--editions", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    
+    logger.remove()
+    rng = random.Random(0)
+    items = json.loads(FIXTURE.read_text())["news_results"]
+    newsletters = [build_newsletter(rng, items) for _ in range(args.editions)]
+    today = datetime.now()
+    
+    print(f"Archive: {args.editions} editions")
+    print(f"{'format':<8}{'disk KiB':>12}{'per edition':>14}{'full ms':>10}{'landing ms':>12}{'article ms':>12}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for cache_format in ("json", "block"):
+            manager = CacheManager(str(Path(tmp) / cache_format), cache_format=cache_format)
+            for days, newsletter in enumerate(newsletters):
+                manager.save_to_cache(newsletter, today - timedelta(days=days))
+            
+            disk = sum(record.size for record in manager.list_editions())
+            full_ms = _time_ms(lambda: manager.load_from_cache(today), args.repeat)
+            landing_ms = _time_ms(lambda: manager.load_preview(today), args.repeat)
+            article_ms = _time_ms(lambda: manager.load_article(3, today), args.repeat)
+            
+            print(
+                f"{cache_format:<8}{disk / 1024:>12.1f}{disk / args.editions / 1024:>12.1f}K"
+                f"{full_ms:>10.2f}{landing_ms:>12.2f}{article_ms:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# =============================================================================
+#  Filename: bench_generation.py
+#
+#  Short Description: Offline end-to-end benchmark of newsletter generation
+#
+#  Creation date: 2025-10-13
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+End-to-end benchmark of run_newsletter_generation without API credit.
+
+The real crew runs against the local OpenAI-compatible mock server
+(benchmarks/mock_openai.py, simulated latency and generation rate), which
+also answers the SerpAPI searches from the recorded fixture. Both go through
+the application's pooled HTTP clients, and the connections each run opens
+are reported. Every run starts from an
+empty cache directory and reports wall time, per-stage wall time, request
+and token counts, and peak memory. Results are written to a JSON file that
+a later run can be compared against with --compare. With --throttle-rate a
+share of the OpenAI and SerpAPI requests is refused with HTTP 429 and a
+Retry-After header.
+
+Usage:
+    uv run python benchmarks/bench_generation.py [--mode sequential parallel pipelined]
+        [--repeat N] [--latency S] [--tps N] [--search-latency S]
+        [--throttle-rate R] [--retry-after S]
+        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from mock_openai import MockOpenAIServer, MockSettings
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+STAGES = ("reporter", "editor", "senior_editor")
+
+# Metrics compared against a baseline (lower is better for all of them)
+COMPARED_METRICS = ("wall_s", "reporter_s", "editor_s", "senior_editor_s", "total_tokens", "peak_mb")
+
+
+def _configure_environment(server: MockOpenAIServer, workdir: Path, args: argparse.Namespace) -> None:
+    """
+    Point the application at the local stand-ins before it is imported.
+    
+    Args:
+        server: Running mock server
+        workdir: Empty directory used as the working directory (all caches)
+        args: Command-line arguments
+    """
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "sk-benchmark",
+            "OPENAI_BASE_URL": server.base_url,
+            "SERP_API_KEY": "benchmark",
+            "NEWSLETTER_LLM_CACHE": "0",
+            "NEWSLETTER_SEARCH_CACHE_TTL": "0",
+            "NEWSLETTER_INCREMENTAL": "0",
+            "NEWSLETTER_EDITOR_CONCURRENCY": str(args.concurrency),
+            "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+            "CREWAI_DISABLE_TELEMETRY": "true",
+            "OTEL_SDK_DISABLED": "true",
+            # Skips CrewAI's interactive first-run trace prompt (a 20 s wait)
+            "CREWAI_TESTING": "true",
+        }
+    )
+    os.chdir(workdir)
+
+
+def _run_once(server: MockOpenAIServer, mode: str) -> dict[str, Any]:
+    """
+    Generate one newsletter and collect its metrics.
+    
+    Args:
+        server: Running mock server
+        mode: "sequential" (one crew), "parallel" (staged pipeline) or
+            "pipelined" (staged pipeline, editorial overlapping the details)
+    
+    Returns:
+        Metrics of the run
+    """
+    from NewsLetter2.crew import run_newsletter_generation
+    from NewsLetter2.http_pool import http_pool
+    
+    server.reset_stats()
+    pool_before = http_pool.stats()
+    tracemalloc.start()
+    start = time.perf_counter()
+    
+    newsletter = run_newsletter_generation(
+        parallel_editor=(mode != "sequential"), pipelined=(mode == "pipelined")
+    )
+    
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    stages = server.stats()
+    pool_after = http_pool.stats()
+    result: dict[str, Any] = {
+        "mode": mode,
+        "wall_s": round(wall, 3),
+        "articles": len(newsletter.articles),
+        "search_calls": server.searches(),
+        "throttled": server.throttled(),
+        # Connections opened during the run by the LLM and search clients
+        "llm_connections": pool_after["llm"]["connections"] - pool_before["llm"]["connections"],
+        "search_connections": pool_after["session"]["connections"] - pool_before["session"]["connections"],
+        "peak_mb": round(peak / 2**20, 1),
+        "stages": stages,
+    }
+    for stage in STAGES:
+        stats = stages.get(stage)
+        result[f"{stage}_s"] = (
+            round(stats["end_s"] - stats["start_s"], 3) if stats else None
+        )
+    result["requests"] = sum(s["requests"] for s in stages.values())
+    result["prompt_tokens"] = sum(s["prompt_tokens"] for s in stages.values())
+    result["completion_tokens"] = sum(s["completion_tokens"] for s in stages.values())
+    result["total_tokens"] = result["prompt_tokens"] + result["completion_tokens"]
+    return result
+
+
+def _summarize(runs: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Return the median of every numeric metric per mode."""
+    summary: dict[str, dict[str, Any]] = {}
+    for mode in dict.fromkeys(run["mode"] for run in runs):
+        mode_runs = [run for run in runs if run["mode"] == mode]
+        summary[mode] = {
+            key: statistics.median(run[key] for run in mode_runs)
+            for key, value in mode_runs[0].items()
+            if isinstance(value, (int, float)) and all(run[key] is not None for run in mode_runs)
+        }
+    return summary
+
+
+def _print_summary(summary: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]]) -> None:
+    """Print per-mode medians, with the change against a baseline if given."""
+    for mode, metrics in summary.items():
+        print(f"\n{mode} (median of runs)")
+        for key, value in metrics.items():
+            line = f"  {key:<20} {value:>12.3f}" if isinstance(value, float) else f"  {key:<20} {value:>12}"
+            base = baseline.get(mode, {}).get(key)
+            if key in COMPARED_METRICS and base:
+                line += f"   baseline {base:>10}   {(value - base) / base:+.1%}"
+            print(line)
+
+
+def _git_revision() -> str:
+    """Return the current commit of the repository, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    """Run the benchmark, print a summary and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", nargs="+", choices=("sequential", "parallel", "pipelined"), default=["sequential", "parallel"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=MockSettings.latency, help="Seconds before each completion")
+    parser.add_argument("--tps", type=float, default=MockSettings.tokens_per_second, help="Simulated tokens per second")
+    parser.add_argument("--search-latency", type=float, default=MockSettings.search_latency)
+    parser.add_argument("--concurrency", type=int, default=5, help="Editor concurrency in parallel modes")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests refused with 429")
+    parser.add_argument("--retry-after", type=float, default=MockSettings.retry_after, help="Retry-After of refused requests")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to compare against")
+    args = parser.parse_args()
+    
+    output = args.output or RESULTS_DIR / f"generation_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output = output.resolve()
+    baseline = json.loads(args.compare.read_text())["summary"] if args.compare else {}
+    
+    settings = MockSettings(
+        latency=args.latency,
+        tokens_per_second=args.tps,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        search_latency=args.search_latency,
+    )
+    server = MockOpenAIServer(settings).start()
+    
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="bench_generation_") as workdir:
+        _configure_environment(server, Path(workdir), args)
+        
+        from loguru import logger
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+        
+        import NewsLetter2.tools as tools
+        from NewsLetter2.topics import DEFAULT_TOPIC
+        
+        server.state.settings.search_queries = DEFAULT_TOPIC.queries
+        with mock.patch.object(tools.GoogleSearch, "BACKEND", server.state.base_url):
+            for mode in args.mode:
+                for repeat in range(args.repeat):
+                    run = _run_once(server, mode)
+                    runs.append(run)
+                    print(
+                        f"{mode} run {repeat + 1}/{args.repeat}: {run['wall_s']:.2f}s, "
+                        f"{run['requests']} requests, {run['total_tokens']} tokens"
+                    )
+    server.stop()
+    
+    summary = _summarize(runs)
+    _print_summary(summary, baseline)
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "meta": {
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                    "revision": _git_revision(),
+                    "python": platform.python_version(),
+                    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                    "settings": {
+                        "latency": args.latency,
+                        "tokens_per_second": args.tps,
+                        "search_latency": args.search_latency,
+                        "concurrency": args.concurrency,
+                        "throttle_rate": args.throttle_rate,
+                        "repeat": args.repeat,
+                    },
+                },
+                "summary": summary,
+                "runs": runs,
+            },
+            indent=2,
+        )
+    )
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
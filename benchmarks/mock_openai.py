@@ -0,0 +1,500 @@
+# =============================================================================
+#  Filename: mock_openai.py
+#
+#  Short Description: Local OpenAI-compatible server for offline benchmarks
+#
+#  Creation date: 2025-10-13
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Local stand-in for the OpenAI Chat Completions API.
+
+Answers the newsletter agents' prompts with deterministic, well-formed
+output built from the Google News fixture, so the real crew runs end to end
+without network access or API credit. Each response is delayed by a fixed
+latency plus its length divided by a simulated generation rate, and every
+request is attributed to a pipeline stage by the agent role in its system
+prompt, so token counts and wall time can be reported per stage.
+Articles are referred to by the candidate ids of the search tool output,
+as the real agents do. Article thumbnails are served from the same server
+as small JPEGs, and SerpAPI searches (GET /search) from the fixture, so
+both API clients talk HTTP to the server. Connections are kept alive
+(HTTP/1.1), as the real APIs do. A share of the requests can be answered
+with HTTP 429 and a Retry-After header to exercise the client's rate
+limiting and retries.
+
+Usage:
+    uv run python benchmarks/mock_openai.py [--port 8765] [--latency 0.2] [--tps 400]
+        [--search-latency 0.3] [--throttle-rate 0.2] [--retry-after 1]
+"""
+
+import argparse
+import io
+import json
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "google_news_nvidia.json"
+
+# Agent roles (see NewsLetter2.agents) mapped to pipeline stages
+STAGE_BY_ROLE = {
+    "News Collector": "reporter",
+    "AI & Tech News Summarizer": "editor",
+    "Editorial Writer & Verifier": "senior_editor",
+}
+
+# Rough token estimate used for usage reporting and generation delay
+CHARS_PER_TOKEN = 4
+
+# Topic name in the Reporter role ("<topic> News Collector")
+_REPORTER_ROLE = re.compile(r"You are ([^\n.]+?) News Collector")
+
+# Candidate table rows of the search tool ("id|source|date|title|snippet")
+_CANDIDATE_ROW = re.compile(r"^([0-9a-f]{6,})\|[^|\n]*\|[^|\n]*\|([^|\n]*)\|", re.MULTILINE)
+
+# Articles passed on by id between the agents of the sequential crew
+_ARTICLE_REF = re.compile(r'"id": "([0-9a-f]{6,})", "title": "((?:[^"\\]|\\.)*)"')
+
+# Bracketed candidate ids of the sequential Senior Editor's article digest
+_DIGEST_ID = re.compile(r"^\[([0-9a-f]{6,})\] ", re.MULTILINE)
+
+_FILLER = (
+    "The announcement reinforces NVIDIA's position across accelerated computing, "
+    "and product leaders should weigh its impact on roadmap, pricing and supply."
+)
+
+
+@dataclass
+class StageStats:
+    """Requests, tokens and active interval attributed to one stage."""
+    
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    first_request: Optional[float] = None
+    last_response: Optional[float] = None
+    
+    def as_dict(self, origin: float) -> dict[str, Any]:
+        """Return the stats with times relative to origin, in seconds."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "start_s": None if self.first_request is None else self.first_request - origin,
+            "end_s": None if self.last_response is None else self.last_response - origin,
+        }
+
+
+@dataclass
+class MockSettings:
+    """Simulated model behaviour."""
+    
+    latency: float = 0.2
+    tokens_per_second: float = 400.0
+    detailed_sentences: int = 25
+    articles: int = 14
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    search_latency: float = 0.3
+    # Configured search queries; each sees the fixture rotated differently
+    search_queries: tuple[str, ...] = ()
+
+
+def should_throttle(count: int, rate: float) -> bool:
+    """
+    Decide whether the count-th request is throttled.
+    
+    Spreads throttled requests evenly, so exactly rate of them are refused.
+    
+    Args:
+        count: 1-based number of the request
+        rate: Share of requests to throttle (0 to 1)
+    
+    Returns:
+        True if the request should be answered with HTTP 429
+    """
+    return int(count * rate) > int((count - 1) * rate)
+
+
+@dataclass
+class _State:
+    settings: MockSettings
+    fixture: list[dict[str, Any]]
+    base_url: str = ""
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    received: int = 0
+    searches: int = 0
+    throttled: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _tokens(text: str) -> int:
+    """Estimate the token count of a text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _detailed_article(title: str, sentences: int) -> str:
+    """Return a detailed article of the requested length."""
+    lines = [f"{title} marks a notable development for the AI industry."]
+    lines += [f"{_FILLER} ({n})" for n in range(1, sentences)]
+    return " ".join(lines)
+
+
+def _distinct_stories(fixture: list[dict[str, Any]], count: int) -> list[dict[str, Any]]:
+    """Return the first result of each labelled story, in rank order."""
+    seen: set[str] = set()
+    stories = []
+    for item in fixture:
+        if item["_story"] not in seen:
+            seen.add(item["_story"])
+            stories.append(item)
+    return stories[:count]
+
+
+def _final(payload: Any) -> str:
+    """Format a ReAct final answer."""
+    return "Thought: I now know the final answer\nFinal Answer: " + json.dumps(payload)
+
+
+class _Responder:
+    """Builds the completion for one agent prompt."""
+    
+    def __init__(self, state: _State):
+        self.state = state
+    
+    def _selected_candidates(self, prompt: str) -> list[dict[str, Any]]:
+        """Pick one candidate per story from the tool output in the prompt."""
+        story_by_title = {item["title"]: item["_story"] for item in self.state.fixture}
+        stories = [item["_story"] for item in _distinct_stories(self.state.fixture, self.state.settings.articles)]
+        
+        candidates: dict[str, dict[str, Any]] = {}
+        for article_id, title in _CANDIDATE_ROW.findall(prompt):
+            story = story_by_title.get(title.strip())
+            if story in stories and story not in candidates:
+                item = next(i for i in self.state.fixture if i["title"] == title.strip())
+                candidates[story] = {
+                    "id": article_id,
+                    "title": item["title"],
+                    "source": item["source"]["name"],
+                    "snippet": item["snippet"],
+                    "published_date": item.get("date"),
+                }
+        return [candidates[story] for story in stories if story in candidates]
+    
+    def _summary(self, title: str) -> dict[str, str]:
+        return {
+            "short_summary": f"{title}. This matters for AI infrastructure buyers.",
+            "detailed_article": _detailed_article(title, self.state.settings.detailed_sentences),
+        }
+    
+    def _processed_articles(self, prompt: str) -> list[dict[str, Any]]:
+        references = dict(
+            (article_id, json.loads(f'"{title}"')) for article_id, title in _ARTICLE_REF.findall(prompt)
+        )
+        return [
+            {"id": article_id, "title": title, **self._summary(title)}
+            for article_id, title in list(references.items())[:10]
+        ]
+    
+    def _editorial(self) -> dict[str, str]:
+        paragraph = " ".join([_FILLER] * 6)
+        return {
+            "headline": "NVIDIA Extends Its Lead Across the AI Stack",
+            "narrative": " ".join([paragraph] * 3),
+            "trend_analysis": paragraph,
+            "product_leader_insights": paragraph,
+            "competition_analysis": paragraph,
+        }
+    
+    def respond(self, stage: str, prompt: str) -> str:
+        """
+        Return the assistant message for a prompt of the given stage.
+        
+        Args:
+            stage: Stage the prompt belongs to
+            prompt: All message contents of the request, concatenated
+        
+        Returns:
+            Completion text in the ReAct format CrewAI agents expect
+        """
+        if stage == "reporter":
+            match = _REPORTER_ROLE.search(prompt)
+            topic = match.group(1) if match else "NVIDIA"
+            search_call = (
+                f"Action: Search Latest {topic} AI News\n"
+                f'Action Input: {{"query": "{topic} AI GPU technology news"}}'
+            )
+            # The conversation contains the search call once the tool has run
+            if search_call not in prompt:
+                return f"Thought: I should search for the latest {topic} news\n{search_call}"
+            selected = self._selected_candidates(prompt)
+            if "Return only the ids" in prompt:
+                return _final({"ids": [article["id"] for article in selected]})
+            return _final({"articles": selected})
+        
+        if stage == "editor":
+            if "Review the following news article" in prompt:
+                match = re.search(r"Title:\s*(.+)", prompt)
+                title = match.group(1).strip() if match else "NVIDIA news"
+                summary = self._summary(title)
+                # Pipelined Editor passes ask for one of the two texts
+                for field in summary:
+                    if f"write a {field}" in prompt:
+                        return _final({field: summary[field]})
+                return _final(summary)
+            return _final(self._processed_articles(prompt))
+        
+        if "article_ids:" in prompt:
+            article_ids = list(dict.fromkeys(_DIGEST_ID.findall(prompt)))[:10]
+            return _final({"editorial": self._editorial(), "article_ids": article_ids})
+        return _final(self._editorial())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Chat Completions, search and thumbnail endpoints."""
+    
+    # Keep-alive connections, so client connection pooling is exercised
+    protocol_version = "HTTP/1.1"
+    
+    server: "MockOpenAIServer"
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+    
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _search(self) -> None:
+        state = self.server.state
+        settings = state.settings
+        with state.lock:
+            state.searches += 1
+            throttle = should_throttle(state.searches, settings.throttle_rate)
+            if throttle:
+                state.throttled += 1
+        time.sleep(settings.search_latency)
+        if throttle:
+            self._send(
+                429,
+                json.dumps({"error": "Rate limit exceeded"}).encode(),
+                "application/json",
+                {"Retry-After": f"{settings.retry_after:g}"},
+            )
+            return
+        
+        results = json.loads(FIXTURE.read_text())
+        items = results["news_results"]
+        # Date operators of backfilled editions do not change the fixture
+        query = re.sub(r" (after|before):\S+", "", parse_qs(urlsplit(self.path).query).get("q", [""])[0])
+        queries = settings.search_queries or (query,)
+        position = queries.index(query) if query in queries else zlib.crc32(query.encode()) % len(queries)
+        offset = position * len(items) // len(queries)
+        for idx, item in enumerate(items):
+            item["thumbnail"] = f"{state.base_url}/thumbnails/{idx}.jpg"
+        results["news_results"] = items[offset:] + items[:offset]
+        self._send(200, json.dumps(results).encode(), "application/json")
+    
+    def do_GET(self) -> None:
+        if self.path.startswith("/thumbnails/"):
+            self._send(200, self.server.thumbnail, "image/jpeg")
+        elif self.path.startswith("/search"):
+            self._search()
+        elif self.path == "/stats":
+            self._send(200, json.dumps(self.server.stats()).encode(), "application/json")
+        else:
+            self._send(404, b"{}", "application/json")
+    
+    def do_POST(self) -> None:
+        received = time.perf_counter()
+        # The body is read in any case to keep the connection usable
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, b"{}", "application/json")
+            return
+        request = json.loads(raw)
+        
+        settings = self.server.state.settings
+        with self.server.state.lock:
+            self.server.state.received += 1
+            throttle = should_throttle(self.server.state.received, settings.throttle_rate)
+            if throttle:
+                self.server.state.throttled += 1
+        if throttle:
+            error = {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+            self._send(
+                429,
+                json.dumps(error).encode(),
+                "application/json",
+                {"Retry-After": f"{settings.retry_after:g}"},
+            )
+            return
+        messages = request.get("messages", [])
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in messages
+        )
+        
+        # CrewAI puts the agent role in the system message
+        system = next(
+            (m.get("content") for m in messages if m.get("role") == "system"), prompt
+        )
+        stage = next(
+            (name for role, name in STAGE_BY_ROLE.items() if role in str(system)), "other"
+        )
+        content = self.server.responder.respond(stage, prompt)
+        
+        prompt_tokens = _tokens(prompt)
+        completion_tokens = _tokens(content)
+        time.sleep(settings.latency + completion_tokens / settings.tokens_per_second)
+        
+        body = json.dumps(
+            {
+                "id": f"chatcmpl-mock-{int(received * 1e6)}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        ).encode()
+        self._send(200, body, "application/json")
+        
+        with self.server.state.lock:
+            stats = self.server.state.stages.setdefault(stage, StageStats())
+            stats.requests += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            if stats.first_request is None:
+                stats.first_request = received
+            stats.last_response = time.perf_counter()
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """OpenAI-compatible HTTP server running on a background thread."""
+    
+    daemon_threads = True
+    
+    def __init__(self, settings: Optional[MockSettings] = None, port: int = 0):
+        """
+        Create the server (port 0 picks a free port).
+        
+        Args:
+            settings: Simulated model behaviour
+            port: Local port to listen on
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        fixture = json.loads(FIXTURE.read_text())["news_results"]
+        self.state = _State(settings=settings or MockSettings(), fixture=fixture)
+        self.state.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.responder = _Responder(self.state)
+        self.origin = time.perf_counter()
+        
+        buffer = io.BytesIO()
+        Image.new("RGB", (1280, 720), (118, 185, 0)).save(buffer, "JPEG")
+        self.thumbnail = buffer.getvalue()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """OpenAI API base URL of the server."""
+        return f"{self.state.base_url}/v1"
+    
+    def start(self) -> "MockOpenAIServer":
+        """Serve requests on a daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+    
+    def reset_stats(self) -> None:
+        """Clear per-stage stats and restart the clock."""
+        with self.state.lock:
+            self.state.stages.clear()
+            self.state.searches = 0
+            self.state.throttled = 0
+            self.origin = time.perf_counter()
+    
+    def throttled(self) -> int:
+        """Return the number of requests answered with HTTP 429 since the last reset."""
+        with self.state.lock:
+            return self.state.throttled
+    
+    def searches(self) -> int:
+        """Return the number of search requests since the last reset."""
+        with self.state.lock:
+            return self.state.searches
+    
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-stage stats, times relative to the last reset."""
+        with self.state.lock:
+            return {
+                stage: stats.as_dict(self.origin)
+                for stage, stats in self.state.stages.items()
+            }
+
+
+def main() -> None:
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=MockSettings.latency)
+    parser.add_argument("--tps", type=float, default=MockSettings.tokens_per_second)
+    parser.add_argument("--search-latency", type=float, default=MockSettings.search_latency)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=MockSettings.retry_after)
+    args = parser.parse_args()
+    
+    settings = MockSettings(
+        latency=args.latency,
+        tokens_per_second=args.tps,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        search_latency=args.search_latency,
+    )
+    server = MockOpenAIServer(settings, args.port)
+    print(f"Mock OpenAI API on {server.base_url} (set OPENAI_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,101 @@
 # =============================================================================
 #  Filename: run_newsletter.py
 #
-#  Short Description: CLI entry point for NVIDIA newsletter generation
+#  Short Description: CLI entry point for the topic newsletter generation
 #
 #  Creation date: 2025-09-30
 #  Author: Shrinivas Deshpande
 # =============================================================================
 
 """
-Command-line interface for generating NVIDIA AI newsletter.
+Command-line interface for generating the AI newsletters.
 
 Usage:
     python run_newsletter.py
+    python run_newsletter.py --topics nvidia,amd
+    python run_newsletter.py --dates 2025-09-01..2025-09-30 [--topics all] [--workers 3] [--force]
 
 This script orchestrates the CrewAI workflow to collect, summarize,
-and package NVIDIA news into a professional newsletter.
+and package a topic's news (NVIDIA by default) into a professional
+newsletter. Several topics are generated concurrently on one engine. With
+--dates it backfills the editions of past dates concurrently.
 """
 
+import argparse
+from datetime import datetime
+
 from loguru import logger
 
+from NewsLetter2.backfill import BACKFILL_WORKERS, backfill_editions, parse_dates
 from NewsLetter2.crew import run_newsletter_generation
+from NewsLetter2.models import BackfillResult, Topic
+from NewsLetter2.topics import DEFAULT_TOPIC, get_topic, parse_topics
+
+
+def run_backfill(dates: list[datetime], topics: list[Topic], workers: int, force: bool) -> None:
+    """
+    Generate the editions of several dates and topics and report each outcome.
+    
+    Args:
+        dates: Edition dates to generate
+        topics: Newsletter topics to generate each date for
+        workers: Maximum number of editions generated at the same time
+        force: Regenerate dates that already have a cached edition
+    """
+    names = ", ".join(topic.name for topic in topics)
+    logger.info(f"🚀 Generating {len(dates) * len(topics)} AI Newsletter editions ({names})")
+    logger.info("=" * 60)
+    
+    def _report(result: BackfillResult) -> None:
+        day = f"{get_topic(result.topic).name} {result.date:%Y-%m-%d}"
+        if result.status == "generated":
+            logger.success(f"✅ {day}: {result.articles} articles in {result.seconds:.1f}s")
+        elif result.status == "skipped":
+            logger.info(f"⏭️ {day}: already cached")
+        else:
+            logger.error(f"❌ {day}: {result.error}")
+    
+    results = backfill_editions(dates, topics, workers=workers, force=force, on_result=_report)
+    
+    failed = [result for result in results if result.status == "failed"]
+    generated = sum(result.status == "generated" for result in results)
+    logger.info(f"Backfill finished: {generated} generated, {len(failed)} failed, "
+                f"{len(results) - generated - len(failed)} skipped")
+    if failed:
+        raise SystemExit(1)
 
 
 def main() -> None:
     """Execute newsletter generation workflow."""
-    logger.info("🚀 Starting NVIDIA AI Newsletter Generation")
+    parser = argparse.ArgumentParser(description="Generate the AI newsletters")
+    parser.add_argument("--topics", help="Comma-separated topic keys, or 'all' enabled topics (default: nvidia)")
+    parser.add_argument("--dates", help="Backfill past editions: YYYY-MM-DD..YYYY-MM-DD or a comma-separated list")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="Editions generated at the same time")
+    parser.add_argument("--force", action="store_true", help="Regenerate dates that are already cached")
+    args = parser.parse_args()
+    
+    topics = parse_topics(args.topics) if args.topics else [DEFAULT_TOPIC]
+    
+    if args.dates:
+        run_backfill(parse_dates(args.dates), topics, args.workers, args.force)
+        return
+    
+    # Today's editions of several topics are generated side by side
+    if len(topics) > 1:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        run_backfill([today], topics, args.workers, force=True)
+        return
+    
+    topic = topics[0]
+    logger.info(f"🚀 Starting {topic.name} AI Newsletter Generation")
     logger.info("=" * 60)
     
     try:
-        result = run_newsletter_generation()
+        newsletter = run_newsletter_generation(topic=topic)
         
         logger.success("✅ Newsletter generated successfully!")
-        logger.info("Output saved to: newsletter_output.json")
+        logger.info(f"Headline: {newsletter.editorial.headline}")
+        logger.info("Output saved to today's cache edition")
         logger.info("To view the newsletter, run: streamlit run src/NewsLetter2/app.py")
         
     except Exception as e:
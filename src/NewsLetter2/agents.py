@@ -1,7 +1,7 @@
 # =============================================================================
 #  Filename: agents.py
 #
-#  Short Description: CrewAI agent definitions for NVIDIA newsletter generation
+#  Short Description: CrewAI agent definitions for topic newsletter generation
 #
 #  Creation date: 2025-09-30
 #  Author: Shrinivas Deshpande
@@ -12,36 +12,38 @@ from typing import Any
 from crewai import Agent
 from loguru import logger
 
-from NewsLetter2.tools import search_nvidia_news
+from NewsLetter2.models import Topic
+from NewsLetter2.tools import create_search_tool
+from NewsLetter2.topics import DEFAULT_TOPIC, possessive
 
 
-def create_reporter_agent(llm: Any) -> Agent:
+def create_reporter_agent(llm: Any, topic: Topic = DEFAULT_TOPIC) -> Agent:
     """
-    Create Reporter agent for collecting NVIDIA news.
+    Create Reporter agent for collecting news on a topic.
     
-    The Reporter uses SerpAPI to gather the 10 latest NVIDIA-related
+    The Reporter uses SerpAPI to gather the 10 latest topic-related
     AI and technology news articles from various sources.
     
     Args:
         llm: Language model instance (OpenAI configured)
-        
+        topic: Newsletter topic (defaults to NVIDIA)
+    
     Returns:
         Configured Reporter Agent with SerpAPI tool
     """
     agent = Agent(
-        role="NVIDIA News Collector",
+        role=f"{topic.name} News Collector",
         goal=(
-            "Search for the 10 latest NVIDIA AI and technology-related news articles. "
-            "Focus on GPUs, AI platforms, enterprise adoption, partnerships, "
-            "product launches, and financial/market impact."
+            f"Search for the 10 latest {topic.name} AI and technology-related news articles. "
+            f"Focus on {topic.focus}."
         ),
         backstory=(
-            "You are an expert tech journalist with deep knowledge of NVIDIA's "
+            f"You are an expert tech journalist with deep knowledge of {possessive(topic.name)} "
             "ecosystem, AI hardware trends, and enterprise technology adoption. "
             "You have a keen eye for identifying significant news that matters "
             "to AI leaders, product managers, and technology decision-makers."
         ),
-        tools=[search_nvidia_news],
+        tools=[create_search_tool(topic)],
         llm=llm,
         verbose=True,
         allow_delegation=False,
@@ -51,7 +53,7 @@ def create_reporter_agent(llm: Any) -> Agent:
     return agent
 
 
-def create_editor_agent(llm: Any) -> Agent:
+def create_editor_agent(llm: Any, topic: Topic = DEFAULT_TOPIC) -> Agent:
     """
     Create Editor agent for summarizing and analyzing news.
     
@@ -61,7 +63,8 @@ def create_editor_agent(llm: Any) -> Agent:
     
     Args:
         llm: Language model instance (OpenAI configured)
-        
+        topic: Newsletter topic (defaults to NVIDIA)
+    
     Returns:
         Configured Editor Agent without additional tools (uses LLM directly)
     """
@@ -71,7 +74,8 @@ def create_editor_agent(llm: Any) -> Agent:
             "Review each of the 10 news articles and write: "
             "(1) A clear, engaging 2-3 sentence summary for the landing page, "
             "(2) A detailed 20-30 sentence article highlighting implications for "
-            "AI adoption, enterprise strategy, product management, and NVIDIA's market influence."
+            f"AI adoption, enterprise strategy, product management, and {possessive(topic.name)} "
+            "market influence."
         ),
         backstory=(
             "You are a senior technology editor with expertise in AI, semiconductors, "
@@ -89,17 +93,57 @@ def create_editor_agent(llm: Any) -> Agent:
     return agent
 
 
-def create_senior_editor_agent(llm: Any) -> Agent:
+def create_article_editor_agent(llm: Any) -> Agent:
+    """
+    Create a topic-neutral Editor agent for summarizing single articles.
+    
+    Used by the staged pipeline, whose article summaries are stored by URL
+    and reused by every newsletter covering the article, so neither the
+    agent nor its tasks name a topic.
+    
+    Args:
+        llm: Language model instance (OpenAI configured)
+    
+    Returns:
+        Configured Editor Agent without additional tools (uses LLM directly)
+    """
+    agent = Agent(
+        role="AI & Tech News Summarizer",
+        goal=(
+            "Review each news article and write: "
+            "(1) A clear, engaging 2-3 sentence summary for the landing page, "
+            "(2) A detailed 20-30 sentence article highlighting implications for "
+            "AI adoption, enterprise strategy, product management, and the market "
+            "position of the companies involved."
+        ),
+        backstory=(
+            "You are a senior technology editor with expertise in AI, semiconductors, "
+            "and enterprise technology. You excel at distilling complex technical news "
+            "into clear, actionable insights for business and product leaders. "
+            "Your summaries are known for being professional, insightful, and highly "
+            "relevant to strategic decision-making."
+        ),
+        llm=llm,
+        verbose=True,
+        allow_delegation=False,
+    )
+    
+    logger.info("Article Editor agent created successfully")
+    return agent
+
+
+def create_senior_editor_agent(llm: Any, topic: Topic = DEFAULT_TOPIC) -> Agent:
     """
     Create Senior Editor agent for validation and editorial writing.
     
     The Senior Editor verifies accuracy, writes the front-page editorial,
-    analyzes trends, compares NVIDIA with competitors, and provides
+    analyzes trends, compares the topic with competitors, and provides
     strategic insights for product leaders.
     
     Args:
         llm: Language model instance (OpenAI configured)
-        
+        topic: Newsletter topic (defaults to NVIDIA)
+    
     Returns:
         Configured Senior Editor Agent
     """
@@ -107,16 +151,16 @@ def create_senior_editor_agent(llm: Any) -> Agent:
         role="Editorial Writer & Verifier",
         goal=(
             "Verify accuracy and coherence of news summaries, then write an 800-1000 word "
-            "editorial about NVIDIA's current position in the AI landscape. "
-            "Include: (1) Clear narrative on NVIDIA's AI ecosystem role, "
+            f"editorial about {possessive(topic.name)} current position in the AI landscape. "
+            f"Include: (1) Clear narrative on {possessive(topic.name)} AI ecosystem role, "
             "(2) Trend analysis across the 10 stories, "
             "(3) 'What this means for product leaders' with actionable insights, "
-            "(4) 'NVIDIA vs Competition' comparing with AMD, Intel, and hyperscalers."
+            f"(4) '{topic.name} vs Competition' comparing with {topic.competitors}."
         ),
         backstory=(
             "You are the chief technology analyst and editorial director with 15+ years "
             "covering semiconductor and AI industries. You have insider knowledge of "
-            "NVIDIA, AMD, Intel, and cloud provider strategies. Your editorials are "
+            f"{topic.name} and of {topic.competitors}. Your editorials are "
             "read by CTOs, product VPs, and investment analysts for their authoritative, "
             "strategic, and forward-looking perspectives on technology trends."
         ),
@@ -1,27 +1,65 @@
 # =============================================================================
 #  Filename: app.py
 #
-#  Short Description: Streamlit UI for NVIDIA AI Newsletter
+#  Short Description: Streamlit UI for the topic AI Newsletters
 #
 #  Creation date: 2025-09-30
 #  Author: Shrinivas Deshpande
 # =============================================================================
 
-import json
 import os
 from datetime import datetime
-from pathlib import Path
 
 import streamlit as st
 from loguru import logger
 
-from NewsLetter2.crew import run_newsletter_generation
-from NewsLetter2.models import Newsletter, ProcessedNewsArticle
+from NewsLetter2.edition_cache import edition_cache
+from NewsLetter2.jobs import job_manager
+from NewsLetter2.metrics import metrics
+from NewsLetter2.styles import NEWSLETTER_CSS
+from NewsLetter2.thumbnails import thumbnail_cache
+from NewsLetter2.models import (
+    GenerationJob,
+    Newsletter,
+    NewsletterPreview,
+    PartialNewsletter,
+    ProcessedNewsArticle,
+    RawNewsArticle,
+    Topic,
+)
+from NewsLetter2.topics import cache_namespace, enabled_topics, get_topic, possessive
+
+
+# Seconds between refreshes of an edition that is being generated
+STREAM_REFRESH_SECONDS = float(os.getenv("NEWSLETTER_STREAM_REFRESH_SECONDS", "1.5"))
+
+# Maximum number of archive search hits listed in the sidebar
+SEARCH_RESULTS = int(os.getenv("NEWSLETTER_SEARCH_RESULTS", "10"))
+
+# Labels shown while each pipeline stage is running
+STAGE_LABELS = {
+    "reporter": "🔎 Reporter is collecting the latest {topic} news...",
+    "editor": "✍️ Editors are analyzing articles...",
+    "senior_editor": "📰 Senior Editor is writing the editorial...",
+    "done": "✅ Newsletter complete",
+}
+
+# Icons for the job statuses listed in the sidebar
+JOB_STATUS_ICONS = {
+    "queued": "🕒",
+    "running": "⏳",
+    "succeeded": "✅",
+    "failed": "❌",
+}
+
+
+# Topics offered in the sidebar, default topic first
+TOPICS = enabled_topics()
 
 
 # Page configuration
 st.set_page_config(
-    page_title="NVIDIA AI Newsletter",
+    page_title=f"{TOPICS[0].name} AI Newsletter" if len(TOPICS) == 1 else "AI Newsletter",
     page_icon="🚀",
     layout="wide",
     initial_sidebar_state="collapsed",
@@ -31,174 +69,250 @@ st.set_page_config(
 # Custom CSS for newsletter styling
 def load_custom_css() -> None:
     """Apply custom CSS styling for professional newsletter appearance."""
-    st.markdown(
-        """
-        <style>
-        .main-header {
-            font-size: 3rem;
-            font-weight: bold;
-            color: #76B900;
-            text-align: center;
-            margin-bottom: 1rem;
-        }
-        .sub-header {
-            font-size: 1.2rem;
-            color: #666;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        .editorial-box {
-            padding: 1rem 0;
-            border-left: 5px solid #76B900;
-            padding-left: 1.5rem;
-            margin-bottom: 2rem;
-        }
-        .news-card {
-            padding: 1rem 0;
-            margin-bottom: 1rem;
-        }
-        .news-title {
-            font-size: 1.3rem;
-            font-weight: 600;
-            color: #1a1a1a;
-            margin-bottom: 0.5rem;
-        }
-        .news-source {
-            font-size: 0.9rem;
-            color: #76B900;
-            margin-bottom: 0.5rem;
-        }
-        .section-divider {
-            height: 2px;
-            background: linear-gradient(to right, #76B900, transparent);
-            margin: 2rem 0;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
+    st.markdown(f"<style>{NEWSLETTER_CSS}</style>", unsafe_allow_html=True)
+
+
+def current_topic() -> Topic:
+    """
+    Return the topic selected by this session.
+    
+    Returns:
+        Selected topic, or the first enabled topic
+    """
+    key = st.session_state.get("topic")
+    if key not in {topic.key for topic in TOPICS}:
+        return TOPICS[0]
+    return get_topic(key)
+
+
+def render_topic_selector() -> None:
+    """Render the newsletter topic selector when several topics are enabled."""
+    if len(TOPICS) < 2:
+        return
+    
+    keys = [topic.key for topic in TOPICS]
+    selected = st.selectbox(
+        "Newsletter",
+        keys,
+        index=keys.index(current_topic().key),
+        format_func=lambda key: f"{get_topic(key).name} AI Newsletter",
     )
+    if selected != current_topic().key:
+        # Editions and jobs of the previous topic no longer apply
+        st.session_state.topic = selected
+        for state_key in (
+            "edition_key", "selected_article", "job_id", "loaded_from_cache",
+            "stale_edition", "refresh_job_id",
+        ):
+            st.session_state.pop(state_key, None)
+        st.rerun()
 
 
-def load_newsletter_data() -> Newsletter | None:
+def load_newsletter_data() -> NewsletterPreview | None:
     """
-    Load newsletter data intelligently from cache, session, or file.
+    Load newsletter data intelligently from the session or the cache.
     
     Priority order:
-    1. Session state (current session)
+    1. Edition selected by the current session
     2. Today's cache (if exists)
-    3. Legacy output file (fallback)
+    3. Newest cached edition, served stale while today's is regenerated
+    
+    Cached editions come from the process-wide edition cache, parsed once and
+    shared by all sessions; a session keeps only the edition key. Detailed
+    articles are loaded only when a reader opens them. Editions are read
+    from the cache namespace of the selected topic.
+    
+    A session showing a stale edition switches to today's edition as soon
+    as the background refresh has cached it (unless an article is open).
     
     Returns:
-        Newsletter object if available, None otherwise
+        Newsletter preview if available, None otherwise
     """
     from NewsLetter2.cache_manager import cache_manager
     from datetime import datetime
     
-    # Check if newsletter exists in session state
-    if "newsletter" in st.session_state:
-        logger.info("Loading newsletter from session state")
-        return st.session_state.newsletter
+    topic = current_topic()
+    namespace = cache_namespace(topic)
+    manager = cache_manager.namespace(namespace)
+    today_key = datetime.now().strftime("%Y-%m-%d")
+    
+    # A stale edition is replaced once today's edition is indexed
+    if (
+        st.session_state.get("stale_edition")
+        and st.session_state.get("selected_article") is None
+        and manager.get_edition() is not None
+    ):
+        st.session_state.pop("edition_key", None)
+        st.session_state.pop("stale_edition")
+    
+    # Edition selected by this session, served from the shared cache
+    if "edition_key" in st.session_state:
+        newsletter = edition_cache.get_preview(st.session_state.edition_key, namespace)
+        if newsletter is not None:
+            return newsletter
+        st.session_state.pop("edition_key")
+        st.session_state.pop("stale_edition", None)
     
     # Check cache for today's newsletter
-    if cache_manager.cache_exists():
+    if manager.cache_exists():
         logger.info("Loading newsletter from today's cache")
-        newsletter = cache_manager.load_from_cache()
+        newsletter = edition_cache.get_preview(today_key, namespace)
         if newsletter:
-            st.session_state.newsletter = newsletter
+            st.session_state.edition_key = today_key
             st.session_state.loaded_from_cache = True
-            st.session_state.cache_date = datetime.now().strftime("%Y-%m-%d")
             return newsletter
     
-    # Fallback: Try loading from legacy output file
-    output_file = Path("newsletter_output.json")
-    if output_file.exists():
-        try:
-            logger.info("Loading newsletter from legacy output file")
-            with open(output_file) as f:
-                content = f.read()
-                
-                # Remove markdown code fences if present
-                if content.startswith('```json'):
-                    content = content[7:]
-                elif content.startswith('```'):
-                    content = content[3:]
-                if content.endswith('```'):
-                    content = content[:-3]
-                content = content.strip()
-                
-                data = json.loads(content)
-                newsletter = Newsletter(**data)
-                st.session_state.newsletter = newsletter
-                st.session_state.loaded_from_cache = False
-                return newsletter
-        except Exception as e:
-            logger.error(f"Error loading newsletter from file: {e}")
+    # Serve the newest edition right away and refresh today's in the background
+    for record in manager.list_editions(limit=1):
+        edition_key = record.date.strftime("%Y-%m-%d")
+        newsletter = edition_cache.get_preview(edition_key, namespace)
+        if newsletter is None:
+            break
+        logger.info(f"Serving the stale {edition_key} edition while today's is refreshed")
+        st.session_state.edition_key = edition_key
+        st.session_state.loaded_from_cache = True
+        st.session_state.stale_edition = edition_key != today_key
+        if st.session_state.stale_edition:
+            job = job_manager.refresh(topic.key)
+            if job is not None:
+                st.session_state.refresh_job_id = job.job_id
+        return newsletter
     
     return None
 
 
 def generate_newsletter() -> None:
-    """Generate new newsletter using CrewAI workflow."""
-    with st.spinner("🚀 Generating NVIDIA AI Newsletter... This may take a few minutes."):
-        try:
-            result = run_newsletter_generation()
-            
-            # CrewAI returns a CrewOutput object, load from file instead
-            output_file = Path("newsletter_output.json")
-            if output_file.exists():
-                with open(output_file) as f:
-                    content = f.read()
-                    
-                    # Remove markdown code fences if present
-                    if content.startswith('```json'):
-                        content = content[7:]
-                    elif content.startswith('```'):
-                        content = content[3:]
-                    if content.endswith('```'):
-                        content = content[:-3]
-                    content = content.strip()
-                    
-                    data = json.loads(content)
-                    newsletter = Newsletter(**data)
-                    st.session_state.newsletter = newsletter
-                    st.success("✅ Newsletter generated successfully!")
-                    st.rerun()
-            else:
-                # Fallback: try to parse result directly
-                if isinstance(result, dict):
-                    newsletter = Newsletter(**result)
-                elif hasattr(result, 'json'):
-                    newsletter = Newsletter(**result.json())
-                elif hasattr(result, 'raw'):
-                    data = json.loads(result.raw)
-                    newsletter = Newsletter(**data)
-                else:
-                    raise ValueError("Could not parse newsletter result")
-                
-                st.session_state.newsletter = newsletter
-                st.success("✅ Newsletter generated successfully!")
-                st.rerun()
-            
-        except Exception as e:
-            logger.error(f"Error generating newsletter: {e}")
-            st.error(f"Failed to generate newsletter: {str(e)}")
+    """
+    Queue a new newsletter generation job for the selected topic.
+    
+    The job runs on the background job manager, independently of this
+    Streamlit session. Its EditionStream is rendered progressively on the
+    landing page while the remaining stages run.
+    """
+    job = job_manager.submit(current_topic().key)
+    
+    st.session_state.job_id = job.job_id
+    st.session_state.selected_article = None
+    st.session_state.pop("generation_error", None)
+    st.session_state.pop("stale_edition", None)
+    st.rerun()
+
+
+def _finish_job(job: GenerationJob) -> None:
+    """
+    Hand the result of a finished job over to this session.
+    
+    Args:
+        job: Finished generation job
+    """
+    st.session_state.pop("job_id", None)
+    if job.status != "succeeded":
+        st.session_state.generation_error = job.error
+        return
+    
+    if edition_cache.get_preview(job.edition_date, cache_namespace(get_topic(job.topic))) is None:
+        st.session_state.generation_error = "Generated newsletter could not be loaded from cache"
+        return
+    
+    st.session_state.topic = job.topic
+    st.session_state.edition_key = job.edition_date
+    st.session_state.loaded_from_cache = False
+    st.session_state.pop("stale_edition", None)
+    st.session_state.generation_succeeded = True
+
 
+@st.fragment(run_every=STREAM_REFRESH_SECONDS)
+def render_generation_progress() -> None:
+    """Render the edition being generated, refreshing until it completes."""
+    job = job_manager.get(st.session_state.get("job_id", ""))
+    if job is None:
+        st.session_state.pop("job_id", None)
+        st.rerun(scope="app")
+    
+    if job.finished:
+        _finish_job(job)
+        st.rerun(scope="app")
+    
+    # Jobs always run in this process, but fall back to the persisted status
+    stream = job_manager.stream(job.job_id)
+    if stream is not None:
+        snapshot = stream.snapshot()
+    else:
+        snapshot = PartialNewsletter(stage=job.stage or "reporter")
+    
+    completed = sum(article is not None for article in snapshot.articles)
+    total = len(snapshot.raw_articles)
+    label = STAGE_LABELS.get(snapshot.stage, snapshot.stage).format(topic=get_topic(job.topic).name)
+    if snapshot.stage == "editor" and total:
+        label = f"{label} ({completed}/{total})"
+    
+    # Reporter, each article, and the editorial are weighted equally
+    steps = total + 2 if total else 1
+    progress = ((1 if total else 0) + completed + (1 if snapshot.editorial else 0)) / steps
+    st.progress(min(progress, 1.0), text=label)
+    
+    render_landing_page(snapshot)
 
-def render_landing_page(newsletter: Newsletter) -> None:
+
+@st.fragment(run_every=STREAM_REFRESH_SECONDS)
+def render_job_status() -> None:
+    """Render the status of recent generation jobs in the sidebar."""
+    jobs = job_manager.list_jobs(limit=3)
+    if not jobs:
+        return
+    
+    st.markdown("### 🛠️ Generation Jobs")
+    for job in jobs:
+        icon = JOB_STATUS_ICONS.get(job.status, "•")
+        line = f"{icon} `{job.job_id}` {job.status}"
+        if len(TOPICS) > 1:
+            line += f" • {get_topic(job.topic).name}"
+        if job.status == "running" and job.stage:
+            line += f" • {job.stage}"
+            if job.articles_total:
+                line += f" ({job.articles_completed}/{job.articles_total})"
+        st.caption(line)
+        if job.status == "failed" and job.error:
+            st.caption(f"↳ {job.error[:120]}")
+    
+    # Refresh the whole page once the job this session follows is finished
+    followed = job_manager.get(st.session_state.get("job_id", ""))
+    if followed is not None and followed.finished:
+        _finish_job(followed)
+        st.rerun(scope="app")
+    
+    # Swap in today's edition once the background refresh has finished
+    refresh = job_manager.get(st.session_state.get("refresh_job_id", ""))
+    if refresh is not None and refresh.finished:
+        st.session_state.pop("refresh_job_id")
+        st.rerun(scope="app")
+
+
+def render_landing_page(newsletter: Newsletter | NewsletterPreview | PartialNewsletter) -> None:
     """
     Render the newsletter landing page with editorial and article summaries.
     
+    Partial editions are rendered with whatever is already available: raw
+    articles show their snippet until the Editor finishes them, and the
+    editorial shows a placeholder until the Senior Editor is done.
+    
     Args:
-        newsletter: Complete newsletter data
+        newsletter: Complete newsletter data, or a partial edition in progress
     """
     load_custom_css()
+    topic = current_topic()
     
     # Header
-    st.markdown('<div class="main-header">🚀 NVIDIA AI Newsletter</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="main-header">🚀 {topic.name} AI Newsletter</div>', unsafe_allow_html=True)
     
     # Show cache indicator if loaded from cache
-    if st.session_state.get("loaded_from_cache", False):
-        st.info(f"📦 Loaded from cache: {st.session_state.get('cache_date', 'today')}")
+    if st.session_state.get("stale_edition", False) and not isinstance(newsletter, PartialNewsletter):
+        st.info(
+            f"🕒 Showing the {st.session_state.edition_key} edition while "
+            "today's edition is being prepared"
+        )
+    elif st.session_state.get("loaded_from_cache", False):
+        st.info(f"📦 Loaded from cache: {st.session_state.get('edition_key', 'today')}")
     
     st.markdown(
         f'<div class="sub-header">Edition • {newsletter.generated_at.strftime("%B %d, %Y")}</div>',
@@ -206,48 +320,66 @@ def render_landing_page(newsletter: Newsletter) -> None:
     )
     
     # Editorial Section
+    editorial = newsletter.editorial
     st.markdown('<div class="editorial-box">', unsafe_allow_html=True)
-    st.markdown(f"## 📰 {newsletter.editorial.headline}")
-    
-    st.markdown("### 📝 Executive Summary")
-    st.markdown(newsletter.editorial.narrative)
-    st.markdown("")
-    
-    with st.expander("📊 **Trend Analysis** - Market Patterns & Insights", expanded=False):
-        st.markdown(newsletter.editorial.trend_analysis)
-    
-    with st.expander("💡 **Product Leader Insights** - Strategic Recommendations", expanded=False):
-        st.markdown(newsletter.editorial.product_leader_insights)
-    
-    with st.expander("⚔️ **NVIDIA vs Competition** - Competitive Landscape", expanded=False):
-        st.markdown(newsletter.editorial.competition_analysis)
+    if editorial is None:
+        st.markdown("## 📰 Editorial in progress...")
+        st.caption("The Senior Editor writes the editorial once all articles are analyzed.")
+    else:
+        st.markdown(f"## 📰 {editorial.headline}")
+        
+        st.markdown("### 📝 Executive Summary")
+        st.markdown(editorial.narrative)
+        st.markdown("")
+        
+        with st.expander("📊 **Trend Analysis** - Market Patterns & Insights", expanded=False):
+            st.markdown(editorial.trend_analysis)
+        
+        with st.expander("💡 **Product Leader Insights** - Strategic Recommendations", expanded=False):
+            st.markdown(editorial.product_leader_insights)
+        
+        with st.expander(f"⚔️ **{topic.name} vs Competition** - Competitive Landscape", expanded=False):
+            st.markdown(editorial.competition_analysis)
     
     st.markdown("</div>", unsafe_allow_html=True)
     
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     
     # News Articles Grid
-    st.markdown("## 📡 Latest NVIDIA News")
+    st.markdown(f"## 📡 Latest {topic.name} News")
     st.markdown("*Click 'Read Full Analysis' button below each article to view complete details*")
     st.markdown("")
     
+    # Unfinished articles fall back to the Reporter's raw article
+    if isinstance(newsletter, PartialNewsletter):
+        articles = [
+            processed or raw
+            for processed, raw in zip(newsletter.articles, newsletter.raw_articles)
+        ]
+        if not articles:
+            st.info("🔎 The Reporter is collecting today's stories...")
+    else:
+        articles = newsletter.articles
+    
     # Display articles in 2-column grid
-    for idx in range(0, len(newsletter.articles), 2):
+    for idx in range(0, len(articles), 2):
         cols = st.columns(2)
         
         for col_idx, col in enumerate(cols):
             article_idx = idx + col_idx
-            if article_idx < len(newsletter.articles):
-                article = newsletter.articles[article_idx]
+            if article_idx < len(articles):
+                article = articles[article_idx]
                 
                 with col:
                     # Create card container
                     st.markdown('<div class="news-card">', unsafe_allow_html=True)
                     
-                    # Thumbnail - try to display, skip if fails
-                    if article.thumbnail:
+                    # Thumbnail - served from the local cache, or from its source
+                    # for editions whose thumbnails were never fetched
+                    thumbnail = thumbnail_cache.image_source(article.thumbnail)
+                    if thumbnail is not None:
                         try:
-                            st.image(str(article.thumbnail), width='stretch')
+                            st.image(thumbnail, width='stretch')
                         except Exception:
                             # Show placeholder only if image fails
                             st.markdown("📰 *Image unavailable*")
@@ -256,6 +388,14 @@ def render_landing_page(newsletter: Newsletter) -> None:
                     st.markdown(f"### {article.title}")
                     st.caption(f"📍 {article.source}")
                     
+                    # Raw article still being analyzed: show the snippet
+                    if isinstance(article, RawNewsArticle):
+                        st.markdown(article.snippet)
+                        st.markdown("</div>", unsafe_allow_html=True)
+                        st.caption("⏳ Analysis in progress...")
+                        st.markdown("")
+                        continue
+                    
                     # Summary preview
                     st.markdown(article.short_summary)
                     
@@ -282,6 +422,7 @@ def render_article_page(article: ProcessedNewsArticle) -> None:
         article: Processed news article with detailed content
     """
     load_custom_css()
+    topic = current_topic()
     
     # Back button
     if st.button("← Back to Newsletter"):
@@ -297,10 +438,11 @@ def render_article_page(article: ProcessedNewsArticle) -> None:
     if article.published_date:
         st.caption(f"Published: {article.published_date}")
     
-    # Featured image with error handling
-    if article.thumbnail:
+    # Featured image from the local thumbnail cache (or its source), with error handling
+    thumbnail = thumbnail_cache.image_source(article.thumbnail)
+    if thumbnail is not None:
         try:
-            st.image(str(article.thumbnail), width='stretch')
+            st.image(thumbnail, width='stretch')
         except Exception:
             st.info("📷 Image unavailable")
     
@@ -332,8 +474,8 @@ def render_article_page(article: ProcessedNewsArticle) -> None:
         
         **Strategic Implications for Technology Leaders:**
         
-        This development in NVIDIA's ecosystem has several key implications:
-        - **Market Position**: Reinforces NVIDIA's leadership in AI infrastructure
+        This development in {possessive(topic.name)} ecosystem has several key implications:
+        - **Market Position**: Shapes {possessive(topic.name)} standing in AI infrastructure
         - **Enterprise Impact**: Affects procurement and deployment decisions for AI platforms
         - **Competitive Dynamics**: Influences the broader semiconductor and AI chip landscape
         - **Product Strategy**: Provides insights for product managers evaluating AI solutions
@@ -345,9 +487,9 @@ def render_article_page(article: ProcessedNewsArticle) -> None:
     # Key takeaways section
     st.markdown("---")
     st.markdown("### 💡 Why This Matters for Tech Leaders")
-    st.success("""
+    st.success(f"""
     **Strategic Takeaways:**
-    - This article provides insights into NVIDIA's market positioning and technology strategy
+    - This article provides insights into {possessive(topic.name)} market positioning and technology strategy
     - Understanding these developments helps inform enterprise AI adoption decisions
     - The competitive landscape insights aid in vendor selection and partnership strategies
     - Product managers can leverage this analysis for platform and architecture planning
@@ -369,14 +511,70 @@ def render_article_page(article: ProcessedNewsArticle) -> None:
             st.rerun()
 
 
+def render_search() -> None:
+    """
+    Render the archive search box and its ranked hits in the sidebar.
+    
+    Only the editions of the selected topic are searched. Selecting a hit
+    opens its edition, and its article if it is one.
+    """
+    from NewsLetter2.cache_manager import cache_manager
+    
+    st.markdown("### 🔎 Search Archive")
+    query = st.text_input(
+        "Search past editions",
+        placeholder="e.g. Blackwell, AMD MI300",
+        label_visibility="collapsed",
+    )
+    if not query.strip():
+        return
+    
+    manager = cache_manager.namespace(cache_namespace(current_topic()))
+    hits = manager.search(query, limit=SEARCH_RESULTS)
+    if not hits:
+        st.caption("No matching coverage found")
+        return
+    
+    for hit_idx, hit in enumerate(hits):
+        edition_key = hit.date.strftime("%Y-%m-%d")
+        label = hit.title if hit.article_index is not None else f"📰 {hit.title}"
+        if st.button(
+            f"{edition_key} — {label}",
+            key=f"search_hit_{hit_idx}",
+            use_container_width=True,
+        ):
+            st.session_state.edition_key = edition_key
+            st.session_state.selected_article = hit.article_index
+            st.session_state.loaded_from_cache = True
+            st.session_state.pop("stale_edition", None)
+            st.rerun()
+        st.caption(hit.snippet)
+
+
 def main() -> None:
     """Main application entry point."""
+    # Prometheus endpoint for the jobs run by this process (once per process,
+    # only when NEWSLETTER_METRICS_PORT is set)
+    metrics.start_http_server()
+    
     # Sidebar for generation
     with st.sidebar:
         st.title("⚙️ Newsletter Control")
         
-        if st.button("Generate New Newsletter", type="primary"):
+        render_topic_selector()
+        topic = current_topic()
+        
+        generating = job_manager.active_job(topic.key) is not None
+        if st.button("Generate New Newsletter", type="primary", disabled=generating):
             generate_newsletter()
+        if generating:
+            st.caption("⏳ Generation in progress...")
+        
+        render_job_status()
+        
+        st.markdown("---")
+        
+        render_search()
         
         st.markdown("---")
         
@@ -386,22 +584,23 @@ def main() -> None:
         
         st.markdown("### 📦 Cache Status")
         
-        if cache_manager.cache_exists():
+        manager = cache_manager.namespace(cache_namespace(topic))
+        if manager.cache_exists():
             st.success(f"✅ Today's newsletter cached")
             st.caption(f"Date: {datetime.now().strftime('%Y-%m-%d')}")
         else:
             st.info("ℹ️ No cache for today")
         
         # List recent cached newsletters
-        cached = cache_manager.list_cached_newsletters()
+        cached = manager.list_editions(limit=5)
         if cached and len(cached) > 1:
             st.markdown("**Recent editions:**")
-            for date, _ in cached[:5]:
-                st.caption(f"• {date.strftime('%Y-%m-%d')}")
+            for edition in cached:
+                st.caption(f"• {edition.date.strftime('%Y-%m-%d')} — {edition.headline}")
         
         # Clear old cache button
         if st.button("🗑️ Clear Old Cache (>7 days)", use_container_width=True):
-            deleted = cache_manager.clear_old_cache(keep_days=7)
+            deleted = manager.clear_old_cache(keep_days=7)
             if deleted > 0:
                 st.success(f"Deleted {deleted} old cache file(s)")
             else:
@@ -411,9 +610,35 @@ def main() -> None:
         st.markdown("### About")
         st.markdown(
             "This newsletter is powered by CrewAI agents using OpenAI API "
-            "and SerpAPI for real-time NVIDIA news collection and analysis."
+            f"and SerpAPI for real-time {topic.name} news collection and analysis."
         )
     
+    # Report the outcome of a background generation that just finished
+    if st.session_state.pop("generation_succeeded", False):
+        st.success("✅ Newsletter generated successfully!")
+    if st.session_state.get("generation_error"):
+        st.error(f"Failed to generate newsletter: {st.session_state.pop('generation_error')}")
+    
+    # Re-attach to a job that is still running (e.g. after a page reload);
+    # a background refresh keeps serving the stale edition instead
+    if "job_id" not in st.session_state:
+        active = job_manager.active_job(topic.key)
+        if active is not None and not active.refresh:
+            st.session_state.job_id = active.job_id
+    
+    # Render the edition being generated as its stages complete
+    job_id = st.session_state.get("job_id")
+    if job_id is not None:
+        stream = job_manager.stream(job_id)
+        article_idx = st.session_state.get("selected_article")
+        if stream is not None and article_idx is not None:
+            articles = stream.snapshot().articles
+            if article_idx < len(articles) and articles[article_idx] is not None:
+                render_article_page(articles[article_idx])
+                return
+        render_generation_progress()
+        return
+    
     # Load newsletter data
     newsletter = load_newsletter_data()
     
@@ -423,21 +648,29 @@ def main() -> None:
             """
             ### How it works:
             
-            1. **Reporter Agent** searches for the 10 latest NVIDIA AI news using SerpAPI
+            1. **Reporter Agent** searches for the 10 latest {topic} AI news using SerpAPI
             2. **Editor Agent** summarizes and analyzes each article for tech leaders
             3. **Senior Editor Agent** validates content, writes editorial, and provides 
                competitive analysis
             4. **You** get a professionally formatted newsletter with strategic insights!
             
             *Note: Generation takes 2-5 minutes depending on API response times.*
-            """
+            """.format(topic=topic.name)
         )
         return
     
     # Route to appropriate page
     if "selected_article" in st.session_state and st.session_state.selected_article is not None:
         article_idx = st.session_state.selected_article
-        render_article_page(newsletter.articles[article_idx])
+        # Only the opened article's detailed text is read from the cache
+        article = edition_cache.get_article(
+            st.session_state.edition_key, article_idx, cache_namespace(topic)
+        )
+        if article is None:
+            st.error("Article could not be loaded from cache")
+            st.session_state.selected_article = None
+            return
+        render_article_page(article)
     else:
         render_landing_page(newsletter)
 
@@ -0,0 +1,140 @@
+# =============================================================================
+#  Filename: article_store.py
+#
+#  Short Description: URL-keyed store of previously processed articles
+#
+#  Creation date: 2025-10-09
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Article-level store built from cached editions.
+
+Many stories stay in the news for several days. The store indexes every
+ProcessedNewsArticle of recent cached editions by canonical URL so that the
+pipeline can reuse an existing summary verbatim and only send new URLs to
+the Editor. Editions of all topic namespaces are indexed, so a story covered
+by several newsletters is summarized once.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from NewsLetter2.cache_manager import CacheManager, cache_manager
+from NewsLetter2.models import ProcessedNewsArticle
+from NewsLetter2.url_utils import canonicalize_url
+
+
+# Number of most recent editions indexed for reuse
+ARTICLE_STORE_EDITIONS = int(os.getenv("NEWSLETTER_ARTICLE_STORE_EDITIONS", "14"))
+
+
+class ArticleStore:
+    """Index of processed articles from recent editions, keyed by canonical URL."""
+    
+    def __init__(self, manager: CacheManager, max_editions: int = ARTICLE_STORE_EDITIONS):
+        """
+        Initialize article store.
+        
+        Args:
+            manager: Cache manager whose editions are indexed
+            max_editions: Number of most recent editions to index
+        """
+        self.manager = manager
+        self.max_editions = max_editions
+        
+        self._articles: dict[str, ProcessedNewsArticle] = {}
+        self._editions: dict[Path, tuple[int, list[ProcessedNewsArticle]]] = {}
+        self._lock = threading.Lock()
+    
+    def refresh(self) -> int:
+        """
+        Index editions that are new or changed since the last refresh.
+        
+        The most recent editions of the cache manager and of each of its
+        namespaces are indexed. Unchanged editions are not re-read. Newer
+        editions take precedence when the same URL appears in several.
+        
+        Returns:
+            Number of editions (re)loaded
+        """
+        managers = [self.manager] + [self.manager.namespace(name) for name in self.manager.namespaces()]
+        editions = sorted(
+            (
+                (date, path, manager)
+                for manager in managers
+                for date, path in manager.list_cached_newsletters(limit=self.max_editions)
+            ),
+            key=lambda edition: edition[0],
+            reverse=True,
+        )
+        
+        with self._lock:
+            loaded = 0
+            indexed: dict[Path, tuple[int, list[ProcessedNewsArticle]]] = {}
+            for date, path, manager in editions:
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                previous = self._editions.get(path)
+                if previous is not None and previous[0] == mtime:
+                    indexed[path] = previous
+                    continue
+                newsletter = manager.load_from_cache(date)
+                if newsletter is not None:
+                    indexed[path] = (mtime, newsletter.articles)
+                    loaded += 1
+            
+            if loaded == 0 and indexed.keys() == self._editions.keys():
+                return 0
+            
+            # Oldest first so newer editions overwrite older summaries
+            articles: dict[str, ProcessedNewsArticle] = {}
+            for _, path, _ in reversed(editions):
+                for article in indexed.get(path, (0, []))[1]:
+                    articles[canonicalize_url(str(article.url))] = article
+            
+            self._articles = articles
+            self._editions = indexed
+        
+        logger.info(
+            f"Article store indexed {len(articles)} articles from {len(indexed)} editions"
+        )
+        return loaded
+    
+    def get(self, url: str) -> Optional[ProcessedNewsArticle]:
+        """
+        Return the previously processed article for a URL.
+        
+        Args:
+            url: Article URL (any variant of the canonical URL)
+        
+        Returns:
+            Processed article, or None if the URL has not been summarized
+        """
+        with self._lock:
+            return self._articles.get(canonicalize_url(url))
+    
+    def add(self, article: ProcessedNewsArticle) -> None:
+        """
+        Add a freshly processed article to the store.
+        
+        Args:
+            article: Processed article to index
+        """
+        with self._lock:
+            self._articles[canonicalize_url(str(article.url))] = article
+    
+    def __len__(self) -> int:
+        """Return the number of indexed articles."""
+        with self._lock:
+            return len(self._articles)
+
+
+# Global article store instance
+article_store = ArticleStore(cache_manager)
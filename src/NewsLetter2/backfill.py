@@ -0,0 +1,161 @@
+# =============================================================================
+#  Filename: backfill.py
+#
+#  Short Description: Batch generation of past editions on a worker pool
+#
+#  Creation date: 2025-10-15
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Batch backfill of newsletter editions for a range of past dates.
+
+Each date is generated by its own staged pipeline run on a bounded worker
+pool. Searches are restricted to the news of the days before the edition
+date, and the result is cached under that date via save_to_cache(date=...).
+All runs share the process-wide search, LLM and thumbnail caches and the
+article store, so a story covered on several days is summarized once.
+Several topics can be backfilled in one batch, sharing the same caches and
+worker pool. Dates that already have a cached edition are skipped unless
+forced; an edition dated today is generated from the current news.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from loguru import logger
+
+from NewsLetter2.cache_manager import cache_manager
+from NewsLetter2.metrics import metrics
+from NewsLetter2.models import BackfillResult, Topic
+from NewsLetter2.topics import DEFAULT_TOPIC, cache_namespace
+
+
+# Number of editions generated at the same time
+BACKFILL_WORKERS = int(os.getenv("NEWSLETTER_BACKFILL_WORKERS", "3"))
+
+# Longest date range accepted in one backfill, in days
+MAX_BACKFILL_DAYS = 366
+
+
+def parse_dates(spec: str) -> list[datetime]:
+    """
+    Parse a date list or an inclusive date range.
+    
+    Args:
+        spec: "YYYY-MM-DD..YYYY-MM-DD" or comma-separated "YYYY-MM-DD" dates
+    
+    Returns:
+        Distinct dates in ascending order
+    
+    Raises:
+        ValueError: If a date is malformed, a range is reversed or too long
+    """
+    if ".." in spec:
+        start_str, end_str = spec.split("..", 1)
+        start = datetime.strptime(start_str.strip(), "%Y-%m-%d")
+        end = datetime.strptime(end_str.strip(), "%Y-%m-%d")
+        if end < start:
+            raise ValueError(f"Date range ends before it starts: {spec}")
+        days = (end - start).days + 1
+        if days > MAX_BACKFILL_DAYS:
+            raise ValueError(f"Date range of {days} days exceeds {MAX_BACKFILL_DAYS}")
+        return [start + timedelta(days=offset) for offset in range(days)]
+    
+    dates = {datetime.strptime(part.strip(), "%Y-%m-%d") for part in spec.split(",") if part.strip()}
+    return sorted(dates)
+
+
+def _generate_edition(date: datetime, topic: Topic) -> BackfillResult:
+    """
+    Generate and cache the edition of one date and topic.
+    
+    Args:
+        date: Edition date
+        topic: Newsletter topic
+    
+    Returns:
+        Outcome of the generation
+    """
+    from NewsLetter2.crew import run_newsletter_generation
+    
+    # Today's edition is not restricted to the news of previous days
+    edition_date = None if date.date() == datetime.now().date() else date
+    
+    start = time.perf_counter()
+    try:
+        newsletter = run_newsletter_generation(
+            parallel_editor=True, edition_date=edition_date, topic=topic
+        )
+    except Exception as e:
+        logger.error(f"Backfill of {topic.name} {date:%Y-%m-%d} failed: {e}")
+        return BackfillResult(
+            date=date,
+            topic=topic.key,
+            status="failed",
+            seconds=time.perf_counter() - start,
+            error=str(e),
+        )
+    return BackfillResult(
+        date=date,
+        topic=topic.key,
+        status="generated",
+        seconds=time.perf_counter() - start,
+        articles=len(newsletter.articles),
+    )
+
+
+def backfill_editions(
+    dates: list[datetime],
+    topics: Optional[list[Topic]] = None,
+    workers: int = BACKFILL_WORKERS,
+    force: bool = False,
+    on_result: Optional[Callable[[BackfillResult], None]] = None,
+) -> list[BackfillResult]:
+    """
+    Generate the editions of several dates and topics concurrently.
+    
+    A failed edition does not stop the others; its error is reported in the
+    result and it can simply be backfilled again.
+    
+    Args:
+        dates: Edition dates to generate
+        topics: Newsletter topics to generate each date for (defaults to
+            the default topic)
+        workers: Maximum number of editions generated at the same time
+        force: Regenerate dates that already have a cached edition
+        on_result: Called with each result as soon as it is known
+    
+    Returns:
+        One result per topic and date, by topic and then in the order of dates
+    """
+    editions = [(topic, date) for topic in topics or [DEFAULT_TOPIC] for date in dates]
+    
+    results: dict[tuple[str, datetime], BackfillResult] = {}
+    pending = []
+    for topic, date in editions:
+        if not force and cache_manager.namespace(cache_namespace(topic)).cache_exists(date):
+            results[topic.key, date] = BackfillResult(date=date, topic=topic.key, status="skipped")
+            if on_result is not None:
+                on_result(results[topic.key, date])
+        else:
+            pending.append((topic, date))
+    
+    logger.info(
+        f"Backfilling {len(pending)} editions with {workers} workers "
+        f"({len(editions) - len(pending)} already cached)"
+    )
+    
+    with metrics.span("backfill", {"editions": len(pending)}):
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill") as executor:
+            futures = [executor.submit(_generate_edition, date, topic) for topic, date in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.topic, result.date] = result
+                if on_result is not None:
+                    on_result(result)
+    
+    return [results[topic.key, date] for topic, date in editions]
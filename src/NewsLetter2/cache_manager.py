@@ -11,32 +11,113 @@
 Cache manager for storing and retrieving newsletter data.
 
 Handles date-based caching to avoid regenerating newsletters multiple times per day.
+Edition metadata is kept in a SQLite index so listings and existence checks
+do not scan the cache directory, and edition text in a full-text index.
+Newsletters of other topics keep their editions in namespaces, i.e. child
+cache managers in topics/<name> below the cache directory.
 """
 
+import hashlib
 import json
-from datetime import datetime
+import os
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
-from NewsLetter2.models import Newsletter
+from NewsLetter2.edition_format import (
+    EDITION_SUFFIX,
+    encode_edition,
+    read_article,
+    read_edition,
+    read_preview,
+)
+from NewsLetter2.edition_index import EditionIndex
+from NewsLetter2.json_utils import extract_json
+from NewsLetter2.models import (
+    EditionRecord,
+    Newsletter,
+    NewsletterPreview,
+    ProcessedNewsArticle,
+    SearchHit,
+)
+from NewsLetter2.search_index import SearchIndex
+
+
+# SQLite edition index file inside the cache directory
+EDITION_INDEX_FILE = "editions.db"
+
+# SQLite FTS5 full-text index file inside the cache directory
+SEARCH_INDEX_FILE = "search.db"
+
+# Directory of the namespaced caches inside the cache directory
+NAMESPACES_DIR = "topics"
+
+# Format of newly written editions: "block" (compressed, lazily loadable) or
+# "json" (legacy pretty-printed JSON); both formats are always readable
+CACHE_FORMAT = os.getenv("NEWSLETTER_CACHE_FORMAT", "block")
+
+_SUFFIXES = {"block": EDITION_SUFFIX, "json": ".json"}
 
 
 class CacheManager:
     """Manages caching of newsletter data with date-based filenames."""
     
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(self, cache_dir: str = "cache", cache_format: str = CACHE_FORMAT):
         """
         Initialize cache manager.
         
         Args:
             cache_dir: Directory path for cache storage
+            cache_format: Format of newly written editions ("block" or "json")
         """
+        if cache_format not in _SUFFIXES:
+            raise ValueError(f"Unknown cache format: {cache_format}")
+        self.cache_format = cache_format
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._namespaces: dict[str, CacheManager] = {}
+        self._namespaces_lock = threading.Lock()
+        self.index = EditionIndex(self.cache_dir / EDITION_INDEX_FILE)
+        self.search_index = SearchIndex(self.cache_dir / SEARCH_INDEX_FILE)
+        self.reindex()
         logger.info(f"Cache manager initialized with directory: {self.cache_dir}")
     
+    def namespace(self, name: Optional[str]) -> "CacheManager":
+        """
+        Return the cache manager of a namespace (e.g. a newsletter topic).
+        
+        Args:
+            name: Namespace name, or None for this cache manager itself
+            
+        Returns:
+            Cache manager storing its editions in topics/<name>, created once
+        """
+        if name is None:
+            return self
+        with self._namespaces_lock:
+            manager = self._namespaces.get(name)
+            if manager is None:
+                manager = CacheManager(
+                    str(self.cache_dir / NAMESPACES_DIR / name), cache_format=self.cache_format
+                )
+                self._namespaces[name] = manager
+            return manager
+    
+    def namespaces(self) -> list[str]:
+        """
+        List the namespaces that have a cache directory.
+        
+        Returns:
+            Namespace names in alphabetical order
+        """
+        namespaces_dir = self.cache_dir / NAMESPACES_DIR
+        if not namespaces_dir.is_dir():
+            return []
+        return sorted(path.name for path in namespaces_dir.iterdir() if path.is_dir())
+    
     def _get_cache_filename(self, date: Optional[datetime] = None) -> str:
         """
         Generate cache filename for a specific date.
@@ -45,11 +126,11 @@ class CacheManager:
             date: Date for cache file (defaults to today)
             
         Returns:
-            Filename in format: newsletter_YYYY-MM-DD.json
+            Filename in format: newsletter_YYYY-MM-DD.nlz (or .json)
         """
         if date is None:
             date = datetime.now()
-        return f"newsletter_{date.strftime('%Y-%m-%d')}.json"
+        return f"newsletter_{date.strftime('%Y-%m-%d')}{_SUFFIXES[self.cache_format]}"
     
     def _get_cache_path(self, date: Optional[datetime] = None) -> Path:
         """
@@ -63,6 +144,144 @@ class CacheManager:
         """
         return self.cache_dir / self._get_cache_filename(date)
     
+    def _find_cache_path(self, date: Optional[datetime] = None) -> Optional[Path]:
+        """
+        Locate the existing cache file for a date, in either format.
+        
+        Args:
+            date: Date of the edition (defaults to today)
+            
+        Returns:
+            Path of the cached edition, or None if there is none
+        """
+        record = self.index.get(date or datetime.now())
+        if record is not None and Path(record.path).exists():
+            return Path(record.path)
+        
+        stem = self._get_cache_path(date).stem
+        for suffix in _SUFFIXES.values():
+            candidate = self.cache_dir / f"{stem}{suffix}"
+            if candidate.exists():
+                return candidate
+        return None
+    
+    @staticmethod
+    def _build_record(
+        date: datetime,
+        cache_path: Path,
+        content: bytes,
+        newsletter: Newsletter,
+    ) -> EditionRecord:
+        """
+        Build the index entry of a cached edition.
+        
+        Args:
+            date: Edition date
+            cache_path: Path of the cache file
+            content: Raw file contents
+            newsletter: Parsed newsletter
+            
+        Returns:
+            Edition metadata for the index
+        """
+        return EditionRecord(
+            date=date,
+            path=str(cache_path),
+            size=len(content),
+            checksum=hashlib.sha256(content).hexdigest(),
+            article_count=len(newsletter.articles),
+            headline=newsletter.editorial.headline,
+            generated_at=newsletter.generated_at,
+        )
+    
+    def reindex(self) -> int:
+        """
+        Reconcile the edition index with the files in the cache directory.
+        
+        Only file names are listed; files are read just for editions missing
+        from the index, so this is cheap once the index is populated.
+        
+        Returns:
+            Number of editions added to the index
+        """
+        on_disk: dict[str, Path] = {}
+        cache_files = [
+            cache_file
+            for suffix in _SUFFIXES.values()
+            for cache_file in self.cache_dir.glob(f"newsletter_*{suffix}")
+        ]
+        for cache_file in cache_files:
+            date_str = cache_file.stem.replace("newsletter_", "")
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError:
+                logger.warning(f"Invalid cache filename format: {cache_file}")
+                continue
+            on_disk[date_str] = cache_file
+        
+        indexed = self.index.dates()
+        for date_str in indexed - on_disk.keys():
+            self.index.remove(datetime.strptime(date_str, "%Y-%m-%d"))
+        
+        added = 0
+        for date_str in sorted(on_disk.keys() - indexed):
+            date = datetime.strptime(date_str, "%Y-%m-%d")
+            newsletter = self.load_from_cache(date)
+            if newsletter is None:
+                continue
+            content = on_disk[date_str].read_bytes()
+            self.index.upsert(self._build_record(date, on_disk[date_str], content, newsletter))
+            added += 1
+        
+        if added or indexed - on_disk.keys():
+            logger.info(f"Edition index updated: {len(self.index)} editions")
+        
+        self._reindex_search()
+        return added
+    
+    def _reindex_search(self) -> int:
+        """
+        Bring the full-text index in line with the edition index.
+        
+        Only editions whose checksum differs from the one they were indexed
+        with (or that were never indexed) are read.
+        
+        Returns:
+            Number of editions (re)indexed
+        """
+        searchable = self.search_index.checksums()
+        records = {record.date.strftime("%Y-%m-%d"): record for record in self.index.list()}
+        
+        for date_str in searchable.keys() - records.keys():
+            self.search_index.remove(datetime.strptime(date_str, "%Y-%m-%d"))
+        
+        indexed = 0
+        for date_str, record in records.items():
+            if searchable.get(date_str) == record.checksum:
+                continue
+            newsletter = self.load_from_cache(record.date)
+            if newsletter is not None:
+                self._index_text(record.date, record.checksum, newsletter)
+                indexed += 1
+        
+        if indexed:
+            logger.info(f"Search index updated: {indexed} editions indexed")
+        return indexed
+    
+    def _index_text(self, date: datetime, checksum: str, newsletter: Newsletter) -> None:
+        """
+        Add an edition to the full-text index without failing the caller.
+        
+        Args:
+            date: Edition date
+            checksum: Checksum of the cached edition file
+            newsletter: Edition contents
+        """
+        try:
+            self.search_index.index_edition(date, checksum, newsletter)
+        except Exception as e:
+            logger.warning(f"Could not index edition {date:%Y-%m-%d} for search: {e}")
+    
     def cache_exists(self, date: Optional[datetime] = None) -> bool:
         """
         Check if cache exists for a specific date.
@@ -71,10 +290,10 @@ class CacheManager:
             date: Date to check (defaults to today)
             
         Returns:
-            True if cache file exists for the date
+            True if an edition is cached for the date
         """
         cache_path = self._get_cache_path(date)
-        exists = cache_path.exists()
+        exists = self.index.exists(date or datetime.now())
         
         if exists:
             logger.info(f"Cache found: {cache_path}")
@@ -93,29 +312,25 @@ class CacheManager:
         Returns:
             Newsletter object if cache exists and is valid, None otherwise
         """
-        cache_path = self._get_cache_path(date)
+        cache_path = self._find_cache_path(date)
         
-        if not cache_path.exists():
-            logger.warning(f"Cache file not found: {cache_path}")
+        if cache_path is None:
+            logger.warning(f"Cache file not found: {self._get_cache_path(date)}")
             return None
         
         try:
             logger.info(f"Loading newsletter from cache: {cache_path}")
             
+            if cache_path.suffix == EDITION_SUFFIX:
+                newsletter = read_edition(cache_path)
+                logger.success(f"Successfully loaded newsletter from cache")
+                return newsletter
+            
             with open(cache_path, 'r') as f:
                 content = f.read()
             
-            # Clean markdown code fences if present
-            if content.startswith('```json'):
-                content = content[7:]
-            elif content.startswith('```'):
-                content = content[3:]
-            if content.endswith('```'):
-                content = content[:-3]
-            content = content.strip()
-            
-            data = json.loads(content)
-            newsletter = Newsletter(**data)
+            # Tolerates markdown code fences in hand-edited legacy files
+            newsletter = Newsletter.model_validate(extract_json(content))
             
             logger.success(f"Successfully loaded newsletter from cache")
             return newsletter
@@ -124,6 +339,56 @@ class CacheManager:
             logger.error(f"Error loading from cache: {e}")
             return None
     
+    def load_preview(self, date: Optional[datetime] = None) -> Optional[NewsletterPreview]:
+        """
+        Load the landing-page view of a cached newsletter.
+        
+        Block-format editions are read without decompressing any detailed
+        article; legacy JSON editions are loaded fully and trimmed.
+        
+        Args:
+            date: Date to load (defaults to today)
+            
+        Returns:
+            NewsletterPreview if cache exists and is valid, None otherwise
+        """
+        cache_path = self._find_cache_path(date)
+        if cache_path is None or cache_path.suffix != EDITION_SUFFIX:
+            newsletter = self.load_from_cache(date)
+            return NewsletterPreview.from_newsletter(newsletter) if newsletter else None
+        
+        try:
+            return read_preview(cache_path)
+        except Exception as e:
+            logger.error(f"Error loading preview from cache: {e}")
+            return None
+    
+    def load_article(
+        self,
+        index: int,
+        date: Optional[datetime] = None,
+    ) -> Optional[ProcessedNewsArticle]:
+        """
+        Load one complete article of a cached newsletter.
+        
+        Args:
+            index: Position of the article in the edition
+            date: Date of the edition (defaults to today)
+            
+        Returns:
+            Processed article with its detailed text, or None if unavailable
+        """
+        cache_path = self._find_cache_path(date)
+        if cache_path is None or cache_path.suffix != EDITION_SUFFIX:
+            newsletter = self.load_from_cache(date)
+            return newsletter.articles[index] if newsletter else None
+        
+        try:
+            return read_article(cache_path, index)
+        except Exception as e:
+            logger.error(f"Error loading article {index} from cache: {e}")
+            return None
+    
     def save_to_cache(
         self, 
         newsletter: Newsletter, 
@@ -144,12 +409,33 @@ class CacheManager:
         try:
             logger.info(f"Saving newsletter to cache: {cache_path}")
             
-            # Convert to JSON
-            data = newsletter.model_dump(mode='json')
+            if self.cache_format == "block":
+                content = encode_edition(newsletter)
+            else:
+                data = newsletter.model_dump(mode='json')
+                content = json.dumps(data, indent=2, default=str).encode("utf-8")
             
-            # Write to cache file
-            with open(cache_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Write atomically so readers never see a partial edition; the
+            # temp name is unique so concurrent writers of a date cannot clash
+            tmp_path = cache_path.with_name(
+                f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, cache_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            
+            # Drop a copy of the same edition in the other format
+            for suffix in _SUFFIXES.values():
+                other = cache_path.with_suffix(suffix)
+                if other != cache_path:
+                    other.unlink(missing_ok=True)
+            
+            record = self._build_record(date or datetime.now(), cache_path, content, newsletter)
+            self.index.upsert(record)
+            self._index_text(record.date, record.checksum, newsletter)
             
             logger.success(f"Newsletter cached successfully: {cache_path}")
             return True
@@ -158,28 +444,71 @@ class CacheManager:
             logger.error(f"Error saving to cache: {e}")
             return False
     
-    def list_cached_newsletters(self) -> list[tuple[datetime, Path]]:
+    def get_edition(self, date: Optional[datetime] = None) -> Optional[EditionRecord]:
         """
-        List all cached newsletters with their dates.
+        Look up the index entry of a cached edition.
         
+        Args:
+            date: Edition date (defaults to today)
+            
         Returns:
-            List of (date, filepath) tuples for all cached newsletters
+            Edition metadata, or None if no edition is cached for the date
+        """
+        return self.index.get(date or datetime.now())
+    
+    def list_editions(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> list[EditionRecord]:
         """
-        cached = []
+        List cached editions with their metadata.
         
-        for cache_file in self.cache_dir.glob("newsletter_*.json"):
-            try:
-                # Extract date from filename: newsletter_YYYY-MM-DD.json
-                date_str = cache_file.stem.replace("newsletter_", "")
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                cached.append((date, cache_file))
-            except ValueError:
-                logger.warning(f"Invalid cache filename format: {cache_file}")
+        Args:
+            start: Earliest edition date to include
+            end: Latest edition date to include
+            limit: Maximum number of editions to return
+            
+        Returns:
+            Edition metadata sorted by date (newest first)
+        """
+        return self.index.list(start=start, end=end, limit=limit)
+    
+    def list_cached_newsletters(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple[datetime, Path]]:
+        """
+        List all cached newsletters with their dates.
         
-        # Sort by date (newest first)
-        cached.sort(key=lambda x: x[0], reverse=True)
+        Args:
+            start: Earliest edition date to include
+            end: Latest edition date to include
+            limit: Maximum number of editions to return
+            
+        Returns:
+            List of (date, filepath) tuples sorted by date (newest first)
+        """
+        return [
+            (record.date, Path(record.path))
+            for record in self.list_editions(start=start, end=end, limit=limit)
+        ]
+    
+    def search(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """
+        Full-text search over all cached editions.
         
-        return cached
+        Args:
+            query: Free-text query (all words must match)
+            limit: Maximum number of hits to return
+            
+        Returns:
+            Matching editorials and articles, best match first
+        """
+        return self.search_index.search(query, limit=limit)
     
     def clear_old_cache(self, keep_days: int = 7) -> int:
         """
@@ -192,18 +521,19 @@ class CacheManager:
             Number of files deleted
         """
         cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff_date = cutoff_date.replace(day=cutoff_date.day - keep_days)
+        cutoff_date -= timedelta(days=keep_days)
         
         deleted = 0
         
-        for date, cache_file in self.list_cached_newsletters():
-            if date < cutoff_date:
-                try:
-                    cache_file.unlink()
-                    logger.info(f"Deleted old cache: {cache_file}")
-                    deleted += 1
-                except Exception as e:
-                    logger.error(f"Error deleting {cache_file}: {e}")
+        for date, cache_file in self.list_cached_newsletters(end=cutoff_date - timedelta(days=1)):
+            try:
+                cache_file.unlink(missing_ok=True)
+                self.index.remove(date)
+                self.search_index.remove(date)
+                logger.info(f"Deleted old cache: {cache_file}")
+                deleted += 1
+            except Exception as e:
+                logger.error(f"Error deleting {cache_file}: {e}")
         
         return deleted
 
@@ -1,62 +1,182 @@
 # =============================================================================
 #  Filename: crew.py
 #
-#  Short Description: CrewAI workflow orchestration for NVIDIA newsletter
+#  Short Description: CrewAI workflow orchestration for the topic newsletters
 #
 #  Creation date: 2025-09-30
 #  Author: Shrinivas Deshpande
 # =============================================================================
 
+import json
 import os
-from typing import Any
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Optional
 
-from crewai import Crew, LLM, Process
+from crewai import Crew, Process
 from loguru import logger
 
+from NewsLetter2 import tools
 from NewsLetter2.agents import (
     create_editor_agent,
     create_reporter_agent,
     create_senior_editor_agent,
 )
+from NewsLetter2.http_pool import http_pool
+from NewsLetter2.json_utils import extract_json, parse_model_list, parse_model_output
+from NewsLetter2.llm_cache import create_cached_llm
+from NewsLetter2.metrics import TaskTimer, metrics
+from NewsLetter2.model_routing import STAGES, model_router
+from NewsLetter2.models import (
+    ArticleSummary,
+    DraftArticle,
+    Newsletter,
+    NewsletterDraft,
+    ProcessedNewsArticle,
+    RawNewsArticle,
+    Topic,
+)
+from NewsLetter2.static_export import STATIC_EXPORT, exporter_for
+from NewsLetter2.thumbnails import thumbnail_cache
 from NewsLetter2.tasks import (
     create_editor_task,
     create_reporter_task,
     create_senior_editor_task,
 )
+from NewsLetter2.topics import DEFAULT_TOPIC, cache_namespace
+
+
+# Run the Editor stage as a concurrent per-article fan-out instead of one task
+PARALLEL_EDITOR = os.getenv("NEWSLETTER_PARALLEL_EDITOR", "0") == "1"
+
+# OpenAI-compatible endpoint (e.g. the local mock server of the benchmarks);
+# unset uses the OpenAI API
+LLM_BASE_URL = os.getenv("OPENAI_BASE_URL")
 
 
-def create_newsletter_crew() -> Crew:
+def create_llm(stage: Optional[str] = None) -> Any:
     """
-    Create and configure the complete NVIDIA newsletter crew.
+    Create the LLM of a pipeline stage from its model route.
     
-    Orchestrates three agents (Reporter, Editor, Senior Editor) in a sequential
-    workflow to collect, summarize, analyze, and package NVIDIA news into
-    a professional newsletter format.
+    Args:
+        stage: "reporter", "editor" or "senior_editor" (None for the default
+            model, without fallback)
     
     Returns:
-        Configured Crew instance ready for execution
+        Configured LLM instance (with completion caching when enabled, and a
+        fallback LLM when the route has a latency budget)
     """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         logger.error("OPENAI_API_KEY not found in environment")
         raise ValueError("OPENAI_API_KEY environment variable is required")
     
-    # Configure LLM using CrewAI's LLM class
-    llm = LLM(
-        model="gpt-4o-mini",
-        temperature=0.7,
+    kwargs = {"base_url": LLM_BASE_URL} if LLM_BASE_URL else {}
+    
+    # Retries are coordinated by the shared OpenAI service, not the client
+    kwargs["max_retries"] = 0
+    
+    # All OpenAI clients share one keep-alive connection pool
+    http_pool.install_litellm()
+    
+    route = model_router.route(stage)
+    if route.max_tokens:
+        kwargs["max_tokens"] = route.max_tokens
+    
+    fallback = None
+    if route.fallback_model and route.latency_budget_s:
+        fallback = create_cached_llm(
+            model=route.fallback_model,
+            temperature=route.temperature,
+            api_key=api_key,
+            **kwargs,
+        )
+    
+    # Configure LLM using CrewAI's LLM class, wrapped with the completion cache
+    return create_cached_llm(
+        model=route.model,
+        temperature=route.temperature,
         api_key=api_key,
+        stage=stage,
+        fallback=fallback,
+        **kwargs,
     )
+
+
+def create_stage_llms() -> dict[str, Any]:
+    """
+    Create the LLM of every pipeline stage.
     
-    # Create agents
-    reporter = create_reporter_agent(llm)
-    editor = create_editor_agent(llm)
-    senior_editor = create_senior_editor_agent(llm)
+    Returns:
+        LLM instances by stage name
+    """
+    return {stage: create_llm(stage) for stage in STAGES}
+
+
+def check_reporter_output(output: Any) -> None:
+    """
+    Make sure the sequential Reporter's answer fills an edition.
+    
+    Runs as the Reporter task's callback, before the Editor task starts. The
+    selection is rejoined with the candidate records and topped up from the
+    search pool when it is short (see pipeline.select_articles), and the
+    task output handed to the Editor is replaced by the resulting articles.
+    
+    Args:
+        output: TaskOutput of the Reporter task
+    
+    Raises:
+        ValueError: If fewer articles than an edition needs were found,
+            which stops the crew before any Editor call
+    """
+    from NewsLetter2.pipeline import select_articles
+    
+    data = extract_json(output.raw)
+    if isinstance(data, dict):
+        data = data.get("articles") or data.get("ids") or []
+    articles = select_articles(data)
+    
+    ids = tools.register_candidates([article.model_dump(mode="json") for article in articles])
+    output.raw = json.dumps(
+        [
+            {
+                "id": article_id,
+                "title": article.title,
+                "source": article.source,
+                "snippet": article.snippet,
+                "published_date": article.published_date,
+            }
+            for article_id, article in zip(ids, articles)
+        ]
+    )
+
+
+def create_newsletter_crew(topic: Topic = DEFAULT_TOPIC) -> Crew:
+    """
+    Create and configure the complete newsletter crew of a topic.
+    
+    Orchestrates three agents (Reporter, Editor, Senior Editor) in a sequential
+    workflow to collect, summarize, analyze, and package the topic's news into
+    a professional newsletter format.
+    
+    Args:
+        topic: Newsletter topic (defaults to NVIDIA)
+    
+    Returns:
+        Configured Crew instance ready for execution
+    """
+    llms = create_stage_llms()
+    
+    # Create agents, each on the model routed to its stage
+    reporter = create_reporter_agent(llms["reporter"], topic)
+    editor = create_editor_agent(llms["editor"], topic)
+    senior_editor = create_senior_editor_agent(llms["senior_editor"], topic)
     
     # Create tasks with dependencies
-    reporter_task = create_reporter_task(reporter)
-    editor_task = create_editor_task(editor, reporter_task)
-    senior_editor_task = create_senior_editor_task(senior_editor, editor_task)
+    reporter_task = create_reporter_task(reporter, topic=topic)
+    reporter_task.callback = check_reporter_output
+    editor_task = create_editor_task(editor, reporter_task, topic)
+    senior_editor_task = create_senior_editor_task(senior_editor, editor_task, topic)
     
     # Assemble crew
     crew = Crew(
@@ -66,56 +186,152 @@ def create_newsletter_crew() -> Crew:
         verbose=True,
     )
     
-    logger.info("NVIDIA Newsletter Crew assembled successfully")
+    logger.info(f"{topic.name} Newsletter Crew assembled successfully")
     return crew
 
 
-def run_newsletter_generation() -> dict[str, Any]:
+def assemble_newsletter(draft: NewsletterDraft, editor_articles: list[DraftArticle]) -> Newsletter:
+    """
+    Join the Senior Editor's selection with the Editor's articles and candidates.
+    
+    Articles are taken from the Editor task in the order the Senior Editor
+    chose; when it chose fewer than ARTICLES_PER_EDITION known ids, the
+    Editor's remaining articles fill the edition. Article metadata comes from
+    the search tool's candidate records; only the summary texts are taken
+    from the model.
+    
+    Args:
+        draft: Structured output of the Senior Editor task
+        editor_articles: Articles written by the Editor task
+    
+    Returns:
+        Validated Newsletter
+    
+    Raises:
+        ValueError: If an article refers to an unknown candidate id
+    """
+    from NewsLetter2.pipeline import ARTICLES_PER_EDITION
+    
+    by_id = {article.id: article for article in editor_articles}
+    chosen = [article_id for article_id in dict.fromkeys(draft.article_ids) if article_id in by_id]
+    ignored = [article_id for article_id in draft.article_ids if article_id not in by_id]
+    if ignored:
+        logger.warning(f"Senior Editor chose articles the Editor did not write: {', '.join(ignored)}")
+    for article in editor_articles:
+        if len(chosen) >= ARTICLES_PER_EDITION:
+            break
+        if article.id not in chosen:
+            chosen.append(article.id)
+    
+    articles = []
+    unknown = []
+    for article_id in chosen[:ARTICLES_PER_EDITION]:
+        candidate = tools.resolve_candidate(article_id)
+        if candidate is None:
+            unknown.append(article_id)
+            continue
+        item = by_id[article_id]
+        summary = ArticleSummary(
+            short_summary=item.short_summary,
+            detailed_article=item.detailed_article,
+        )
+        articles.append(ProcessedNewsArticle.from_raw(RawNewsArticle(**candidate), summary))
+    
+    if unknown:
+        raise ValueError(f"Newsletter draft refers to unknown articles: {', '.join(unknown)}")
+    return Newsletter(editorial=draft.editorial, articles=articles)
+
+
+def run_newsletter_generation(
+    parallel_editor: Optional[bool] = None,
+    stream: Optional[Any] = None,
+    edition_date: Optional[datetime] = None,
+    topic: Topic = DEFAULT_TOPIC,
+    pipelined: Optional[bool] = None,
+) -> Newsletter:
     """
     Execute the complete newsletter generation workflow.
     
-    Runs the crew to collect NVIDIA news, summarize articles, write editorial,
-    and produce a complete newsletter package. Results are automatically cached.
+    Runs the crew to collect the topic's news, summarize articles, write
+    editorial, and produce a complete newsletter package. Results are
+    automatically cached in the topic's cache namespace.
+    
+    Args:
+        parallel_editor: Summarize each article in its own concurrent Editor
+            call (defaults to NEWSLETTER_PARALLEL_EDITOR)
+        stream: Optional EditionStream receiving stage outputs as they
+            complete (implies the staged parallel pipeline)
+        edition_date: Generate the edition of a past date from the news of
+            the days before it (defaults to today's edition)
+        topic: Newsletter topic (defaults to NVIDIA)
+        pipelined: Write the editorial while the detailed articles are
+            written (defaults to NEWSLETTER_PIPELINED_EDITORIAL, implies the
+            staged parallel pipeline)
     
     Returns:
-        Dictionary containing the final newsletter with editorial and articles
+        Validated Newsletter, handed over in memory
     """
     from NewsLetter2.cache_manager import cache_manager
-    from NewsLetter2.models import Newsletter
-    import json
-    from pathlib import Path
+    from NewsLetter2.pipeline import PIPELINED_EDITORIAL, run_parallel_pipeline
     
-    logger.info("Starting NVIDIA newsletter generation...")
+    if parallel_editor is None:
+        parallel_editor = PARALLEL_EDITOR
+    if pipelined is None:
+        pipelined = PIPELINED_EDITORIAL
     
-    crew = create_newsletter_crew()
-    result = crew.kickoff()
+    # Only the staged pipeline can publish partial results or overlap stages
+    if stream is not None or pipelined:
+        parallel_editor = True
+    
+    mode = "pipelined" if pipelined else "parallel" if parallel_editor else "sequential"
+    window = tools.search_window(edition_date) if edition_date else nullcontext()
+    # Candidate ids of this run stay resolvable however many other runs search
+    with metrics.span("generation", mode=mode, topic=topic.key), window, tools.candidate_scope():
+        if parallel_editor:
+            logger.info(f"Starting {topic.name} newsletter generation ({mode} Editor)...")
+            try:
+                llms = create_stage_llms()
+            except Exception as e:
+                if stream is not None:
+                    stream.fail(e)
+                raise
+            newsletter = run_parallel_pipeline(llms, stream=stream, topic=topic, pipelined=pipelined)
+        else:
+            logger.info(f"Starting {topic.name} newsletter generation...")
+            
+            crew = create_newsletter_crew(topic)
+            
+            # One "task" span per agent task of the sequential crew
+            crew.task_callback = TaskTimer(metrics)
+            result = crew.kickoff()
+            
+            # The Senior Editor's editorial and selection (structured output, or
+            # its JSON as fallback), joined with the Editor task's articles
+            editor_articles = parse_model_list(crew.tasks[1].output.raw, DraftArticle)
+            newsletter = assemble_newsletter(parse_model_output(result, NewsletterDraft), editor_articles)
     
     logger.info("Newsletter generation completed")
     
-    # Try to save to cache
+    # A past edition is dated by its edition date, not by when it was generated
+    if edition_date is not None:
+        newsletter.generated_at = edition_date
+    
+    saved = cache_manager.namespace(cache_namespace(topic)).save_to_cache(newsletter, date=edition_date)
+    if saved:
+        logger.success("Newsletter saved to cache")
+    
+    # Serve thumbnails locally (already prefetched by the staged pipeline);
+    # best effort, as the edition is already saved
     try:
-        # Load from the output file to get clean data
-        output_file = Path("newsletter_output.json")
-        if output_file.exists():
-            with open(output_file) as f:
-                content = f.read()
-                
-            # Clean markdown fences
-            if content.startswith('```json'):
-                content = content[7:]
-            elif content.startswith('```'):
-                content = content[3:]
-            if content.endswith('```'):
-                content = content[:-3]
-            content = content.strip()
-            
-            data = json.loads(content)
-            newsletter = Newsletter(**data)
-            
-            # Save to cache
-            cache_manager.save_to_cache(newsletter)
-            logger.success("Newsletter saved to cache")
+        thumbnail_cache.cache_newsletter(newsletter)
     except Exception as e:
-        logger.warning(f"Could not save to cache: {e}")
+        logger.warning(f"Could not cache the edition's thumbnails: {e}")
+    
+    # The edition is cached even if its static pages cannot be written
+    if saved and STATIC_EXPORT:
+        try:
+            exporter_for(topic).export_edition(edition_date)
+        except Exception as e:
+            logger.warning(f"Could not export the edition as static HTML: {e}")
     
-    return result
+    return newsletter
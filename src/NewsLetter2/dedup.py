@@ -0,0 +1,203 @@
+# =============================================================================
+#  Filename: dedup.py
+#
+#  Short Description: SimHash near-duplicate detection for news articles
+#
+#  Creation date: 2025-10-08
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Near-duplicate story detection.
+
+Google News often returns one wire story syndicated by several outlets with
+slightly different headlines and snippets. Each article's title and snippet
+are fingerprinted with a 64-bit SimHash; articles whose fingerprints differ
+in at most a few bits are collapsed into the highest-ranked copy, and the
+other outlets are kept as alternate sources.
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Iterable
+
+from loguru import logger
+
+from NewsLetter2.models import ArticleSource, RawNewsArticle
+
+
+# Maximum Hamming distance between fingerprints of near-duplicate stories
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("NEWSLETTER_NEAR_DUP_DISTANCE", "12"))
+
+SIMHASH_BITS = 64
+
+# Words that carry no signal about which story an article covers
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "have", "in", "is", "it", "its", "of", "on", "or", "says", "that", "the",
+    "to", "was", "were", "will", "with",
+}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _features(text: str) -> list[str]:
+    """Return word unigrams and bigrams of the text, without stopwords."""
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return tokens + bigrams
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a text.
+    
+    Args:
+        text: Text to fingerprint (typically title plus snippet)
+    
+    Returns:
+        Fingerprint as an unsigned 64-bit integer
+    """
+    features = _features(text)
+    if not features:
+        return 0
+    
+    # Column-wise bit counts over the feature hashes: a fingerprint bit is set
+    # when the majority of features have it set
+    bit_rows = [
+        format(
+            int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big"),
+            f"0{SIMHASH_BITS}b",
+        )
+        for f in features
+    ]
+    majority = len(bit_rows) / 2
+    bits = "".join("1" if column.count("1") > majority else "0" for column in zip(*bit_rows))
+    return int(bits, 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Count differing bits between two fingerprints.
+    
+    Args:
+        a: First fingerprint
+        b: Second fingerprint
+    
+    Returns:
+        Number of differing bits
+    """
+    return (a ^ b).bit_count()
+
+
+def find_duplicate_groups(
+    texts: Iterable[str],
+    max_distance: int = NEAR_DUP_MAX_DISTANCE,
+) -> list[list[int]]:
+    """
+    Group texts whose SimHash fingerprints are within max_distance bits.
+    
+    Every text is compared against the first member of each existing group,
+    so groups are anchored on the earliest (highest-ranked) item.
+    
+    Args:
+        texts: Texts in rank order
+        max_distance: Maximum Hamming distance for a near-duplicate
+    
+    Returns:
+        Groups of indices into texts, each group in rank order
+    """
+    groups: list[list[int]] = []
+    anchors: list[int] = []
+    
+    for idx, text in enumerate(texts):
+        fingerprint = simhash(text)
+        for group, anchor in zip(groups, anchors):
+            if hamming_distance(fingerprint, anchor) <= max_distance:
+                group.append(idx)
+                break
+        else:
+            groups.append([idx])
+            anchors.append(fingerprint)
+    
+    return groups
+
+
+def story_text(title: str, snippet: str) -> str:
+    """Return the text fingerprinted for an article (title weighted twice)."""
+    return f"{title} {title} {snippet}"
+
+
+def collapse_near_duplicates(
+    articles: list[RawNewsArticle],
+    max_distance: int = NEAR_DUP_MAX_DISTANCE,
+) -> list[RawNewsArticle]:
+    """
+    Collapse syndicated copies of the same story into one article.
+    
+    Args:
+        articles: Raw articles in rank order
+        max_distance: Maximum Hamming distance for a near-duplicate
+    
+    Returns:
+        One article per story, each listing the other outlets in
+        alternate_sources
+    """
+    groups = find_duplicate_groups(
+        (story_text(a.title, a.snippet) for a in articles),
+        max_distance,
+    )
+    
+    collapsed: list[RawNewsArticle] = []
+    for group in groups:
+        primary = articles[group[0]]
+        alternates = list(primary.alternate_sources)
+        for idx in group[1:]:
+            duplicate = articles[idx]
+            alternates.append(ArticleSource(source=duplicate.source, url=duplicate.url))
+            alternates.extend(duplicate.alternate_sources)
+        collapsed.append(primary.model_copy(update={"alternate_sources": alternates}))
+    
+    if len(collapsed) < len(articles):
+        logger.info(
+            f"Collapsed {len(articles)} articles into {len(collapsed)} distinct stories"
+        )
+    return collapsed
+
+
+def collapse_near_duplicate_dicts(
+    articles: list[dict[str, Any]],
+    max_distance: int = NEAR_DUP_MAX_DISTANCE,
+) -> list[dict[str, Any]]:
+    """
+    Collapse near-duplicate raw article dictionaries (search tool output).
+    
+    Args:
+        articles: Raw article dictionaries in rank order
+        max_distance: Maximum Hamming distance for a near-duplicate
+    
+    Returns:
+        One dictionary per story, with an "alternate_sources" list of
+        {"source", "url"} entries for the collapsed copies
+    """
+    groups = find_duplicate_groups(
+        (story_text(a.get("title", ""), a.get("snippet", "")) for a in articles),
+        max_distance,
+    )
+    
+    collapsed: list[dict[str, Any]] = []
+    for group in groups:
+        primary = dict(articles[group[0]])
+        alternates = [
+            {"source": articles[idx].get("source"), "url": articles[idx].get("url")}
+            for idx in group[1:]
+        ]
+        if alternates:
+            primary["alternate_sources"] = alternates
+        collapsed.append(primary)
+    
+    if len(collapsed) < len(articles):
+        logger.info(
+            f"Collapsed {len(articles)} search results into {len(collapsed)} distinct stories"
+        )
+    return collapsed
@@ -0,0 +1,232 @@
+# =============================================================================
+#  Filename: edition_cache.py
+#
+#  Short Description: Process-wide cache of parsed editions shared by sessions
+#
+#  Creation date: 2025-10-11
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Shared in-process cache of parsed editions.
+
+Every Streamlit session used to parse and validate its own copy of the
+edition. This cache parses each edition once per process and hands the same
+read-only objects to all sessions, which keep only the edition key
+(YYYY-MM-DD) in their session state. Entries are validated against the
+edition index checksum and the file's mtime, so a regenerated edition is
+picked up on the next access. Editions of other topics are read from their
+cache namespace and keyed by namespace as well.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from NewsLetter2.cache_manager import CacheManager, cache_manager
+from NewsLetter2.models import NewsletterPreview, ProcessedNewsArticle
+
+
+# Maximum number of parsed objects (previews and articles) kept in memory
+EDITION_CACHE_ENTRIES = int(os.getenv("NEWSLETTER_EDITION_CACHE_ENTRIES", "256"))
+
+
+class SharedEditionCache:
+    """LRU cache of parsed editions, shared by all sessions of the process."""
+    
+    def __init__(self, manager: CacheManager, max_entries: int = EDITION_CACHE_ENTRIES):
+        """
+        Initialize shared edition cache.
+        
+        Args:
+            manager: Cache manager the editions are loaded from
+            max_entries: Maximum number of parsed objects kept in memory
+        """
+        self.manager = manager
+        self.max_entries = max_entries
+        
+        self._entries: OrderedDict[tuple, tuple[tuple, Any]] = OrderedDict()
+        self._loading: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def _version(self, manager: CacheManager, date: datetime) -> Optional[tuple]:
+        """
+        Return the current version token of an edition.
+        
+        Args:
+            manager: Cache manager of the edition's namespace
+            date: Edition date
+        
+        Returns:
+            (checksum, mtime, size) of the edition file, or None if not cached
+        """
+        record = manager.get_edition(date)
+        if record is None:
+            return None
+        try:
+            stat = Path(record.path).stat()
+        except OSError:
+            return None
+        return record.checksum, stat.st_mtime_ns, stat.st_size
+    
+    def _get(
+        self,
+        key: tuple,
+        manager: CacheManager,
+        date: datetime,
+        loader: Callable[[], Any],
+    ) -> Any:
+        """
+        Return a cached object, loading it at most once per version.
+        
+        Concurrent sessions asking for the same missing object wait for a
+        single load instead of parsing the edition in parallel. If that load
+        raises, every waiting session receives the exception.
+        
+        Args:
+            key: Cache key
+            manager: Cache manager of the edition's namespace
+            date: Edition date the object belongs to
+            loader: Function loading the object from the cache manager
+        
+        Returns:
+            Loaded object, or None if the edition is unavailable
+        """
+        version = self._version(manager, date)
+        if version is None:
+            return None
+        
+        # In-flight loads are keyed by version so a waiter never receives an
+        # object parsed from an older file
+        loading_key = (key, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            pending = self._loading.get(loading_key)
+            if pending is None:
+                pending = self._loading[loading_key] = Future()
+                leader = True
+                self._misses += 1
+            else:
+                leader = False
+                self._hits += 1
+        
+        if not leader:
+            return pending.result()
+        
+        try:
+            value = loader()
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            with self._lock:
+                if value is not None:
+                    self._entries[key] = (version, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            pending.set_result(value)
+        finally:
+            with self._lock:
+                self._loading.pop(loading_key, None)
+        
+        return value
+    
+    def get_preview(
+        self,
+        edition_key: str,
+        namespace: Optional[str] = None,
+    ) -> Optional[NewsletterPreview]:
+        """
+        Return the shared landing-page view of an edition.
+        
+        The returned object is shared by all sessions and must not be mutated.
+        
+        Args:
+            edition_key: Edition date as YYYY-MM-DD
+            namespace: Cache namespace of the edition's topic (None for default)
+        
+        Returns:
+            NewsletterPreview, or None if the edition is not cached
+        """
+        date = datetime.strptime(edition_key, "%Y-%m-%d")
+        manager = self.manager.namespace(namespace)
+        return self._get(
+            (edition_key, namespace, "preview"),
+            manager,
+            date,
+            lambda: manager.load_preview(date),
+        )
+    
+    def get_article(
+        self,
+        edition_key: str,
+        index: int,
+        namespace: Optional[str] = None,
+    ) -> Optional[ProcessedNewsArticle]:
+        """
+        Return one shared, fully loaded article of an edition.
+        
+        The returned object is shared by all sessions and must not be mutated.
+        
+        Args:
+            edition_key: Edition date as YYYY-MM-DD
+            index: Position of the article in the edition
+            namespace: Cache namespace of the edition's topic (None for default)
+        
+        Returns:
+            Processed article, or None if unavailable
+        """
+        date = datetime.strptime(edition_key, "%Y-%m-%d")
+        manager = self.manager.namespace(namespace)
+        return self._get(
+            (edition_key, namespace, "article", index),
+            manager,
+            date,
+            lambda: manager.load_article(index, date),
+        )
+    
+    def invalidate(self, edition_key: Optional[str] = None) -> None:
+        """
+        Drop cached objects of one edition, or of all editions.
+        
+        Args:
+            edition_key: Edition date as YYYY-MM-DD (None clears everything)
+        """
+        with self._lock:
+            if edition_key is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == edition_key]:
+                    del self._entries[key]
+        logger.info(f"Shared edition cache invalidated: {edition_key or 'all'}")
+    
+    def stats(self) -> dict[str, int]:
+        """
+        Return cache statistics.
+        
+        Returns:
+            Dictionary with entries, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Global shared edition cache instance
+edition_cache = SharedEditionCache(cache_manager)
@@ -0,0 +1,175 @@
+# =============================================================================
+#  Filename: edition_format.py
+#
+#  Short Description: Compressed block file format for cached editions
+#
+#  Creation date: 2025-10-10
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Compact on-disk format for cached editions.
+
+An edition file is laid out as:
+
+    MAGIC | header length (4 bytes, big-endian) | header | block 0 | block 1 | ...
+
+The header is deflate-compressed JSON holding the editorial, every article
+without its detailed_article, and the (offset, length, size) of each
+article's block. The blocks are one deflate stream of all detailed articles
+with a full flush after each one, so every block can be decompressed on its
+own while a full load inflates the whole stream in a single call.
+The landing page only reads and decompresses the header; an article page
+seeks to and decompresses a single block.
+"""
+
+import json
+import struct
+import zlib
+from pathlib import Path
+
+from NewsLetter2.models import Newsletter, NewsletterPreview, ProcessedNewsArticle
+
+
+# File signature and format version
+MAGIC = b"NLED\x01"
+
+# File extension of block-format editions
+EDITION_SUFFIX = ".nlz"
+
+_LENGTH = struct.Struct(">I")
+
+_COMPRESS_LEVEL = 6
+
+# Raw deflate (no zlib/gzip framing), so blocks can be inflated independently
+_WBITS = -15
+
+
+def _decompress(data: bytes) -> bytes:
+    """Inflate raw deflate data."""
+    return zlib.decompress(data, _WBITS)
+
+
+def _compress_json(data) -> bytes:
+    """Serialize data as compact JSON and deflate it."""
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, _WBITS)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def encode_edition(newsletter: Newsletter) -> bytes:
+    """
+    Encode a newsletter in the block format.
+    
+    Args:
+        newsletter: Newsletter to encode
+    
+    Returns:
+        File contents
+    """
+    data = newsletter.model_dump(mode="json")
+    
+    # A full flush ends each block on a byte boundary with no references
+    # to earlier blocks, so any block can be inflated starting at its offset
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, _WBITS)
+    blocks: list[bytes] = []
+    offsets: list[list[int]] = []
+    position = 0
+    for article in data["articles"]:
+        text = article.pop("detailed_article").encode("utf-8")
+        block = compressor.compress(text) + compressor.flush(zlib.Z_FULL_FLUSH)
+        offsets.append([position, len(block), len(text)])
+        blocks.append(block)
+        position += len(block)
+    blocks.append(compressor.flush())
+    
+    header = _compress_json({"newsletter": data, "blocks": offsets})
+    return b"".join([MAGIC, _LENGTH.pack(len(header)), header, *blocks])
+
+
+def _read_header(f) -> tuple[dict, list[list[int]], int]:
+    """
+    Read the header of an open edition file.
+    
+    Returns:
+        Newsletter data without detailed articles, block offsets, and the
+        file position where the blocks start
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a block-format edition file")
+    (header_length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+    header = json.loads(_decompress(f.read(header_length)))
+    return header["newsletter"], header["blocks"], len(MAGIC) + _LENGTH.size + header_length
+
+
+def read_preview(path: Path) -> NewsletterPreview:
+    """
+    Load the landing-page view of an edition (header only).
+    
+    Args:
+        path: Edition file path
+    
+    Returns:
+        Newsletter preview without detailed articles
+    """
+    with open(path, "rb") as f:
+        data, _, _ = _read_header(f)
+    return NewsletterPreview(**data)
+
+
+def read_article(path: Path, index: int) -> ProcessedNewsArticle:
+    """
+    Load one complete article, decompressing only its block.
+    
+    Args:
+        path: Edition file path
+        index: Position of the article in the edition
+    
+    Returns:
+        Processed article including its detailed text
+    """
+    with open(path, "rb") as f:
+        data, blocks, blocks_start = _read_header(f)
+        offset, length, _ = blocks[index]
+        f.seek(blocks_start + offset)
+        detailed = zlib.decompressobj(_WBITS).decompress(f.read(length)).decode("utf-8")
+    return ProcessedNewsArticle(**data["articles"][index], detailed_article=detailed)
+
+
+def decode_edition(content: bytes) -> Newsletter:
+    """
+    Decode a complete block-format edition.
+    
+    Args:
+        content: File contents
+    
+    Returns:
+        Complete newsletter
+    """
+    if not content.startswith(MAGIC):
+        raise ValueError("Not a block-format edition file")
+    (header_length,) = _LENGTH.unpack_from(content, len(MAGIC))
+    blocks_start = len(MAGIC) + _LENGTH.size + header_length
+    header = json.loads(_decompress(content[len(MAGIC) + _LENGTH.size:blocks_start]))
+    
+    # Inflate all blocks in one call and split on the recorded sizes
+    details = _decompress(content[blocks_start:])
+    position = 0
+    data = header["newsletter"]
+    for article, (_, _, size) in zip(data["articles"], header["blocks"]):
+        article["detailed_article"] = details[position:position + size].decode("utf-8")
+        position += size
+    return Newsletter(**data)
+
+
+def read_edition(path: Path) -> Newsletter:
+    """
+    Load a complete block-format edition.
+    
+    Args:
+        path: Edition file path
+    
+    Returns:
+        Complete newsletter
+    """
+    return decode_edition(Path(path).read_bytes())
@@ -0,0 +1,196 @@
+# =============================================================================
+#  Filename: edition_index.py
+#
+#  Short Description: SQLite index of cached newsletter editions
+#
+#  Creation date: 2025-10-10
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+SQLite-backed index of cached editions.
+
+The index is keyed on the edition date (a B-tree primary key), so existence
+checks, listings and date-range queries are index lookups instead of a scan
+and parse of every file in the cache directory.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from NewsLetter2.models import EditionRecord
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS editions (
+    date TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    checksum TEXT NOT NULL,
+    article_count INTEGER NOT NULL,
+    headline TEXT,
+    generated_at TEXT
+)
+"""
+
+_COLUMNS = "date, path, size, checksum, article_count, headline, generated_at"
+
+_DATE_FORMAT = "%Y-%m-%d"
+
+
+class EditionIndex:
+    """Edition metadata stored in a SQLite table keyed by date."""
+    
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the edition index.
+        
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One connection shared by all threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+    
+    @staticmethod
+    def _to_record(row: tuple) -> EditionRecord:
+        """Convert a table row into an EditionRecord."""
+        date, path, size, checksum, article_count, headline, generated_at = row
+        return EditionRecord(
+            date=datetime.strptime(date, _DATE_FORMAT),
+            path=path,
+            size=size,
+            checksum=checksum,
+            article_count=article_count,
+            headline=headline,
+            generated_at=generated_at,
+        )
+    
+    def upsert(self, record: EditionRecord) -> None:
+        """
+        Insert or replace the entry of an edition.
+        
+        Args:
+            record: Edition metadata
+        """
+        generated_at = record.generated_at.isoformat() if record.generated_at else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO editions ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.date.strftime(_DATE_FORMAT),
+                    record.path,
+                    record.size,
+                    record.checksum,
+                    record.article_count,
+                    record.headline,
+                    generated_at,
+                ),
+            )
+    
+    def remove(self, date: datetime) -> None:
+        """
+        Remove the entry of an edition.
+        
+        Args:
+            date: Edition date
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM editions WHERE date = ?", (date.strftime(_DATE_FORMAT),)
+            )
+    
+    def get(self, date: datetime) -> Optional[EditionRecord]:
+        """
+        Look up the entry of an edition.
+        
+        Args:
+            date: Edition date
+        
+        Returns:
+            Edition metadata, or None if the edition is not indexed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM editions WHERE date = ?",
+                (date.strftime(_DATE_FORMAT),),
+            ).fetchone()
+        return self._to_record(row) if row else None
+    
+    def exists(self, date: datetime) -> bool:
+        """
+        Check whether an edition is indexed.
+        
+        Args:
+            date: Edition date
+        
+        Returns:
+            True if the edition is indexed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM editions WHERE date = ?", (date.strftime(_DATE_FORMAT),)
+            ).fetchone()
+        return row is not None
+    
+    def list(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> list[EditionRecord]:
+        """
+        List indexed editions, newest first.
+        
+        Args:
+            start: Earliest edition date to include
+            end: Latest edition date to include
+            limit: Maximum number of editions to return
+        
+        Returns:
+            Edition metadata sorted by date, newest first
+        """
+        query = f"SELECT {_COLUMNS} FROM editions WHERE 1 = 1"
+        params: list = []
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.strftime(_DATE_FORMAT))
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(end.strftime(_DATE_FORMAT))
+        query += " ORDER BY date DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_record(row) for row in rows]
+    
+    def dates(self) -> set[str]:
+        """Return all indexed edition dates as YYYY-MM-DD strings."""
+        with self._lock:
+            rows = self._conn.execute("SELECT date FROM editions").fetchall()
+        return {row[0] for row in rows}
+    
+    def __len__(self) -> int:
+        """Return the number of indexed editions."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM editions").fetchone()[0]
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+        logger.debug(f"Edition index closed: {self.db_path}")
@@ -0,0 +1,267 @@
+# =============================================================================
+#  Filename: http_pool.py
+#
+#  Short Description: Process-wide pooled HTTP clients for API calls
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Shared, keep-alive HTTP connection pools for the external APIs.
+
+Two clients are created lazily and shared by every run in the process
+(parallel Editor calls, backfilled dates, several topics):
+
+- A requests Session for SerpAPI and thumbnail downloads, with a bounded
+  connection pool per host. requests does not speak HTTP/2.
+- An httpx Client installed as litellm's client session, so every OpenAI
+  client litellm creates sends its requests through one pool. It
+  negotiates HTTP/2 when the optional h2 package is installed. Without
+  litellm (crewai releases that call the provider SDKs directly) the LLM
+  calls keep their own clients.
+
+Requests, newly opened connections and TLS handshakes are counted per
+client; stats() reports them, so connection reuse can be checked (the
+fewer connections per request, the more round trips skipped TCP/TLS set-up).
+"""
+
+import importlib.util
+import os
+import threading
+from collections import Counter
+from typing import Any, Optional
+
+import httpx
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import litellm
+except ImportError:
+    litellm = None
+
+
+# Maximum connections kept per host (requests) and in total (httpx)
+POOL_SIZE = int(os.getenv("NEWSLETTER_HTTP_POOL_SIZE", "32"))
+
+# Seconds an idle connection of the LLM client is kept open
+KEEPALIVE_SECONDS = float(os.getenv("NEWSLETTER_HTTP_KEEPALIVE_SECONDS", "60"))
+
+# Negotiate HTTP/2 for the LLM client (only when h2 is installed)
+HTTP2 = os.getenv("NEWSLETTER_HTTP2", "1") != "0"
+
+# Number of hosts whose connection pools the Session keeps (LRU)
+_POOL_HOSTS = 16
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTPConnectionPool that counts the connections it opens."""
+    
+    def _new_conn(self) -> Any:
+        """
+        Open a new plain HTTP connection and count it.
+        
+        Returns:
+            Connection created by urllib3
+        """
+        http_pool.count("session", "connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPSConnectionPool that counts connections and TLS handshakes."""
+    
+    def _new_conn(self) -> Any:
+        """
+        Open a new HTTPS connection and count it with its TLS handshake.
+        
+        Returns:
+            Connection created by urllib3
+        """
+        http_pool.count("session", "connections")
+        http_pool.count("session", "tls_handshakes")
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count the connections they open."""
+    
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+    
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        http_pool.count("session", "requests")
+        return super().send(request, **kwargs)
+
+
+class HttpPool:
+    """Lazily created HTTP clients shared by the whole process."""
+    
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        keepalive_seconds: float = KEEPALIVE_SECONDS,
+        http2: bool = HTTP2,
+    ):
+        """
+        Initialize the pool (clients are created on first use).
+        
+        Args:
+            pool_size: Maximum connections per host (Session) and in total
+                (LLM client)
+            keepalive_seconds: Idle time after which LLM connections are closed
+            http2: Negotiate HTTP/2 for the LLM client if h2 is installed
+        """
+        self.pool_size = max(1, pool_size)
+        self.keepalive_seconds = keepalive_seconds
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._session: Optional[requests.Session] = None
+        self._llm_client: Optional[httpx.Client] = None
+        self._counters: dict[str, Counter] = {"session": Counter(), "llm": Counter()}
+        self._lock = threading.Lock()
+    
+    def count(self, client: str, counter: str) -> None:
+        """Increment a counter of one client ("session" or "llm")."""
+        with self._lock:
+            self._counters[client][counter] += 1
+    
+    def session(self) -> requests.Session:
+        """
+        Return the shared requests Session (SerpAPI, thumbnails).
+        
+        Returns:
+            Session with a keep-alive pool of pool_size connections per host
+        """
+        with self._lock:
+            if self._session is None:
+                # Retries are left to NewsLetter2.resilience
+                adapter = _PooledAdapter(
+                    pool_connections=_POOL_HOSTS,
+                    pool_maxsize=self.pool_size,
+                    max_retries=0,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+    
+    def _trace_llm(self, event_name: str, info: dict[str, Any]) -> None:
+        """
+        Count connections and TLS handshakes reported by httpcore's trace.
+        
+        Args:
+            event_name: httpcore trace event, e.g. "connection.connect_tcp.complete"
+            info: Event details (unused)
+        """
+        if event_name == "connection.connect_tcp.complete":
+            self.count("llm", "connections")
+        elif event_name == "connection.start_tls.complete":
+            self.count("llm", "tls_handshakes")
+    
+    def _on_llm_request(self, request: httpx.Request) -> None:
+        """
+        Count an LLM request and attach the connection trace to it.
+        
+        Args:
+            request: Outgoing httpx request (event hook)
+        """
+        self.count("llm", "requests")
+        request.extensions["trace"] = self._trace_llm
+    
+    def _on_llm_response(self, response: httpx.Response) -> None:
+        """
+        Count LLM responses that were served over HTTP/2.
+        
+        Args:
+            response: Received httpx response (event hook)
+        """
+        if response.http_version == "HTTP/2":
+            self.count("llm", "http2_responses")
+    
+    def llm_client(self) -> httpx.Client:
+        """
+        Return the shared httpx Client used for the OpenAI API.
+        
+        Returns:
+            Client with a keep-alive pool of pool_size connections
+        """
+        with self._lock:
+            if self._llm_client is None:
+                self._llm_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                        keepalive_expiry=self.keepalive_seconds,
+                    ),
+                    http2=self.http2,
+                    follow_redirects=True,
+                    event_hooks={
+                        "request": [self._on_llm_request],
+                        "response": [self._on_llm_response],
+                    },
+                )
+                logger.info(
+                    f"LLM HTTP pool: {self.pool_size} connections, "
+                    f"{'HTTP/2' if self.http2 else 'HTTP/1.1'}"
+                )
+            return self._llm_client
+    
+    def install_litellm(self) -> bool:
+        """
+        Make litellm create its OpenAI clients on the shared LLM client.
+        
+        Returns:
+            True if the client is installed, False if litellm is not available
+        """
+        if litellm is None:
+            return False
+        
+        client = self.llm_client()
+        if litellm.client_session is not client:
+            litellm.client_session = client
+        return True
+    
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Return the counters of both clients.
+        
+        Returns:
+            Per client ("session", "llm"): requests sent, connections opened,
+            TLS handshakes and (LLM) responses received over HTTP/2
+        """
+        with self._lock:
+            return {
+                client: {
+                    "requests": counters["requests"],
+                    "connections": counters["connections"],
+                    "tls_handshakes": counters["tls_handshakes"],
+                    **({"http2_responses": counters["http2_responses"]} if client == "llm" else {}),
+                }
+                for client, counters in self._counters.items()
+            }
+    
+    def close(self) -> None:
+        """Close all pooled connections; the clients are recreated on next use."""
+        with self._lock:
+            session, self._session = self._session, None
+            llm_client, self._llm_client = self._llm_client, None
+        if session is not None:
+            session.close()
+        if llm_client is not None:
+            # litellm caches OpenAI clients bound to the closed pool
+            if litellm is not None and litellm.client_session is llm_client:
+                litellm.client_session = None
+                litellm.in_memory_llm_clients_cache.flush_cache()
+            llm_client.close()
+
+
+# Global HTTP pool instance
+http_pool = HttpPool()
@@ -0,0 +1,330 @@
+# =============================================================================
+#  Filename: jobs.py
+#
+#  Short Description: Background job queue for newsletter generation
+#
+#  Creation date: 2025-10-09
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Background generation jobs decoupled from the Streamlit request.
+
+Generation runs on a worker pool owned by the process rather than by the
+browser session that clicked the button. Every job has an id and a status
+file under cache/jobs/ that is updated at each pipeline stage, so any
+session (including one opened after a page reload) can find the running
+job, follow its progress and pick up the cached edition when it finishes.
+Each job generates the edition of one topic; jobs of different topics may
+be queued side by side.
+
+When today's edition is missing, readers are served the newest cached
+edition while a single background refresh job regenerates today's edition
+(stale-while-revalidate). The refresh is shared by all sessions, and a
+failed refresh is retried only after a back-off.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from NewsLetter2.models import GenerationJob, PartialNewsletter
+from NewsLetter2.streaming import EditionStream
+from NewsLetter2.topics import get_topic
+
+
+# Directory holding one status file per job
+JOBS_DIR = os.getenv("NEWSLETTER_JOBS_DIR", "cache/jobs")
+
+# Number of generation jobs that may run at the same time
+JOB_WORKERS = int(os.getenv("NEWSLETTER_JOB_WORKERS", "1"))
+
+# Number of finished job status files kept on disk
+JOB_HISTORY = int(os.getenv("NEWSLETTER_JOB_HISTORY", "20"))
+
+# Regenerate today's edition in the background when a stale one is served
+STALE_REFRESH = os.getenv("NEWSLETTER_STALE_REFRESH", "1") != "0"
+
+# Seconds before a failed background refresh is attempted again
+REFRESH_RETRY_SECONDS = float(os.getenv("NEWSLETTER_REFRESH_RETRY_SECONDS", "600"))
+
+
+class JobManager:
+    """Runs newsletter generation jobs on a worker pool with persistent status."""
+    
+    def __init__(
+        self,
+        jobs_dir: str = JOBS_DIR,
+        max_workers: int = JOB_WORKERS,
+        history: int = JOB_HISTORY,
+    ):
+        """
+        Initialize job manager.
+        
+        Jobs left queued or running by a previous process can never finish,
+        so they are marked as failed.
+        
+        Args:
+            jobs_dir: Directory for job status files
+            max_workers: Maximum number of concurrently running jobs
+            history: Number of finished job status files to keep
+        """
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.history = history
+        
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="newsletter-job",
+        )
+        self._lock = threading.Lock()
+        self._jobs: dict[str, GenerationJob] = {}
+        self._streams: dict[str, EditionStream] = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_failed_at: dict[str, float] = {}
+        
+        for job in self._load_jobs():
+            if not job.finished:
+                job.status = "failed"
+                job.error = "Interrupted by an application restart"
+                job.finished_at = datetime.now()
+                self._persist(job)
+            self._jobs[job.job_id] = job
+        
+        logger.info(f"Job manager initialized with directory: {self.jobs_dir}")
+    
+    def _job_path(self, job_id: str) -> Path:
+        """Return the status file path of a job."""
+        return self.jobs_dir / f"job_{job_id}.json"
+    
+    def _load_jobs(self) -> list[GenerationJob]:
+        """Load all persisted job statuses."""
+        jobs = []
+        for path in self.jobs_dir.glob("job_*.json"):
+            try:
+                jobs.append(GenerationJob.model_validate_json(path.read_text()))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable job file {path}: {e}")
+        return jobs
+    
+    def _persist(self, job: GenerationJob) -> None:
+        """Atomically write a job status file."""
+        path = self._job_path(job.job_id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(job.model_dump_json(indent=2))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist job {job.job_id}: {e}")
+    
+    def _update(self, job_id: str, **changes) -> None:
+        """Apply changes to a job and persist its status."""
+        with self._lock:
+            job = self._jobs[job_id].model_copy(update=changes)
+            self._jobs[job_id] = job
+            self._persist(job)
+    
+    def _prune(self) -> None:
+        """Delete status files of the oldest finished jobs beyond the history size."""
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished),
+                key=lambda job: job.created_at,
+                reverse=True,
+            )
+            for job in finished[self.history:]:
+                self._job_path(job.job_id).unlink(missing_ok=True)
+                del self._jobs[job.job_id]
+                self._streams.pop(job.job_id, None)
+    
+    def submit(self, topic_key: Optional[str] = None, refresh: bool = False) -> GenerationJob:
+        """
+        Queue a newsletter generation job.
+        
+        Only one generation per topic is useful at a time, so when a job of
+        the topic is already queued or running that job is returned instead
+        of starting another.
+        
+        Args:
+            topic_key: Topic of the edition (None for the default topic)
+            refresh: Mark the job as the background refresh of a stale edition
+        
+        Returns:
+            Status of the new (or already active) job
+        """
+        topic = get_topic(topic_key)
+        job = GenerationJob(job_id=uuid.uuid4().hex[:12], topic=topic.key, refresh=refresh)
+        stream = EditionStream()
+        stream.subscribe(
+            lambda event, snapshot: self._on_stream_event(job.job_id, event, snapshot)
+        )
+        
+        # Checked and inserted under one lock so a double click or a
+        # concurrent refresh() cannot queue a second job of the topic
+        with self._lock:
+            active = self._active_job_locked(topic.key)
+            if active is not None:
+                logger.info(f"Generation job {active.job_id} already {active.status}")
+                return active
+            self._jobs[job.job_id] = job
+            self._streams[job.job_id] = stream
+            self._persist(job)
+        
+        self._executor.submit(self._run, job.job_id, stream)
+        logger.info(f"Queued {topic.name} generation job {job.job_id}")
+        return job
+    
+    def refresh(self, topic_key: Optional[str] = None) -> Optional[GenerationJob]:
+        """
+        Make sure today's edition of a topic is being regenerated.
+        
+        Called whenever a stale edition is served. All sessions share one
+        refresh: a queued or running job of the topic is returned as is, and
+        after a failed refresh no new one starts for REFRESH_RETRY_SECONDS.
+        
+        Args:
+            topic_key: Topic of the edition (None for the default topic)
+        
+        Returns:
+            Active job of the topic, or None while refreshes are disabled or
+            backing off
+        """
+        if not STALE_REFRESH:
+            return None
+        topic = get_topic(topic_key)
+        
+        # Serialized so concurrent sessions cannot both queue a refresh
+        with self._refresh_lock:
+            active = self.active_job(topic.key)
+            if active is not None:
+                return active
+            
+            failed_at = self._refresh_failed_at.get(topic.key)
+            if failed_at is not None and time.monotonic() - failed_at < REFRESH_RETRY_SECONDS:
+                return None
+            
+            logger.info(f"Serving a stale {topic.name} edition, refreshing it in the background")
+            return self.submit(topic.key, refresh=True)
+    
+    def _on_stream_event(self, job_id: str, event: str, snapshot: PartialNewsletter) -> None:
+        """Record pipeline progress published to a job's stream."""
+        if event in ("complete", "failed"):
+            return
+        self._update(
+            job_id,
+            stage=snapshot.stage,
+            articles_total=len(snapshot.raw_articles),
+            articles_completed=sum(article is not None for article in snapshot.articles),
+        )
+    
+    def _run(self, job_id: str, stream: EditionStream) -> None:
+        """Execute a job on a worker thread."""
+        from NewsLetter2.crew import run_newsletter_generation
+        
+        self._update(job_id, status="running", started_at=datetime.now())
+        logger.info(f"Generation job {job_id} started")
+        
+        try:
+            with self._lock:
+                topic = get_topic(self._jobs[job_id].topic)
+            run_newsletter_generation(parallel_editor=True, stream=stream, topic=topic)
+        except Exception as e:
+            logger.error(f"Generation job {job_id} failed: {e}")
+            job = self.get(job_id)
+            if job.refresh:
+                with self._refresh_lock:
+                    self._refresh_failed_at[job.topic] = time.monotonic()
+            if not stream.done:
+                stream.fail(e)
+            self._update(
+                job_id,
+                status="failed",
+                error=str(e),
+                finished_at=datetime.now(),
+            )
+        else:
+            newsletter = stream.newsletter
+            self._update(
+                job_id,
+                status="succeeded",
+                stage="done",
+                articles_completed=len(newsletter.articles),
+                articles_total=len(newsletter.articles),
+                edition_date=newsletter.generated_at.strftime("%Y-%m-%d"),
+                finished_at=datetime.now(),
+            )
+            logger.success(f"Generation job {job_id} completed")
+        finally:
+            self._prune()
+    
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """
+        Return the current status of a job.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Job status, or None if the job is unknown
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def stream(self, job_id: str) -> Optional[EditionStream]:
+        """
+        Return the live stream of a job started by this process.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            EditionStream with the partial edition, or None if unavailable
+        """
+        with self._lock:
+            return self._streams.get(job_id)
+    
+    def active_job(self, topic_key: Optional[str] = None) -> Optional[GenerationJob]:
+        """
+        Return the job that is currently queued or running, if any.
+        
+        Args:
+            topic_key: Only consider jobs of this topic (None for any topic)
+        
+        Returns:
+            Oldest unfinished job, or None when the queue is idle
+        """
+        with self._lock:
+            return self._active_job_locked(topic_key)
+    
+    def _active_job_locked(self, topic_key: Optional[str]) -> Optional[GenerationJob]:
+        """Find the oldest unfinished job; the caller must hold self._lock."""
+        active = [
+            job for job in self._jobs.values()
+            if not job.finished and (topic_key is None or job.topic == topic_key)
+        ]
+        return min(active, key=lambda job: job.created_at) if active else None
+    
+    def list_jobs(self, limit: int = 5) -> list[GenerationJob]:
+        """
+        List the most recent jobs.
+        
+        Args:
+            limit: Maximum number of jobs to return
+        
+        Returns:
+            Jobs sorted newest first
+        """
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return jobs[:limit]
+
+
+# Global job manager instance
+job_manager = JobManager()
@@ -0,0 +1,125 @@
+# =============================================================================
+#  Filename: json_utils.py
+#
+#  Short Description: Tolerant JSON extraction from LLM output
+#
+#  Creation date: 2025-10-07
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Helpers for reading JSON out of free-form model output.
+
+Agents frequently wrap their JSON in markdown code fences or surround it
+with a sentence of prose; these helpers recover the JSON value regardless.
+They are the single parsing path for model output and cached JSON files.
+"""
+
+import json
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def strip_code_fences(content: str) -> str:
+    """
+    Remove a surrounding markdown code fence, if present.
+    
+    Args:
+        content: Raw text, possibly wrapped in ```json ... ```
+    
+    Returns:
+        Text without the fence markers, stripped of whitespace
+    """
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    elif content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+
+def extract_json(content: str) -> Any:
+    """
+    Parse the first JSON object or array found in a piece of text.
+    
+    Args:
+        content: Model output containing a JSON value
+    
+    Returns:
+        Parsed JSON value
+    
+    Raises:
+        ValueError: If no JSON value can be decoded from the text
+    """
+    content = strip_code_fences(content)
+    
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    
+    # Fall back to decoding from the first opening bracket
+    decoder = json.JSONDecoder()
+    for idx, char in enumerate(content):
+        if char not in "{[":
+            continue
+        try:
+            value, _ = decoder.raw_decode(content, idx)
+            return value
+        except json.JSONDecodeError:
+            continue
+    
+    raise ValueError("No JSON value found in model output")
+
+
+def parse_model_list(content: str, model: type[ModelT], key: str = "articles") -> list[ModelT]:
+    """
+    Parse a JSON list of models from model output.
+    
+    Accepts a bare JSON array, or an object holding the array under key.
+    
+    Args:
+        content: Model output containing the list
+        model: Pydantic model class of the items
+        key: Key of the list when the model wrapped it in an object
+    
+    Returns:
+        Validated model instances in output order
+    
+    Raises:
+        ValueError: If the output contains no valid list of models
+    """
+    data = extract_json(content)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        raise ValueError(f"No list of {model.__name__} found in model output")
+    return [model.model_validate(item) for item in data]
+
+
+def parse_model_output(output: Any, model: type[ModelT]) -> ModelT:
+    """
+    Return the validated model from a crew or task output.
+    
+    Uses the structured output (output_pydantic) when CrewAI produced one,
+    and otherwise extracts and validates the JSON from the raw text.
+    
+    Args:
+        output: CrewOutput or TaskOutput
+        model: Expected Pydantic model class
+    
+    Returns:
+        Validated model instance
+    
+    Raises:
+        ValueError: If the output contains no valid model
+    """
+    if isinstance(output.pydantic, model):
+        return output.pydantic
+    return model.model_validate(extract_json(output.raw))
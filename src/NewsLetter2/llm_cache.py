@@ -0,0 +1,487 @@
+# =============================================================================
+#  Filename: llm_cache.py
+#
+#  Short Description: Content-addressed completion cache for the crew LLM
+#
+#  Creation date: 2025-10-06
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Completion cache for CrewAI LLM calls.
+
+Completions are stored on disk under a hash of the model, sampling settings
+and the full message list, so rerunning a stage with unchanged inputs returns
+the previous completion without calling OpenAI. The store is bounded in size
+and evicts the least recently used entries first.
+
+Every call, cached or not, is recorded as an "llm" metrics span with its
+latency and the token usage reported by the API. Calls that reach the API go
+through the shared OpenAI rate limiter, retry policy and circuit breaker.
+An LLM serving a pipeline stage reports its latency to the model router and
+delegates to its fallback model while the stage is over its latency budget.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai import LLM
+from loguru import logger
+
+from NewsLetter2.metrics import Span, metrics
+from NewsLetter2.model_routing import model_router
+from NewsLetter2.resilience import openai_service
+from NewsLetter2.token_budget import count_tokens
+
+
+# Cache settings (override via environment variables)
+LLM_CACHE_ENABLED = os.getenv("NEWSLETTER_LLM_CACHE", "1") == "1"
+LLM_CACHE_DIR = os.getenv("NEWSLETTER_LLM_CACHE_DIR", "cache/llm")
+LLM_CACHE_MAX_BYTES = int(os.getenv("NEWSLETTER_LLM_CACHE_MAX_MB", "256")) * 1024 * 1024
+LLM_DETERMINISTIC = os.getenv("NEWSLETTER_LLM_DETERMINISTIC", "0") == "1"
+LLM_DETERMINISTIC_SEED = int(os.getenv("NEWSLETTER_LLM_SEED", "42"))
+
+
+class CompletionCache:
+    """Size-bounded on-disk store of LLM completions keyed by prompt hash."""
+    
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        """
+        Initialize completion cache.
+        
+        Args:
+            cache_dir: Directory for cached completions
+            max_bytes: Total size above which the oldest entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._total_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        
+        logger.info(f"LLM completion cache initialized with directory: {self.cache_dir}")
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: Optional[float],
+        messages: list[dict[str, Any]],
+        **extra: Any,
+    ) -> str:
+        """
+        Build the content address of a completion request.
+        
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            messages: Full chat message list
+            **extra: Other settings that change the completion (stop words, seed, tools)
+        
+        Returns:
+            Hex SHA-256 digest of the request
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "messages": messages,
+                **extra,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        """Return the on-disk location of a cache entry."""
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached completion for a key.
+        
+        Args:
+            key: Content address from make_key
+        
+        Returns:
+            Completion text, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            # Refresh mtime so eviction treats the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        
+        with self._lock:
+            self._stats["hits"] += 1
+        return entry["completion"]
+    
+    def set(self, key: str, completion: str, model: str) -> None:
+        """
+        Store a completion and evict old entries if over the size bound.
+        
+        Args:
+            key: Content address from make_key
+            completion: Completion text
+            model: Model that produced the completion
+        """
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        entry = {"model": model, "created_at": time.time(), "completion": completion}
+        
+        try:
+            previous_size = path.stat().st_size if path.exists() else 0
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist LLM completion {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        
+        with self._lock:
+            self._total_bytes += size - previous_size
+            over_limit = self._total_bytes > self.max_bytes
+        
+        if over_limit:
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until the store fits its bound."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        
+        with self._lock:
+            self._total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                self._total_bytes -= size
+                self._stats["evictions"] += 1
+        
+        logger.info(f"LLM completion cache evicted down to {self._total_bytes} bytes")
+    
+    def stats(self) -> dict[str, int]:
+        """
+        Return cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, evictions and current size in bytes
+        """
+        with self._lock:
+            return {**self._stats, "bytes": self._total_bytes}
+
+
+def _agent_role(from_task: Any | None, from_agent: Any | None) -> str:
+    """Return the role of the agent making an LLM call, for metrics labels."""
+    agent = from_agent or getattr(from_task, "agent", None)
+    return getattr(agent, "role", None) or "unknown"
+
+
+class _UsageRecorder:
+    """LiteLLM-style callback adding the reported token usage to a span."""
+    
+    def __init__(self, span: Span):
+        self.span = span
+    
+    def log_success_event(self, kwargs: Any, response_obj: Any, start_time: Any, end_time: Any) -> None:
+        """Add the usage of a completed request to the span."""
+        usage = response_obj.get("usage") if isinstance(response_obj, dict) else None
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(usage, "completion_tokens", 0),
+            }
+        self.span.add_tokens(usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0)
+
+
+class InstrumentedLLM(LLM):
+    """CrewAI LLM recording every call as a metrics span."""
+    
+    def __init__(
+        self,
+        *args: Any,
+        stage: Optional[str] = None,
+        fallback: Optional[LLM] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize instrumented LLM.
+        
+        Args:
+            *args: Positional arguments forwarded to crewai.LLM
+            stage: Pipeline stage whose model route the LLM serves (None if
+                its latency is not watched)
+            fallback: LLM that calls are delegated to while the stage is
+                over its latency budget
+            **kwargs: Keyword arguments forwarded to crewai.LLM
+        """
+        super().__init__(*args, **kwargs)
+        self.stage = stage
+        self.fallback = fallback
+    
+    def _fallback_llm(self) -> Optional[LLM]:
+        """
+        Return the LLM a call is delegated to while the stage is over budget.
+        
+        Returns:
+            Private copy of the fallback LLM, or None when the call stays on
+            this LLM's model
+        """
+        if self.fallback is None or not model_router.use_fallback(self.stage):
+            return None
+        # Private copy, as concurrent calls must not share per-call state
+        return copy.copy(self.fallback)
+    
+    def _instrumented_call(
+        self,
+        messages: str | list[dict[str, str]],
+        tools: list[dict] | None,
+        callbacks: list[Any] | None,
+        available_functions: dict[str, Any] | None,
+        from_task: Any | None,
+        from_agent: Any | None,
+        cache: str,
+    ) -> str | Any:
+        """
+        Call the model inside an "llm" span labelled with agent, model and cache state.
+        
+        The request is admitted by the shared OpenAI quota with its estimated
+        prompt tokens; the completion tokens are charged once known. Routing
+        to the fallback LLM is decided by the caller (see _fallback_llm).
+        
+        Args:
+            messages: Prompt string or chat message list
+            tools: Optional tool schemas for function calling
+            callbacks: Optional callbacks forwarded to crewai.LLM
+            available_functions: Optional callables the model may invoke
+            from_task: Task that invoked the LLM
+            from_agent: Agent that invoked the LLM
+            cache: Completion cache state ("off" or "miss")
+        
+        Returns:
+            Completion text, or the result of a tool call
+        """
+        agent = _agent_role(from_task, from_agent)
+        parent_call = super().call
+        if isinstance(messages, str):
+            prompt_tokens = count_tokens(messages)
+        else:
+            prompt_tokens = sum(count_tokens(str(message.get("content") or "")) for message in messages)
+        
+        with metrics.span("llm", agent=agent, model=self.model, cache=cache) as span:
+            start = time.perf_counter()
+            result = openai_service.call(
+                lambda: parent_call(
+                    messages,
+                    tools=tools,
+                    callbacks=[*(callbacks or []), _UsageRecorder(span)],
+                    available_functions=available_functions,
+                    from_task=from_task,
+                    from_agent=from_agent,
+                ),
+                tokens=prompt_tokens,
+                span=span,
+            )
+            openai_service.limiter.consume(span.completion_tokens)
+            # Waiting for the shared quota is not the model's latency
+            model_router.record(
+                self.stage, time.perf_counter() - start - span.attributes.get("rate_limit_wait_s", 0.0)
+            )
+            return result
+    
+    def call(
+        self,
+        messages: str | list[dict[str, str]],
+        tools: list[dict] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        from_task: Any | None = None,
+        from_agent: Any | None = None,
+    ) -> str | Any:
+        """
+        Call the model and record the call as a metrics span.
+        
+        While the LLM's stage is over its latency budget, the call is
+        delegated to the fallback LLM.
+        
+        Args:
+            messages: Prompt string or chat message list
+            tools: Optional tool schemas for function calling
+            callbacks: Optional callbacks forwarded to crewai.LLM
+            available_functions: Optional callables the model may invoke
+            from_task: Task that invoked the LLM
+            from_agent: Agent that invoked the LLM
+        
+        Returns:
+            Completion text, or the result of a tool call
+        """
+        fallback = self._fallback_llm()
+        if fallback is not None:
+            return fallback.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+        
+        return self._instrumented_call(
+            messages, tools, callbacks, available_functions, from_task, from_agent, cache="off"
+        )
+
+
+class CachedLLM(InstrumentedLLM):
+    """
+    CrewAI LLM that serves repeated prompts from a CompletionCache.
+    
+    Only plain-text completions are cached; tool-call results are always
+    computed fresh. In deterministic mode temperature is forced to 0 and a
+    fixed seed is sent so that cached and live completions agree.
+    """
+    
+    def __init__(
+        self,
+        *args: Any,
+        cache: Optional[CompletionCache] = None,
+        deterministic: bool = LLM_DETERMINISTIC,
+        **kwargs: Any,
+    ):
+        """
+        Initialize cached LLM.
+        
+        Args:
+            *args: Positional arguments forwarded to crewai.LLM
+            cache: Completion store (defaults to the global completion cache)
+            deterministic: Force temperature 0 and a fixed seed
+            **kwargs: Keyword arguments forwarded to crewai.LLM
+        """
+        if deterministic:
+            kwargs["temperature"] = 0.0
+            kwargs.setdefault("seed", LLM_DETERMINISTIC_SEED)
+        super().__init__(*args, **kwargs)
+        self.completion_cache = cache if cache is not None else completion_cache
+        self.deterministic = deterministic
+    
+    def _cache_key(self, messages: list[dict[str, Any]], tools: Optional[list[dict]]) -> str:
+        """Build the cache key for a call with the current LLM settings."""
+        return self.completion_cache.make_key(
+            self.model,
+            self.temperature,
+            messages,
+            stop=self.stop,
+            seed=self.seed,
+            tools=tools,
+        )
+    
+    def call(
+        self,
+        messages: str | list[dict[str, str]],
+        tools: list[dict] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        from_task: Any | None = None,
+        from_agent: Any | None = None,
+    ) -> str | Any:
+        """
+        Return a cached completion or call the model and cache the result.
+        
+        The route is chosen before the cache is consulted: while the stage is
+        over its latency budget the call is delegated to the fallback LLM,
+        which reads and writes its own model's entries, so fallback answers
+        are never stored under the primary model's key.
+        
+        Args:
+            messages: Prompt string or chat message list
+            tools: Optional tool schemas for function calling
+            callbacks: Optional callbacks forwarded to crewai.LLM
+            available_functions: Optional callables the model may invoke
+            from_task: Task that invoked the LLM
+            from_agent: Agent that invoked the LLM
+        
+        Returns:
+            Completion text, or the result of a tool call
+        """
+        fallback = self._fallback_llm()
+        if fallback is not None:
+            return fallback.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+        
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        
+        key = self._cache_key(messages, tools)
+        cached = self.completion_cache.get(key)
+        if cached is not None:
+            agent = _agent_role(from_task, from_agent)
+            with metrics.span("llm", agent=agent, model=self.model, cache="hit"):
+                logger.info(f"LLM cache hit ({self.model}, key {key[:12]})")
+            return cached
+        
+        result = self._instrumented_call(
+            messages, tools, callbacks, available_functions, from_task, from_agent, cache="miss"
+        )
+        
+        if isinstance(result, str) and result:
+            self.completion_cache.set(key, result, self.model)
+        return result
+
+
+def create_cached_llm(model: str, temperature: float, api_key: str, **kwargs: Any) -> LLM:
+    """
+    Create the LLM used by the crew, with completion caching when enabled.
+    
+    Args:
+        model: Model name
+        temperature: Sampling temperature (ignored in deterministic mode)
+        api_key: OpenAI API key
+        **kwargs: Extra keyword arguments forwarded to crewai.LLM
+    
+    Returns:
+        CachedLLM when NEWSLETTER_LLM_CACHE is enabled, InstrumentedLLM
+        otherwise; both honour NEWSLETTER_LLM_DETERMINISTIC
+    """
+    if not LLM_CACHE_ENABLED:
+        if LLM_DETERMINISTIC:
+            temperature = 0.0
+            kwargs.setdefault("seed", LLM_DETERMINISTIC_SEED)
+        return InstrumentedLLM(model=model, temperature=temperature, api_key=api_key, **kwargs)
+    
+    return CachedLLM(model=model, temperature=temperature, api_key=api_key, **kwargs)
+
+
+# Global completion cache instance
+completion_cache = CompletionCache()
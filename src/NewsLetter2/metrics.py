@@ -0,0 +1,465 @@
+# =============================================================================
+#  Filename: metrics.py
+#
+#  Short Description: Structured timing/token spans with JSONL and Prometheus export
+#
+#  Creation date: 2025-10-13
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Lightweight span instrumentation for newsletter generation.
+
+Every instrumented unit of work (generation run, pipeline stage, agent task,
+LLM call, search tool call, SerpAPI request) is recorded as a span with its
+latency, status, error, prompt/completion tokens and retries. Finished spans
+are appended to a JSON-lines file and aggregated in memory per span name and
+label set, which is exposed in the Prometheus text format:
+
+    newsletter_span_duration_seconds   histogram of span latency
+    newsletter_span_errors_total       spans that raised
+    newsletter_span_tokens_total       prompt/completion tokens (kind label)
+    newsletter_span_retries_total      retries performed inside spans
+
+Labels are low-cardinality (stage, agent, model, ...); free-form details such
+as search queries go into span attributes, which only appear in the JSONL.
+
+The JSONL file is rotated once it reaches METRICS_MAX_BYTES: the current file
+becomes <file>.1 (replacing the previous one) and a new file is started, so
+at most two files are kept.
+
+Usage (serve metrics aggregated from the JSONL file of other processes):
+    uv run python -m NewsLetter2.metrics [--port 9108] [--host 127.0.0.1] [--file cache/metrics.jsonl]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from loguru import logger
+
+
+# JSON-lines file every finished span is appended to ("" disables the file)
+METRICS_FILE = os.getenv("NEWSLETTER_METRICS_FILE", "cache/metrics.jsonl")
+
+# Size at which the JSONL file is rotated to <file>.1 (0 never rotates)
+METRICS_MAX_BYTES = int(os.getenv("NEWSLETTER_METRICS_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Port of the Prometheus endpoint started by the app (0 disables it)
+METRICS_PORT = int(os.getenv("NEWSLETTER_METRICS_PORT", "0"))
+
+# Address the Prometheus endpoint binds to (0.0.0.0 exposes it on all interfaces)
+METRICS_HOST = os.getenv("NEWSLETTER_METRICS_HOST", "127.0.0.1")
+
+# Upper bounds (seconds) of the latency histogram buckets
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """One timed unit of work."""
+    
+    name: str
+    labels: dict[str, str] = field(default_factory=dict)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: int = field(default_factory=lambda: next(_span_ids))
+    parent_id: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    
+    def add_tokens(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """
+        Add token usage reported for work done inside the span.
+        
+        Args:
+            prompt_tokens: Prompt tokens consumed
+            completion_tokens: Completion tokens generated
+        """
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+    
+    def retry(self) -> None:
+        """Count one retry of the work inside the span."""
+        self.retries += 1
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Return the span as a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "duration_s": round(self.duration, 4),
+            "status": self.status,
+            "error": self.error,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "retries": self.retries,
+            "labels": self.labels,
+            "attributes": self.attributes,
+        }
+
+
+@dataclass
+class _Series:
+    """Aggregated spans of one name and label set."""
+    
+    buckets: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Render a Prometheus label set."""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Records spans, appends them to a JSONL file and aggregates them."""
+    
+    def __init__(self, path: Optional[str] = METRICS_FILE, max_bytes: int = METRICS_MAX_BYTES):
+        """
+        Initialize metrics registry.
+        
+        Args:
+            path: JSON-lines file finished spans are appended to (None or ""
+                keeps spans in memory only)
+            max_bytes: Size at which the file is rotated (0 never rotates)
+        """
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, tuple[tuple[str, str], ...]], _Series] = {}
+        self._local = threading.local()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._replay_offset = 0
+        self._replay_inode: Optional[int] = None
+    
+    @property
+    def rotated_path(self) -> Optional[Path]:
+        """Return the path the JSONL file is rotated to."""
+        return self.path.with_name(f"{self.path.name}.1") if self.path else None
+    
+    def _stack(self) -> list[Span]:
+        """Return the stack of open spans of the calling thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+    
+    def current(self) -> Optional[Span]:
+        """Return the innermost open span of the calling thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+    
+    @contextmanager
+    def span(self, name: str, attributes: Optional[dict[str, Any]] = None, **labels: Any) -> Iterator[Span]:
+        """
+        Time a block of work as a span.
+        
+        An exception raised by the block marks the span as failed and is
+        re-raised.
+        
+        Args:
+            name: Span name (e.g. "stage", "llm", "tool")
+            attributes: Free-form details written to the JSONL only
+            **labels: Low-cardinality labels of the aggregated series
+        
+        Yields:
+            The open span, for adding tokens and retries
+        """
+        stack = self._stack()
+        current = Span(
+            name=name,
+            labels={key: str(value) for key, value in labels.items()},
+            attributes=dict(attributes or {}),
+            parent_id=stack[-1].span_id if stack else None,
+        )
+        stack.append(current)
+        start = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.status = "error"
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.duration = time.perf_counter() - start
+            stack.pop()
+            self.record(current)
+    
+    def record(self, span: Span) -> None:
+        """
+        Record a finished span (also used for spans timed elsewhere).
+        
+        Args:
+            span: Finished span with its duration set
+        """
+        self._aggregate(span.to_dict())
+        if self.path is None:
+            return
+        
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        try:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    size = f.tell()
+                if self.max_bytes and size >= self.max_bytes:
+                    os.replace(self.path, self.rotated_path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics span to {self.path}: {e}")
+    
+    def _aggregate(self, span: dict[str, Any]) -> None:
+        """Add a span dictionary to its aggregated series."""
+        key = (span["name"], tuple(sorted(span["labels"].items())))
+        duration = span["duration_s"]
+        with self._lock:
+            series = self._series.setdefault(key, _Series())
+            series.count += 1
+            series.total += duration
+            for idx, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    series.buckets[idx] += 1
+            series.errors += span["status"] == "error"
+            series.prompt_tokens += span["prompt_tokens"]
+            series.completion_tokens += span["completion_tokens"]
+            series.retries += span["retries"]
+    
+    def replay(self) -> int:
+        """
+        Aggregate spans appended to the JSONL file since the last replay.
+        
+        Used by the standalone exporter to expose spans recorded by other
+        processes (e.g. scheduled CLI runs). When the file was rotated since
+        the last replay, the unread rest of the rotated file is read first.
+        
+        Returns:
+            Number of spans read
+        """
+        if self.path is None:
+            return 0
+        try:
+            inode = self.path.stat().st_ino
+        except OSError:
+            return 0
+        
+        read = 0
+        if self._replay_inode is not None and inode != self._replay_inode:
+            try:
+                if self.rotated_path.stat().st_ino == self._replay_inode:
+                    read += self._replay_file(self.rotated_path)
+            except OSError:
+                pass
+            self._replay_offset = 0
+        self._replay_inode = inode
+        
+        return read + self._replay_file(self.path)
+    
+    def _replay_file(self, path: Path) -> int:
+        """Aggregate the complete lines of a file after the replay offset."""
+        read = 0
+        with open(path, "r", encoding="utf-8") as f:
+            f.seek(self._replay_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                self._replay_offset += len(line.encode("utf-8"))
+                try:
+                    self._aggregate(json.loads(line))
+                    read += 1
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Skipping malformed metrics line: {e}")
+        return read
+    
+    def render_prometheus(self) -> str:
+        """
+        Render all aggregated series in the Prometheus text format.
+        
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            series = sorted(self._series.items())
+        
+        duration = [
+            "# HELP newsletter_span_duration_seconds Latency of instrumented spans",
+            "# TYPE newsletter_span_duration_seconds histogram",
+        ]
+        errors = [
+            "# HELP newsletter_span_errors_total Spans that ended with an error",
+            "# TYPE newsletter_span_errors_total counter",
+        ]
+        tokens = [
+            "# HELP newsletter_span_tokens_total LLM tokens consumed inside spans",
+            "# TYPE newsletter_span_tokens_total counter",
+        ]
+        retries = [
+            "# HELP newsletter_span_retries_total Retries performed inside spans",
+            "# TYPE newsletter_span_retries_total counter",
+        ]
+        
+        for (name, label_items), data in series:
+            labels = {"span": name, **dict(label_items)}
+            for bound, count in zip(DURATION_BUCKETS, data.buckets):
+                duration.append(
+                    f"newsletter_span_duration_seconds_bucket"
+                    f"{_format_labels({**labels, 'le': str(bound)})} {count}"
+                )
+            duration.append(
+                f"newsletter_span_duration_seconds_bucket"
+                f"{_format_labels({**labels, 'le': '+Inf'})} {data.count}"
+            )
+            duration.append(f"newsletter_span_duration_seconds_sum{_format_labels(labels)} {data.total:.6f}")
+            duration.append(f"newsletter_span_duration_seconds_count{_format_labels(labels)} {data.count}")
+            errors.append(f"newsletter_span_errors_total{_format_labels(labels)} {data.errors}")
+            if data.prompt_tokens or data.completion_tokens:
+                tokens.append(
+                    f"newsletter_span_tokens_total{_format_labels({**labels, 'kind': 'prompt'})} "
+                    f"{data.prompt_tokens}"
+                )
+                tokens.append(
+                    f"newsletter_span_tokens_total{_format_labels({**labels, 'kind': 'completion'})} "
+                    f"{data.completion_tokens}"
+                )
+            retries.append(f"newsletter_span_retries_total{_format_labels(labels)} {data.retries}")
+        
+        return "\n".join(duration + errors + tokens + retries) + "\n"
+    
+    def start_http_server(
+        self,
+        port: int = METRICS_PORT,
+        host: str = METRICS_HOST,
+        replay: bool = False,
+    ) -> bool:
+        """
+        Serve /metrics on a daemon thread (idempotent).
+        
+        Args:
+            port: Port to listen on
+            host: Address to bind (loopback only by default)
+            replay: Re-read the JSONL file on every scrape
+        
+        Returns:
+            True if the endpoint is running
+        """
+        if self._server is not None:
+            return True
+        if not port:
+            return False
+        
+        registry = self
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+            
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                if replay:
+                    registry.replay()
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        try:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            logger.warning(f"Could not start metrics endpoint on {host}:{port}: {e}")
+            return False
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Prometheus metrics served on {host}:{port}/metrics")
+        return True
+
+
+class TaskTimer:
+    """
+    Crew task_callback recording one span per finished task.
+    
+    Tasks of a sequential crew run back to back, so each task's span covers
+    the time since the previous task (or the kickoff) finished.
+    """
+    
+    def __init__(self, registry: MetricsRegistry, name: str = "task"):
+        """
+        Initialize task timer; call right before kickoff.
+        
+        Args:
+            registry: Registry the spans are recorded in
+            name: Span name
+        """
+        self.registry = registry
+        self.name = name
+        self._mark = time.perf_counter()
+        self._started_at = time.time()
+    
+    def __call__(self, output: Any) -> None:
+        """Record the span of the task that produced output."""
+        now = time.perf_counter()
+        current = self.registry.current()
+        span = Span(
+            name=self.name,
+            labels={"agent": str(getattr(output, "agent", "unknown"))},
+            parent_id=current.span_id if current else None,
+            started_at=self._started_at,
+            duration=now - self._mark,
+        )
+        self.registry.record(span)
+        self._mark = now
+        self._started_at = time.time()
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+
+def main() -> None:
+    """Serve Prometheus metrics aggregated from a JSONL span file."""
+    parser = argparse.ArgumentParser(description="Prometheus endpoint for newsletter spans")
+    parser.add_argument("--port", type=int, default=METRICS_PORT or 9108)
+    parser.add_argument("--host", default=METRICS_HOST, help="Address to bind")
+    parser.add_argument("--file", default=METRICS_FILE, help="JSON-lines span file")
+    args = parser.parse_args()
+    
+    registry = MetricsRegistry(args.file)
+    registry.replay()
+    registry.start_http_server(args.port, host=args.host, replay=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# =============================================================================
+#  Filename: model_routing.py
+#
+#  Short Description: Per-stage model routing with latency-budget fallback
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Model routing for the pipeline stages.
+
+Each stage (Reporter, Editor, Senior Editor) runs its agent on the model of
+its ModelRoute. All stages default to NEWSLETTER_MODEL; a JSON file maps
+stage names to overrides, so quality is traded for latency per stage in
+one place, e.g. a small model for the per-article summaries and a larger
+one for the editorial:
+
+    {"editor": {"model": "gpt-4o-mini", "temperature": 0.3},
+     "senior_editor": {"model": "gpt-4o", "fallback_model": "gpt-4o-mini",
+                       "latency_budget_s": 45}}
+
+A route with a fallback model and a latency budget is watched. When a call
+on the primary model takes longer than the budget, the stage is routed to
+the fallback for a cool-down period, after which the primary is tried
+again. The remaining calls of the stage (the rest of the Editor fan-out,
+the next topic or backfilled date) then keep to the deadline instead of
+queuing behind a slow model.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+from NewsLetter2.models import ModelRoute
+
+
+# JSON file mapping stage names to ModelRoute overrides
+MODELS_FILE = os.getenv("NEWSLETTER_MODELS_FILE", "models.json")
+
+# Model of every stage without an override
+DEFAULT_MODEL = os.getenv("NEWSLETTER_MODEL", "gpt-4o-mini")
+
+# Seconds a stage stays on its fallback model after a budget overrun
+ROUTE_COOLDOWN_SECONDS = float(os.getenv("NEWSLETTER_ROUTE_COOLDOWN", "300"))
+
+# Pipeline stages that have a route
+STAGES = ("reporter", "editor", "senior_editor")
+
+DEFAULT_ROUTE = ModelRoute(model=DEFAULT_MODEL)
+
+
+def load_routes(path: str = MODELS_FILE) -> dict[str, ModelRoute]:
+    """
+    Load the route of every stage, applying the overrides of a models file.
+    
+    Args:
+        path: JSON file mapping stage names to ModelRoute fields (optional)
+    
+    Returns:
+        Routes by stage name
+    """
+    routes = {stage: DEFAULT_ROUTE for stage in STAGES}
+    
+    models_file = Path(path)
+    if models_file.exists():
+        try:
+            for stage, overrides in json.loads(models_file.read_text()).items():
+                if stage not in routes:
+                    logger.warning(f"Ignoring model route of unknown stage '{stage}'")
+                    continue
+                routes[stage] = ModelRoute.model_validate({**DEFAULT_ROUTE.model_dump(), **overrides})
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.error(f"Ignoring invalid models file {models_file}: {e}")
+    
+    return routes
+
+
+class ModelRouter:
+    """Routes of all stages and their latency-budget fallback state."""
+    
+    def __init__(self, routes: dict[str, ModelRoute], cooldown: float = ROUTE_COOLDOWN_SECONDS):
+        """
+        Initialize model router.
+        
+        Args:
+            routes: Route of each stage
+            cooldown: Seconds a stage stays on its fallback after an overrun
+        """
+        self.routes = routes
+        self.cooldown = cooldown
+        self._fallback_until: dict[str, float] = {}
+        self._fallback_calls: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def route(self, stage: Optional[str] = None) -> ModelRoute:
+        """
+        Return the route of a stage.
+        
+        Args:
+            stage: Stage name (None for the default route)
+        
+        Returns:
+            The stage's ModelRoute
+        
+        Raises:
+            ValueError: If the stage is unknown
+        """
+        if stage is None:
+            return DEFAULT_ROUTE
+        try:
+            return self.routes[stage]
+        except KeyError:
+            raise ValueError(f"Unknown stage '{stage}' (known: {', '.join(self.routes)})") from None
+    
+    def use_fallback(self, stage: Optional[str]) -> bool:
+        """
+        Decide whether the next call of a stage goes to its fallback model.
+        
+        Args:
+            stage: Stage name
+        
+        Returns:
+            True while the stage is within the cool-down of a budget overrun
+        """
+        with self._lock:
+            until = self._fallback_until.get(stage or "")
+            if until is None:
+                return False
+            if time.monotonic() >= until:
+                del self._fallback_until[stage]
+                logger.info(f"Routing the {stage} stage back to {self.routes[stage].model}")
+                return False
+            self._fallback_calls[stage] += 1
+            return True
+    
+    def record(self, stage: Optional[str], seconds: float) -> None:
+        """
+        Record the latency of a call on a stage's primary model.
+        
+        A call slower than the route's latency budget switches the stage to
+        its fallback model for the cool-down period.
+        
+        Args:
+            stage: Stage name (None or routes without fallback are ignored)
+            seconds: Latency of the call
+        """
+        route = self.routes.get(stage or "")
+        if route is None or not route.fallback_model or not route.latency_budget_s:
+            return
+        if seconds <= route.latency_budget_s:
+            return
+        
+        with self._lock:
+            switched = stage not in self._fallback_until
+            self._fallback_until[stage] = time.monotonic() + self.cooldown
+        if switched:
+            logger.warning(
+                f"{stage} call on {route.model} took {seconds:.1f}s (budget "
+                f"{route.latency_budget_s:g}s), routing the stage to {route.fallback_model} "
+                f"for {self.cooldown:g}s"
+            )
+    
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the routing state of every stage.
+        
+        Returns:
+            Per stage: primary and fallback model, whether the fallback is
+            active and how many calls it has served
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                stage: {
+                    "model": route.model,
+                    "fallback_model": route.fallback_model,
+                    "on_fallback": self._fallback_until.get(stage, 0.0) > now,
+                    "fallback_calls": self._fallback_calls[stage],
+                }
+                for stage, route in self.routes.items()
+            }
+
+
+# Global model router instance
+model_router = ModelRouter(load_routes())
@@ -8,9 +8,25 @@
 # =============================================================================
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, PlainSerializer
+
+
+# URL that dumps as a plain string in every serialization mode, so models
+# stay serializable by json.dumps-based encoders (e.g. CrewAI's task log)
+Url = Annotated[HttpUrl, PlainSerializer(str, return_type=str)]
+
+
+class ArticleSource(BaseModel):
+    """
+    Additional outlet that published the same story.
+    
+    Recorded when near-duplicate copies of a story are collapsed into one article.
+    """
+    
+    source: str = Field(..., description="Publication or website name")
+    url: Url = Field(..., description="Link to this outlet's copy of the story")
 
 
 class RawNewsArticle(BaseModel):
@@ -22,10 +38,50 @@ class RawNewsArticle(BaseModel):
     
     title: str = Field(..., description="Article headline")
     source: str = Field(..., description="Publication or website name")
-    url: HttpUrl = Field(..., description="Link to the original article")
+    url: Url = Field(..., description="Link to the original article")
     snippet: str = Field(..., description="Brief excerpt from the article")
-    thumbnail: Optional[HttpUrl] = Field(None, description="Image URL if available")
+    thumbnail: Optional[Url] = Field(None, description="Image URL if available")
     published_date: Optional[str] = Field(None, description="Publication date")
+    alternate_sources: list[ArticleSource] = Field(
+        default_factory=list,
+        description="Other outlets carrying the same story"
+    )
+
+
+class ArticleSummary(BaseModel):
+    """
+    Editor output for a single article in the parallel Editor pipeline.
+    
+    Only the generated text is requested from the model; title, source, URL
+    and thumbnail are copied from the corresponding RawNewsArticle.
+    """
+    
+    short_summary: str = Field(
+        ...,
+        description="2-3 sentence engaging summary for landing page"
+    )
+    detailed_article: str = Field(
+        ...,
+        description="20-30 sentence in-depth analysis with business implications"
+    )
+
+
+class ShortSummary(BaseModel):
+    """Editor output of the first, short pass over an article (pipelined mode)."""
+    
+    short_summary: str = Field(
+        ...,
+        description="2-3 sentence engaging summary for landing page"
+    )
+
+
+class DetailedArticle(BaseModel):
+    """Editor output of the second, detailed pass over an article (pipelined mode)."""
+    
+    detailed_article: str = Field(
+        ...,
+        description="20-30 sentence in-depth analysis with business implications"
+    )
 
 
 class ProcessedNewsArticle(BaseModel):
@@ -38,8 +94,8 @@ class ProcessedNewsArticle(BaseModel):
     
     title: str = Field(..., description="Article headline")
     source: str = Field(..., description="Publication or website name")
-    url: HttpUrl = Field(..., description="Link to the original article")
-    thumbnail: Optional[HttpUrl] = Field(None, description="Featured image URL")
+    url: Url = Field(..., description="Link to the original article")
+    thumbnail: Optional[Url] = Field(None, description="Featured image URL")
     short_summary: str = Field(
         ...,
         description="2-3 sentence engaging summary for landing page"
@@ -49,6 +105,33 @@ class ProcessedNewsArticle(BaseModel):
         description="20-30 sentence in-depth analysis with business implications"
     )
     published_date: Optional[str] = Field(None, description="Publication date")
+    alternate_sources: list[ArticleSource] = Field(
+        default_factory=list,
+        description="Other outlets carrying the same story"
+    )
+    
+    @classmethod
+    def from_raw(cls, raw: RawNewsArticle, summary: ArticleSummary) -> "ProcessedNewsArticle":
+        """
+        Combine a raw article with its Editor summary.
+        
+        Args:
+            raw: Article as collected by the Reporter
+            summary: Editor-written summary texts
+            
+        Returns:
+            Processed article carrying the Reporter's metadata verbatim
+        """
+        return cls(
+            title=raw.title,
+            source=raw.source,
+            url=raw.url,
+            thumbnail=raw.thumbnail,
+            short_summary=summary.short_summary,
+            detailed_article=summary.detailed_article,
+            published_date=raw.published_date,
+            alternate_sources=raw.alternate_sources,
+        )
 
 
 class Editorial(BaseModel):
@@ -76,7 +159,7 @@ class Editorial(BaseModel):
         ...,
         description="NVIDIA vs AMD, Intel, and hyperscalers comparison"
     )
-    image_url: Optional[HttpUrl] = Field(None, description="Featured image for editorial")
+    image_url: Optional[Url] = Field(None, description="Featured image for editorial")
     created_at: datetime = Field(default_factory=datetime.now)
 
 
@@ -97,3 +180,216 @@ class Newsletter(BaseModel):
     )
     generated_at: datetime = Field(default_factory=datetime.now)
     edition_number: Optional[int] = Field(None, description="Newsletter edition number")
+
+
+class DraftArticle(BaseModel):
+    """
+    Processed article as written by the Editor in the sequential crew.
+    
+    The article refers to the Reporter's candidate by its id; source, URL,
+    thumbnail and publication date are rejoined from the candidate record
+    instead of being copied through every prompt.
+    """
+    
+    id: str = Field(..., description="Candidate id from the search tool")
+    title: str = Field(..., description="Article headline")
+    short_summary: str = Field(
+        ...,
+        description="2-3 sentence engaging summary for landing page"
+    )
+    detailed_article: str = Field(
+        ...,
+        description="20-30 sentence in-depth analysis with business implications"
+    )
+
+
+class NewsletterDraft(BaseModel):
+    """
+    Senior Editor output of the sequential crew.
+    
+    The Senior Editor picks the published articles by id instead of copying
+    them; their texts are taken from the Editor task's output.
+    """
+    
+    editorial: Editorial = Field(..., description="Front-page editorial content")
+    article_ids: list[str] = Field(
+        ...,
+        description="Ids of the 10 articles to publish, in reading order"
+    )
+
+
+class ArticlePreview(BaseModel):
+    """
+    Landing-page view of a processed article.
+    
+    Carries everything the landing page renders, without the detailed
+    article text that is only needed on the article page.
+    """
+    
+    model_config = ConfigDict(frozen=True)
+    
+    title: str = Field(..., description="Article headline")
+    source: str = Field(..., description="Publication or website name")
+    url: Url = Field(..., description="Link to the original article")
+    thumbnail: Optional[Url] = Field(None, description="Featured image URL")
+    short_summary: str = Field(..., description="2-3 sentence summary for landing page")
+    published_date: Optional[str] = Field(None, description="Publication date")
+    alternate_sources: list[ArticleSource] = Field(
+        default_factory=list,
+        description="Other outlets carrying the same story"
+    )
+
+
+class NewsletterPreview(BaseModel):
+    """
+    Newsletter as needed by the landing page (articles without detail text).
+    
+    Detailed articles are loaded one at a time with
+    CacheManager.load_article when a reader opens them. Previews are frozen
+    because one instance is shared by every session reading the edition.
+    """
+    
+    model_config = ConfigDict(frozen=True)
+    
+    editorial: Editorial = Field(..., description="Front-page editorial content")
+    articles: tuple[ArticlePreview, ...] = Field(..., description="Article previews")
+    generated_at: datetime = Field(default_factory=datetime.now)
+    edition_number: Optional[int] = Field(None, description="Newsletter edition number")
+    
+    @classmethod
+    def from_newsletter(cls, newsletter: Newsletter) -> "NewsletterPreview":
+        """
+        Build the preview of a fully loaded newsletter.
+        
+        Args:
+            newsletter: Complete newsletter
+            
+        Returns:
+            Preview without the detailed article texts
+        """
+        return cls(
+            editorial=newsletter.editorial.model_copy(),
+            articles=[
+                ArticlePreview(**article.model_dump(exclude={"detailed_article"}))
+                for article in newsletter.articles
+            ],
+            generated_at=newsletter.generated_at,
+            edition_number=newsletter.edition_number,
+        )
+
+
+class PartialNewsletter(BaseModel):
+    """
+    Snapshot of a newsletter that is still being generated.
+    
+    Filled in stage by stage (raw articles, then processed articles as each
+    one completes, then the editorial) so the UI can render progressively.
+    """
+    
+    stage: str = Field("reporter", description="Pipeline stage currently running")
+    raw_articles: list[RawNewsArticle] = Field(
+        default_factory=list,
+        description="Articles collected by the Reporter"
+    )
+    articles: list[Optional[ProcessedNewsArticle]] = Field(
+        default_factory=list,
+        description="Processed articles aligned with raw_articles (None until done)"
+    )
+    editorial: Optional[Editorial] = Field(None, description="Editorial once written")
+    error: Optional[str] = Field(None, description="Error message if generation failed")
+    generated_at: datetime = Field(default_factory=datetime.now)
+
+
+class Topic(BaseModel):
+    """
+    Configuration of one newsletter: the company or theme it covers.
+    
+    Agent prompts and search queries are derived from the topic, so several
+    newsletters run on the same engine in one process.
+    """
+    
+    model_config = ConfigDict(frozen=True)
+    
+    key: str = Field(..., pattern=r"^[a-z0-9][a-z0-9_-]*$", description="Identifier and cache namespace")
+    name: str = Field(..., description="Company or theme as written in prompts and headers")
+    queries: tuple[str, ...] = Field(..., min_length=1, description="Queries searched concurrently per run")
+    focus: str = Field(..., description="Kinds of news the Reporter prioritizes")
+    competitors: str = Field(..., description="Players the editorial compares against")
+
+
+class ModelRoute(BaseModel):
+    """
+    Model settings of one pipeline stage, with an optional faster fallback.
+    
+    When a call on the primary model takes longer than the latency budget,
+    the stage switches to the fallback model for a cool-down period.
+    """
+    
+    model_config = ConfigDict(frozen=True)
+    
+    model: str = Field(..., description="Primary model of the stage")
+    temperature: float = Field(0.7, ge=0.0, le=2.0, description="Sampling temperature")
+    max_tokens: Optional[int] = Field(None, gt=0, description="Completion token limit (None for the model's)")
+    fallback_model: Optional[str] = Field(None, description="Faster model used while the stage is over budget")
+    latency_budget_s: float = Field(0.0, ge=0.0, description="Seconds a primary call may take (0 disables fallback)")
+
+
+class GenerationJob(BaseModel):
+    """
+    Status of a background newsletter generation job.
+    
+    Persisted as JSON so the status survives page reloads and app restarts.
+    """
+    
+    job_id: str = Field(..., description="Unique job identifier")
+    topic: str = Field("nvidia", description="Key of the newsletter topic being generated")
+    refresh: bool = Field(False, description="Background refresh of a stale edition being served")
+    status: str = Field("queued", description="queued, running, succeeded or failed")
+    stage: Optional[str] = Field(None, description="Pipeline stage currently running")
+    articles_completed: int = Field(0, description="Articles processed so far")
+    articles_total: int = Field(0, description="Articles collected by the Reporter")
+    edition_date: Optional[str] = Field(None, description="Cached edition date (YYYY-MM-DD) on success")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = Field(None)
+    finished_at: Optional[datetime] = Field(None)
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job has finished (successfully or not)."""
+        return self.status in ("succeeded", "failed")
+
+
+class BackfillResult(BaseModel):
+    """Outcome of one edition of a batch backfill."""
+    
+    date: datetime = Field(..., description="Edition date")
+    topic: str = Field("nvidia", description="Key of the newsletter topic")
+    status: str = Field(..., description="generated, skipped or failed")
+    seconds: float = Field(0.0, description="Wall time spent on the edition")
+    articles: int = Field(0, description="Articles in the generated edition")
+    error: Optional[str] = Field(None, description="Error message if generation failed")
+
+
+class EditionRecord(BaseModel):
+    """Index entry describing one cached newsletter edition."""
+    
+    date: datetime = Field(..., description="Edition date")
+    path: str = Field(..., description="Path of the cached edition file")
+    size: int = Field(..., description="File size in bytes")
+    checksum: str = Field(..., description="SHA-256 of the file contents")
+    article_count: int = Field(..., description="Number of articles in the edition")
+    headline: Optional[str] = Field(None, description="Editorial headline")
+    generated_at: Optional[datetime] = Field(None, description="Generation timestamp")
+
+
+class SearchHit(BaseModel):
+    """One ranked result of a full-text search over the edition archive."""
+    
+    date: datetime = Field(..., description="Edition date")
+    article_index: Optional[int] = Field(
+        None, description="Position of the article in the edition (None for the editorial)"
+    )
+    title: str = Field(..., description="Article title or editorial headline")
+    snippet: str = Field(..., description="Matching excerpt with hits marked in bold")
+    score: float = Field(..., description="BM25 relevance (lower is better)")
@@ -0,0 +1,719 @@
+# =============================================================================
+#  Filename: pipeline.py
+#
+#  Short Description: Staged newsletter pipeline with parallel Editor fan-out
+#
+#  Creation date: 2025-10-07
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Staged newsletter generation with a concurrent Editor stage.
+
+Instead of one Editor call writing all ten detailed articles sequentially,
+every RawNewsArticle is summarized by its own single-task crew. The
+summaries run on a thread pool and are re-assembled in Reporter order, so
+the Editor stage takes roughly as long as the slowest single article.
+
+Stage outputs can be published to an EditionStream as they complete, so a
+reader can render the edition progressively.
+
+Pipelines of several topics may run at the same time. Article summaries are
+topic-neutral and shared by URL: an article that is already being summarized
+for another edition is awaited instead of being summarized twice. In the
+pipelined mode an owner publishes each short summary as soon as it is
+written, before awaiting anything itself, so two editions sharing articles
+never wait on each other.
+"""
+
+import copy
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from crewai import Crew, Process
+from loguru import logger
+
+from NewsLetter2 import tools
+from NewsLetter2.agents import (
+    create_article_editor_agent,
+    create_reporter_agent,
+    create_senior_editor_agent,
+)
+from NewsLetter2.article_store import article_store
+from NewsLetter2.dedup import collapse_near_duplicates
+from NewsLetter2.json_utils import extract_json, parse_model_output
+from NewsLetter2.metrics import metrics
+from NewsLetter2.models import (
+    ArticleSummary,
+    DetailedArticle,
+    Editorial,
+    Newsletter,
+    ProcessedNewsArticle,
+    RawNewsArticle,
+    ShortSummary,
+    Topic,
+)
+from NewsLetter2.streaming import EditionStream
+from NewsLetter2.thumbnails import thumbnail_cache
+from NewsLetter2.tasks import (
+    create_article_editor_task,
+    create_detailed_article_task,
+    create_editorial_task,
+    create_reporter_task,
+    create_short_summary_task,
+    create_summary_editorial_task,
+)
+from NewsLetter2.token_budget import count_tokens
+from NewsLetter2.topics import DEFAULT_TOPIC
+from NewsLetter2.url_utils import canonicalize_url
+
+
+# Maximum number of articles summarized concurrently
+EDITOR_CONCURRENCY = int(os.getenv("NEWSLETTER_EDITOR_CONCURRENCY", "5"))
+
+# Callback receiving (index, article) as soon as an article is processed
+ArticleCallback = Callable[[int, ProcessedNewsArticle], None]
+
+# Reuse summaries of articles already processed in a recent edition
+INCREMENTAL = os.getenv("NEWSLETTER_INCREMENTAL", "1") == "1"
+
+# Write the editorial from the short summaries while the detailed articles
+# are still being written
+PIPELINED_EDITORIAL = os.getenv("NEWSLETTER_PIPELINED_EDITORIAL", "0") == "1"
+
+# Number of articles in an edition
+ARTICLES_PER_EDITION = 10
+
+# Extra ranked articles requested from the Reporter as backfill for
+# stories collapsed by near-duplicate detection
+REPORTER_SPARE_ARTICLES = 4
+
+
+@dataclass
+class _Claim:
+    """Results of an article claimed by a running pipeline."""
+    
+    # Short summary, set as soon as the owner has written it
+    summary: Future = field(default_factory=Future)
+    # Finished article, set once the owner has written it completely
+    article: Future = field(default_factory=Future)
+
+
+# Articles being written by any running pipeline, by canonical URL
+_in_flight: dict[str, _Claim] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _run_single_task_crew(agent: Any, task: Any) -> Any:
+    """
+    Run one agent/task pair as its own crew.
+    
+    Args:
+        agent: Agent executing the task
+        task: Task to execute
+    
+    Returns:
+        CrewOutput of the single-task crew
+    """
+    crew = Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=False,
+    )
+    with metrics.span("task", {"input_tokens": count_tokens(task.description)}, agent=agent.role):
+        return crew.kickoff()
+
+
+def select_articles(items: list[Any], count: int = ARTICLES_PER_EDITION) -> list[RawNewsArticle]:
+    """
+    Rejoin the Reporter's selection with the candidate records.
+    
+    Syndicated copies are collapsed so each story is summarized only once.
+    When fewer than count stories remain (the Reporter answered with too few,
+    unknown or duplicate ids), the selection is topped up with the next
+    candidates of the search pool, so no LLM stage runs on a short edition.
+    
+    Args:
+        items: Reporter output items (candidate ids or article dictionaries)
+        count: Number of articles an edition needs
+    
+    Returns:
+        count raw articles, the Reporter's selection first
+    
+    Raises:
+        ValueError: If the candidate pool cannot fill the edition either
+    """
+    articles: list[RawNewsArticle] = []
+    for item in items:
+        record = tools.resolve_candidate(item)
+        if record is None:
+            continue
+        try:
+            articles.append(RawNewsArticle(**record))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed Reporter article: {e}")
+    articles = collapse_near_duplicates(articles)
+    
+    if len(articles) < count:
+        selected = {canonicalize_url(str(article.url)) for article in articles}
+        spare = []
+        for record in tools.candidate_pool():
+            if canonicalize_url(record["url"]) in selected:
+                continue
+            try:
+                spare.append(RawNewsArticle(**record))
+            except (TypeError, ValueError):
+                continue
+        logger.warning(
+            f"Reporter selected {len(articles)} of {count} articles, "
+            f"backfilling from {len(spare)} remaining candidates"
+        )
+        articles = collapse_near_duplicates(articles + spare)
+    
+    if len(articles) < count:
+        raise ValueError(f"Only {len(articles)} distinct articles found, {count} are needed")
+    return articles[:count]
+
+
+def collect_raw_articles(llm: Any, topic: Topic = DEFAULT_TOPIC) -> list[RawNewsArticle]:
+    """
+    Run the Reporter stage and return the collected articles.
+    
+    Args:
+        llm: Language model of the Reporter stage
+        topic: Newsletter topic searched by the Reporter
+    
+    Returns:
+        ARTICLES_PER_EDITION raw articles in Reporter order
+    
+    Raises:
+        ValueError: If fewer articles than an edition needs were found
+    """
+    reporter = create_reporter_agent(llm, topic)
+    reporter_task = create_reporter_task(
+        reporter,
+        article_count=ARTICLES_PER_EDITION + REPORTER_SPARE_ARTICLES,
+        ids_only=True,
+        topic=topic,
+    )
+    
+    result = _run_single_task_crew(reporter, reporter_task)
+    data = extract_json(result.raw)
+    if isinstance(data, dict):
+        data = data.get("ids") or data.get("articles", [])
+    
+    # The Reporter answers with candidate ids; rejoin the full records
+    articles = select_articles(data)
+    logger.info(f"Reporter stage collected {len(articles)} articles")
+    return articles
+
+
+def summarize_article(llm: Any, article: RawNewsArticle) -> ProcessedNewsArticle:
+    """
+    Summarize one raw article with its own Editor agent.
+    
+    Each call gets a private agent and a shallow copy of the LLM so that
+    per-call state (stop words, callbacks) is not shared between threads.
+    The Editor is not specialized to a topic, so the summary can be reused
+    by every newsletter covering the article.
+    
+    Args:
+        llm: Language model of the Editor stage
+        article: Raw article to summarize
+    
+    Returns:
+        Processed article combining Reporter metadata and Editor text
+    """
+    editor = create_article_editor_agent(copy.copy(llm))
+    task = create_article_editor_task(editor, article)
+    
+    result = _run_single_task_crew(editor, task)
+    summary = parse_model_output(result, ArticleSummary)
+    return ProcessedNewsArticle.from_raw(article, summary)
+
+
+def summarize_articles_parallel(
+    llm: Any,
+    articles: list[RawNewsArticle],
+    max_workers: int = EDITOR_CONCURRENCY,
+    on_article: Optional[ArticleCallback] = None,
+) -> list[ProcessedNewsArticle]:
+    """
+    Summarize all articles concurrently, preserving their order.
+    
+    Args:
+        llm: Language model of the Editor stage
+        articles: Raw articles from the Reporter stage
+        max_workers: Maximum number of concurrent Editor calls
+        on_article: Called with (index, article) in completion order
+    
+    Returns:
+        Processed articles in the same order as the input
+    """
+    logger.info(
+        f"Editor fan-out: summarizing {len(articles)} articles "
+        f"with concurrency {max_workers}"
+    )
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(summarize_article, llm, article): idx
+            for idx, article in enumerate(articles)
+        }
+        processed: list[Optional[ProcessedNewsArticle]] = [None] * len(articles)
+        for future in as_completed(futures):
+            idx = futures[future]
+            processed[idx] = future.result()
+            if on_article is not None:
+                on_article(idx, processed[idx])
+    
+    logger.info(f"Editor fan-out completed: {len(processed)} articles")
+    return processed
+
+
+def _claim_articles(
+    articles: list[RawNewsArticle],
+    on_article: Optional[ArticleCallback] = None,
+) -> tuple[list[Optional[ProcessedNewsArticle]], list[int], dict[int, _Claim]]:
+    """
+    Look up reusable articles and claim the URLs this pipeline summarizes.
+    
+    Args:
+        articles: Raw articles from the Reporter stage
+        on_article: Called with (index, article) for every reused article
+    
+    Returns:
+        Reused articles (None where missing), indices of the articles claimed
+        for summarizing, and claims of those another pipeline summarizes
+    """
+    article_store.refresh()
+    
+    processed: list[Optional[ProcessedNewsArticle]] = [
+        article_store.get(str(article.url)) for article in articles
+    ]
+    missing = [idx for idx, article in enumerate(processed) if article is None]
+    logger.info(
+        f"Reusing {len(articles) - len(missing)} previously processed articles, "
+        f"summarizing {len(missing)} new ones"
+    )
+    
+    if on_article is not None:
+        for idx, article in enumerate(processed):
+            if article is not None:
+                on_article(idx, article)
+    
+    # Claim the missing URLs, or find the pipeline already summarizing them
+    owned: list[int] = []
+    shared: dict[int, _Claim] = {}
+    with _in_flight_lock:
+        for idx in missing:
+            key = canonicalize_url(str(articles[idx].url))
+            if key in _in_flight:
+                shared[idx] = _in_flight[key]
+                continue
+            # The summary may have been stored since the lookup above
+            processed[idx] = article_store.get(key)
+            if processed[idx] is not None:
+                if on_article is not None:
+                    on_article(idx, processed[idx])
+                continue
+            _in_flight[key] = _Claim()
+            owned.append(idx)
+    if shared:
+        logger.info(f"Awaiting {len(shared)} articles summarized by another edition")
+    
+    return processed, owned, shared
+
+
+def _release(
+    raw: RawNewsArticle,
+    article: Optional[ProcessedNewsArticle],
+    error: Optional[Exception] = None,
+) -> None:
+    """Hand a claimed article (or the error summarizing it) to waiting pipelines."""
+    with _in_flight_lock:
+        claim = _in_flight.pop(canonicalize_url(str(raw.url)), None)
+    if claim is None:
+        return
+    if error is None:
+        _settle(claim.summary, article.short_summary)
+        _settle(claim.article, article)
+    else:
+        _settle(claim.summary, error=error)
+        _settle(claim.article, error=error)
+
+
+def _publish_summary(raw: RawNewsArticle, short_summary: str) -> None:
+    """Hand the short summary of a claimed article to waiting pipelines."""
+    with _in_flight_lock:
+        claim = _in_flight.get(canonicalize_url(str(raw.url)))
+    if claim is not None:
+        _settle(claim.summary, short_summary)
+
+
+def _settle(future: Future, result: Any = None, error: Optional[Exception] = None) -> None:
+    """Set the result (or error) of a claim future unless it is already set."""
+    if future.done():
+        return
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+
+def _release_unfinished(
+    articles: list[RawNewsArticle],
+    processed: list[Optional[ProcessedNewsArticle]],
+    owned: list[int],
+    error: Exception,
+) -> None:
+    """Let waiting pipelines summarize the claimed articles left unfinished."""
+    for idx in owned:
+        if processed[idx] is None:
+            _release(articles[idx], None, error)
+
+
+def _await_shared(
+    llm: Any,
+    articles: list[RawNewsArticle],
+    processed: list[Optional[ProcessedNewsArticle]],
+    shared: dict[int, _Claim],
+    on_article: Optional[ArticleCallback] = None,
+) -> None:
+    """Fill in the articles summarized by other pipelines, or summarize them on failure."""
+    for idx, claim in shared.items():
+        try:
+            processed[idx] = claim.article.result()
+        except Exception as e:
+            logger.warning(f"Shared summary failed ({e}), summarizing {articles[idx].url}")
+            processed[idx] = summarize_article(llm, articles[idx])
+            article_store.add(processed[idx])
+        if on_article is not None:
+            on_article(idx, processed[idx])
+
+
+def summarize_articles_incremental(
+    llm: Any,
+    articles: list[RawNewsArticle],
+    max_workers: int = EDITOR_CONCURRENCY,
+    on_article: Optional[ArticleCallback] = None,
+) -> list[ProcessedNewsArticle]:
+    """
+    Reuse previously processed articles and summarize only new URLs.
+    
+    URLs that another running pipeline is already summarizing are not
+    summarized again; their summaries are awaited once this pipeline's own
+    summaries are written.
+    
+    Args:
+        llm: Language model of the Editor stage
+        articles: Raw articles from the Reporter stage
+        max_workers: Maximum number of concurrent Editor calls
+        on_article: Called with (index, article), reused articles first
+    
+    Returns:
+        Processed articles in the same order as the input
+    """
+    processed, owned, shared = _claim_articles(articles, on_article)
+    
+    if owned:
+        def _on_fresh(position: int, article: ProcessedNewsArticle) -> None:
+            processed[owned[position]] = article
+            article_store.add(article)
+            _release(articles[owned[position]], article)
+            if on_article is not None:
+                on_article(owned[position], article)
+        
+        try:
+            summarize_articles_parallel(
+                llm, [articles[idx] for idx in owned], max_workers, _on_fresh
+            )
+        except Exception as e:
+            _release_unfinished(articles, processed, owned, e)
+            raise
+    
+    _await_shared(llm, articles, processed, shared, on_article)
+    return processed
+
+
+def write_editorial(
+    llm: Any,
+    articles: list[ProcessedNewsArticle],
+    topic: Topic = DEFAULT_TOPIC,
+) -> Editorial:
+    """
+    Run the Senior Editor stage over the finished articles.
+    
+    Args:
+        llm: Language model of the Senior Editor stage
+        articles: Processed articles from the Editor stage
+        topic: Newsletter topic the editorial is written for
+    
+    Returns:
+        Front-page editorial
+    """
+    senior_editor = create_senior_editor_agent(llm, topic)
+    task = create_editorial_task(senior_editor, articles, topic)
+    
+    result = _run_single_task_crew(senior_editor, task)
+    editorial = parse_model_output(result, Editorial)
+    logger.info("Senior Editor stage completed")
+    return editorial
+
+
+def write_short_summary(llm: Any, article: RawNewsArticle) -> str:
+    """
+    Write only the short summary of one article (first pipelined pass).
+    
+    Args:
+        llm: Language model of the Editor stage
+        article: Raw article to summarize
+    
+    Returns:
+        Short summary text
+    """
+    editor = create_article_editor_agent(copy.copy(llm))
+    task = create_short_summary_task(editor, article)
+    
+    result = _run_single_task_crew(editor, task)
+    return parse_model_output(result, ShortSummary).short_summary
+
+
+def write_detailed_article(llm: Any, article: RawNewsArticle, short_summary: str) -> ProcessedNewsArticle:
+    """
+    Write the detailed article of one article (second pipelined pass).
+    
+    Args:
+        llm: Language model of the Editor stage
+        article: Raw article to analyze
+        short_summary: Short summary written in the first pass
+    
+    Returns:
+        Processed article combining Reporter metadata and both Editor texts
+    """
+    editor = create_article_editor_agent(copy.copy(llm))
+    task = create_detailed_article_task(editor, article, short_summary)
+    
+    result = _run_single_task_crew(editor, task)
+    detailed = parse_model_output(result, DetailedArticle).detailed_article
+    summary = ArticleSummary(short_summary=short_summary, detailed_article=detailed)
+    return ProcessedNewsArticle.from_raw(article, summary)
+
+
+def write_editorial_from_summaries(
+    llm: Any,
+    articles: list[RawNewsArticle],
+    short_summaries: list[str],
+    topic: Topic = DEFAULT_TOPIC,
+) -> Editorial:
+    """
+    Run the Senior Editor stage over the short summaries only.
+    
+    Args:
+        llm: Language model of the Senior Editor stage
+        articles: Raw articles from the Reporter stage
+        short_summaries: Short summary of each article, in the same order
+        topic: Newsletter topic the editorial is written for
+    
+    Returns:
+        Front-page editorial
+    """
+    senior_editor = create_senior_editor_agent(llm, topic)
+    task = create_summary_editorial_task(senior_editor, articles, short_summaries, topic)
+    
+    with metrics.span("stage", stage="senior_editor"):
+        result = _run_single_task_crew(senior_editor, task)
+    editorial = parse_model_output(result, Editorial)
+    logger.info("Senior Editor stage completed")
+    return editorial
+
+
+def run_pipelined_stages(
+    llms: dict[str, Any],
+    articles: list[RawNewsArticle],
+    max_workers: int = EDITOR_CONCURRENCY,
+    incremental: bool = INCREMENTAL,
+    stream: Optional[EditionStream] = None,
+    topic: Topic = DEFAULT_TOPIC,
+) -> tuple[list[ProcessedNewsArticle], Editorial]:
+    """
+    Run the Editor and Senior Editor stages overlapped.
+    
+    The short summaries of all articles are written first. The editorial is
+    then written from them on its own thread while the detailed articles are
+    written on the Editor pool, so after the short pass the critical path is
+    max(editorial, details) instead of their sum.
+    
+    For articles another running pipeline is writing, only their short
+    summaries are awaited before the editorial starts; the finished articles
+    are awaited after this pipeline's own details are written and released.
+    Every short summary is published as soon as it is written, so two
+    pipelines sharing articles in either order both make progress.
+    
+    Args:
+        llms: Language model of each stage, by stage name
+        articles: Raw articles from the Reporter stage
+        max_workers: Maximum number of concurrent Editor calls
+        incremental: Reuse articles already processed in recent editions
+        stream: Optional stream receiving articles and the editorial
+        topic: Newsletter topic the editorial is written for
+    
+    Returns:
+        Processed articles in Reporter order, and the editorial
+    """
+    on_article = stream.publish_article if stream is not None else None
+    if incremental:
+        processed, owned, shared = _claim_articles(articles, on_article)
+    else:
+        processed, owned, shared = [None] * len(articles), list(range(len(articles))), {}
+    
+    def _write_short_summary(idx: int) -> str:
+        short_summary = write_short_summary(llms["editor"], articles[idx])
+        if incremental:
+            _publish_summary(articles[idx], short_summary)
+        return short_summary
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            with metrics.span("stage", stage="editor"):
+                short_summaries = dict(zip(owned, executor.map(_write_short_summary, owned)))
+                for idx, claim in shared.items():
+                    try:
+                        short_summaries[idx] = claim.summary.result()
+                    except Exception as e:
+                        logger.warning(f"Shared summary failed ({e}), summarizing {articles[idx].url}")
+                        short_summaries[idx] = write_short_summary(llms["editor"], articles[idx])
+            summaries = [
+                short_summaries[idx] if idx in short_summaries else processed[idx].short_summary
+                for idx in range(len(articles))
+            ]
+            logger.info(
+                f"Short summaries ready, writing the editorial while {len(owned)} "
+                f"detailed articles are written"
+            )
+            
+            if stream is not None:
+                stream.set_stage("senior_editor")
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="editorial") as editorial_executor:
+                editorial_future = editorial_executor.submit(
+                    write_editorial_from_summaries, llms["senior_editor"], articles, summaries, topic
+                )
+                
+                with metrics.span("stage", stage="details"):
+                    futures = {
+                        executor.submit(write_detailed_article, llms["editor"], articles[idx], short_summaries[idx]): idx
+                        for idx in owned
+                    }
+                    for future in as_completed(futures):
+                        idx = futures[future]
+                        processed[idx] = future.result()
+                        if incremental:
+                            article_store.add(processed[idx])
+                            _release(articles[idx], processed[idx])
+                        if on_article is not None:
+                            on_article(idx, processed[idx])
+                    
+                    # Our own articles are released, so waiting cannot block the other pipeline
+                    for idx, claim in shared.items():
+                        try:
+                            processed[idx] = claim.article.result()
+                        except Exception as e:
+                            logger.warning(f"Shared article failed ({e}), writing {articles[idx].url}")
+                            processed[idx] = write_detailed_article(
+                                llms["editor"], articles[idx], short_summaries[idx]
+                            )
+                            article_store.add(processed[idx])
+                        if on_article is not None:
+                            on_article(idx, processed[idx])
+                
+                editorial = editorial_future.result()
+    except Exception as e:
+        if incremental:
+            _release_unfinished(articles, processed, owned, e)
+        raise
+    
+    if stream is not None:
+        stream.publish_editorial(editorial)
+    return processed, editorial
+
+
+def run_parallel_pipeline(
+    llms: dict[str, Any],
+    max_workers: int = EDITOR_CONCURRENCY,
+    incremental: bool = INCREMENTAL,
+    stream: Optional[EditionStream] = None,
+    topic: Topic = DEFAULT_TOPIC,
+    pipelined: bool = PIPELINED_EDITORIAL,
+) -> Newsletter:
+    """
+    Generate a newsletter with the Editor stage fanned out per article.
+    
+    Args:
+        llms: Language model of each stage, by stage name
+        max_workers: Maximum number of concurrent Editor calls
+        incremental: Reuse articles already processed in recent editions
+        stream: Optional stream receiving every stage output as it completes
+        topic: Newsletter topic (defaults to NVIDIA)
+        pipelined: Write the editorial from the short summaries while the
+            detailed articles are written (see run_pipelined_stages)
+    
+    Returns:
+        Validated Newsletter assembled from the stage outputs
+    """
+    try:
+        if stream is not None:
+            stream.set_stage("reporter")
+        with metrics.span("stage", stage="reporter"):
+            raw_articles = collect_raw_articles(llms["reporter"], topic)
+        
+        # Download thumbnails while the Editor and Senior Editor stages run
+        thumbnails = threading.Thread(
+            target=thumbnail_cache.fetch_all,
+            args=([article.thumbnail for article in raw_articles],),
+            name="thumbnail-prefetch",
+            daemon=True,
+        )
+        thumbnails.start()
+        
+        on_article = None
+        if stream is not None:
+            stream.publish_raw_articles(raw_articles)
+            stream.set_stage("editor")
+            on_article = stream.publish_article
+        
+        if pipelined:
+            articles, editorial = run_pipelined_stages(
+                llms, raw_articles, max_workers, incremental, stream, topic
+            )
+        else:
+            with metrics.span("stage", stage="editor"):
+                if incremental:
+                    articles = summarize_articles_incremental(
+                        llms["editor"], raw_articles, max_workers, on_article
+                    )
+                else:
+                    articles = summarize_articles_parallel(
+                        llms["editor"], raw_articles, max_workers, on_article
+                    )
+            
+            if stream is not None:
+                stream.set_stage("senior_editor")
+            with metrics.span("stage", stage="senior_editor"):
+                editorial = write_editorial(llms["senior_editor"], articles, topic)
+            if stream is not None:
+                stream.publish_editorial(editorial)
+        
+        newsletter = Newsletter(editorial=editorial, articles=articles)
+        thumbnails.join()
+    except Exception as e:
+        if stream is not None:
+            stream.fail(e)
+        raise
+    
+    if stream is not None:
+        stream.complete(newsletter)
+    return newsletter
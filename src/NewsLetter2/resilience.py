@@ -0,0 +1,455 @@
+# =============================================================================
+#  Filename: resilience.py
+#
+#  Short Description: Rate limiting, retry and circuit breaking for API calls
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Coordinated access to the external APIs (OpenAI and SerpAPI).
+
+Every call to an external service goes through a process-wide
+ExternalService, shared by all concurrent runs (parallel Editor calls,
+backfilled dates, several topics):
+
+- A token-bucket RateLimiter spaces requests (and, for OpenAI, tokens) to
+  stay under the per-minute quotas instead of provoking 429s.
+- Throttled (429) and transient (5xx, timeout, connection) failures are
+  retried with jittered exponential backoff. A Retry-After header is
+  honoured and pauses the whole limiter, so concurrent callers back off
+  together instead of stampeding the API.
+- A CircuitBreaker opens after consecutive transient failures and fails
+  calls fast until a cool-down has passed, then lets one probe call
+  through. Throttling does not count as a failure: the service is up.
+
+Retries are counted on the caller's metrics span.
+"""
+
+import email.utils
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, TypeVar
+
+import requests
+from loguru import logger
+
+from NewsLetter2.metrics import Span
+
+
+# Per-minute quotas (0 disables a limit)
+OPENAI_RPM = int(os.getenv("NEWSLETTER_OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("NEWSLETTER_OPENAI_TPM", "200000"))
+SERPAPI_RPM = int(os.getenv("NEWSLETTER_SERPAPI_RPM", "60"))
+
+# Retry policy: total attempts per call and backoff bounds in seconds
+RETRY_ATTEMPTS = int(os.getenv("NEWSLETTER_RETRY_ATTEMPTS", "5"))
+RETRY_BASE_SECONDS = float(os.getenv("NEWSLETTER_RETRY_BASE_SECONDS", "1.0"))
+RETRY_MAX_SECONDS = float(os.getenv("NEWSLETTER_RETRY_MAX_SECONDS", "30"))
+
+# Circuit breaker: consecutive failures that open it and seconds it stays open
+BREAKER_FAILURES = int(os.getenv("NEWSLETTER_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("NEWSLETTER_BREAKER_COOLDOWN", "60"))
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Exceptions without a status code that are worth retrying
+_TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+T = TypeVar("T")
+
+
+class ServiceError(Exception):
+    """HTTP error response of an external service."""
+    
+    def __init__(self, service: str, status_code: int, retry_after: Optional[float] = None):
+        """
+        Initialize service error.
+        
+        Args:
+            service: Name of the service
+            status_code: HTTP status of the response
+            retry_after: Seconds the service asked to wait, if any
+        """
+        super().__init__(f"{service} responded with HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Delay in seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Return the HTTP status of an API error (requests, OpenAI/litellm or ServiceError)."""
+    status = getattr(error, "status_code", None)
+    if not isinstance(status, int):
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Return the delay an API error asks for via Retry-After, if any."""
+    retry_after = getattr(error, "retry_after", None)
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+    
+    for headers in (
+        getattr(getattr(error, "response", None), "headers", None),
+        getattr(error, "litellm_response_headers", None),
+    ):
+        if not headers:
+            continue
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds:
+            try:
+                return max(0.0, float(milliseconds) / 1000)
+            except ValueError:
+                pass
+        delay = parse_retry_after(headers.get("retry-after"))
+        if delay is not None:
+            return delay
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+    
+    def __init__(self, per_minute: float):
+        """
+        Initialize token bucket.
+        
+        Args:
+            per_minute: Capacity and refill rate per minute (0 disables it)
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, going into debt if it is short.
+        
+        Callers are served in the order they reserve: each one waits until
+        the debt in front of it has been refilled.
+        
+        Args:
+            amount: Tokens to take (clamped to the capacity)
+        
+        Returns:
+            Seconds the caller must wait before using the tokens
+        """
+        if self.capacity <= 0 or amount <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= min(amount, self.capacity)
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+
+class RateLimiter:
+    """Request and token quotas of one service, shared by all its callers."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = 0):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            requests_per_minute: Request quota (0 disables it)
+            tokens_per_minute: Token quota (0 disables it)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request of the given token size may be sent.
+        
+        Args:
+            tokens: Estimated tokens of the request
+        
+        Returns:
+            Seconds waited
+        """
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - time.monotonic())
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+    
+    def consume(self, tokens: int) -> None:
+        """
+        Charge tokens known only after a request (e.g. the completion).
+        
+        Args:
+            tokens: Tokens used beyond the estimate passed to acquire()
+        """
+        self.tokens.reserve(tokens)
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for a while (e.g. after a 429 with Retry-After).
+        
+        Args:
+            seconds: Pause duration from now
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURES,
+        cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS,
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            name: Service name used in messages
+            failure_threshold: Consecutive failures that open the circuit (0 disables it)
+            cooldown_seconds: Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    def before_call(self) -> None:
+        """
+        Admit a call, or fail fast while the circuit is open.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open":
+                remaining = self._opened_at + self.cooldown_seconds - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"{self.name} circuit open, retry in {remaining:.0f}s"
+                    )
+                self.state = "half_open"
+                self._probing = False
+            if self._probing:
+                raise CircuitOpenError(f"{self.name} circuit half-open, probe in flight")
+            self._probing = True
+    
+    def record_success(self) -> None:
+        """Close the circuit after a call the service answered."""
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"{self.name} circuit closed")
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.failure_threshold <= 0:
+                return
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.error(
+                        f"{self.name} circuit opened after {self._failures} failures, "
+                        f"failing fast for {self.cooldown_seconds:.0f}s"
+                    )
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class ExternalService:
+    """Rate-limited, retried and circuit-broken access to one external API."""
+    
+    def __init__(
+        self,
+        name: str,
+        limiter: RateLimiter,
+        breaker: Optional[CircuitBreaker] = None,
+        attempts: int = RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BASE_SECONDS,
+        max_delay: float = RETRY_MAX_SECONDS,
+    ):
+        """
+        Initialize external service.
+        
+        Args:
+            name: Service name used in messages
+            limiter: Quotas of the service
+            breaker: Circuit breaker (defaults to a new one)
+            attempts: Total attempts per call
+            base_delay: Backoff of the first retry in seconds
+            max_delay: Upper bound of the exponential backoff in seconds
+        """
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker if breaker is not None else CircuitBreaker(name)
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "throttled": 0, "failures": 0, "rejected": 0}
+    
+    def _count(self, counter: str) -> None:
+        """Increment one of the service counters."""
+        with self._lock:
+            self._stats[counter] += 1
+    
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """
+        Return the wait before the next attempt.
+        
+        Args:
+            attempt: Number of the attempt that just failed (from 1)
+            retry_after: Delay requested by the service, if any
+        
+        Returns:
+            Retry-After plus a little jitter, or a "full jitter" exponential backoff
+        """
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+    
+    def call(self, fn: Callable[[], T], tokens: int = 0, span: Optional[Span] = None) -> T:
+        """
+        Call the service through the limiter, retry policy and circuit breaker.
+        
+        Args:
+            fn: Function performing one request
+            tokens: Estimated tokens of the request, charged to the token quota
+            span: Metrics span the retries and rate-limit waits are recorded on
+        
+        Returns:
+            Result of fn
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            Exception: The last error when it is not retryable or attempts ran out
+        """
+        self._count("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("rejected")
+                raise
+            
+            waited = self.limiter.acquire(tokens)
+            if span is not None and waited > 0:
+                span.attributes["rate_limit_wait_s"] = round(
+                    span.attributes.get("rate_limit_wait_s", 0.0) + waited, 3
+                )
+            
+            try:
+                result = fn()
+            except Exception as e:
+                status = _status_code(e)
+                throttled = status == 429
+                if status not in RETRY_STATUSES and not (
+                    status is None and isinstance(e, _TRANSIENT_ERRORS)
+                ):
+                    # The service answered; the request itself was rejected
+                    self.breaker.record_success()
+                    raise
+                
+                if throttled:
+                    self._count("throttled")
+                    self.breaker.record_success()
+                else:
+                    self._count("failures")
+                    self.breaker.record_failure()
+                if attempt == self.attempts or self.breaker.state == "open":
+                    raise
+                
+                delay = self._delay(attempt, _retry_after(e))
+                if throttled:
+                    # Everyone sharing the quota waits, not just this caller
+                    self.limiter.pause(delay)
+                logger.warning(
+                    f"{self.name} call failed ({e}), retry {attempt}/{self.attempts - 1} "
+                    f"in {delay:.1f}s"
+                )
+                self._count("retries")
+                if span is not None:
+                    span.retry()
+                time.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+    
+    def stats(self) -> dict[str, Any]:
+        """
+        Return call counters and the circuit state.
+        
+        Returns:
+            Dictionary with calls, retries, throttled, failures, rejected and state
+        """
+        with self._lock:
+            return {**self._stats, "state": self.breaker.state}
+
+
+# Global service instances shared by all runs of the process
+openai_service = ExternalService("OpenAI", RateLimiter(OPENAI_RPM, OPENAI_TPM))
+serpapi_service = ExternalService("SerpAPI", RateLimiter(SERPAPI_RPM))
@@ -0,0 +1,342 @@
+# =============================================================================
+#  Filename: search_cache.py
+#
+#  Short Description: Two-tier TTL cache for SerpAPI search responses
+#
+#  Creation date: 2025-10-06
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Response cache for SerpAPI searches.
+
+Keeps recent responses in an in-process LRU and persists them on disk so that
+retries and reruns within the TTL do not pay for another SerpAPI round trip.
+Expired entries are kept around and served as a fallback when SerpAPI fails.
+Concurrent misses for the same request (e.g. overlapping queries of several
+newsletter topics) are coalesced into a single SerpAPI call.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+# Cache settings (override via environment variables)
+SEARCH_CACHE_DIR = os.getenv("NEWSLETTER_SEARCH_CACHE_DIR", "cache/search")
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("NEWSLETTER_SEARCH_CACHE_TTL", "10800"))
+SEARCH_CACHE_MAX_STALE_SECONDS = int(os.getenv("NEWSLETTER_SEARCH_CACHE_MAX_STALE", "604800"))
+SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("NEWSLETTER_SEARCH_CACHE_MEMORY_ENTRIES", "128"))
+
+# Parameters that never influence the search results
+_IGNORED_PARAMS = {"api_key", "output", "async"}
+
+
+class SearchCache:
+    """In-process LRU backed by an on-disk store of SerpAPI responses."""
+    
+    def __init__(
+        self,
+        cache_dir: str = SEARCH_CACHE_DIR,
+        ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS,
+        max_stale_seconds: int = SEARCH_CACHE_MAX_STALE_SECONDS,
+        max_memory_entries: int = SEARCH_CACHE_MEMORY_ENTRIES,
+    ):
+        """
+        Initialize search cache.
+        
+        Args:
+            cache_dir: Directory for persisted responses
+            ttl_seconds: Age after which an entry is no longer fresh
+            max_stale_seconds: Maximum age of an entry served when SerpAPI fails
+            max_memory_entries: Number of responses kept in the in-process LRU
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_memory_entries = max_memory_entries
+        
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stale_hits": 0,
+            "errors": 0,
+        }
+        
+        logger.info(f"Search cache initialized with directory: {self.cache_dir}")
+    
+    @staticmethod
+    def normalize_params(params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Normalize search parameters so equivalent queries share a cache entry.
+        
+        Args:
+            params: SerpAPI request parameters
+        
+        Returns:
+            Parameters without credentials, with lower-cased keys and
+            whitespace-collapsed string values
+        """
+        normalized: dict[str, Any] = {}
+        for key, value in params.items():
+            key = str(key).lower()
+            if key in _IGNORED_PARAMS or value is None:
+                continue
+            if isinstance(value, str):
+                value = " ".join(value.split())
+            normalized[key] = value
+        return dict(sorted(normalized.items()))
+    
+    def make_key(self, params: dict[str, Any]) -> str:
+        """
+        Build the cache key for a set of search parameters.
+        
+        Args:
+            params: SerpAPI request parameters
+        
+        Returns:
+            Hex SHA-256 digest of the normalized parameters
+        """
+        payload = json.dumps(self.normalize_params(params), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        """Return the on-disk location of a cache entry."""
+        return self.cache_dir / f"{key}.json"
+    
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        """Insert an entry into the in-process LRU (caller holds the lock)."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _lookup(self, key: str) -> tuple[Optional[dict[str, Any]], str]:
+        """
+        Find an entry in memory or on disk regardless of its age.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Tuple of (entry or None, tier name)
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+        
+        path = self._entry_path(key)
+        if not path.exists():
+            return None, ""
+        
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search cache entry {path}: {e}")
+            return None, ""
+        
+        with self._lock:
+            self._remember(key, entry)
+        return entry, "disk"
+    
+    def get(self, params: dict[str, Any], allow_stale: bool = False) -> Optional[dict[str, Any]]:
+        """
+        Return a cached response for the given parameters.
+        
+        Args:
+            params: SerpAPI request parameters
+            allow_stale: Accept entries past the TTL (up to max_stale_seconds)
+        
+        Returns:
+            Cached SerpAPI response, or None when no usable entry exists
+        """
+        entry, tier = self._lookup(self.make_key(params))
+        if entry is None:
+            return None
+        
+        age = time.time() - entry.get("created_at", 0)
+        max_age = self.max_stale_seconds if allow_stale else self.ttl_seconds
+        if age > max_age:
+            return None
+        
+        with self._lock:
+            if allow_stale and age > self.ttl_seconds:
+                self._stats["stale_hits"] += 1
+            else:
+                self._stats["hits"] += 1
+                self._stats[f"{tier}_hits"] += 1
+        return entry["response"]
+    
+    def set(self, params: dict[str, Any], response: dict[str, Any]) -> None:
+        """
+        Store a response in both tiers.
+        
+        Args:
+            params: SerpAPI request parameters
+            response: SerpAPI response dictionary
+        """
+        key = self.make_key(params)
+        entry = {
+            "created_at": time.time(),
+            "params": self.normalize_params(params),
+            "response": response,
+        }
+        
+        with self._lock:
+            self._remember(key, entry)
+        
+        # Write atomically so concurrent readers never see a partial file
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist search cache entry {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def get_or_fetch(
+        self,
+        params: dict[str, Any],
+        fetch: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Return a fresh cached response or fetch, store and return a new one.
+        
+        If the fetch raises or SerpAPI reports an error, the newest stale entry
+        (within max_stale_seconds) is served instead. Callers missing the same
+        request while it is being fetched wait for that fetch instead of
+        issuing their own.
+        
+        Args:
+            params: SerpAPI request parameters
+            fetch: Callable performing the actual SerpAPI request
+        
+        Returns:
+            SerpAPI response dictionary
+        """
+        cached = self.get(params)
+        if cached is not None:
+            logger.info(f"Search cache hit for query: {params.get('q')}")
+            return cached
+        
+        key = self.make_key(params)
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = Future()
+                leader = True
+                self._stats["misses"] += 1
+            else:
+                leader = False
+                self._stats["coalesced"] += 1
+        
+        if not leader:
+            logger.info(f"Search cache waiting for in-flight query: {params.get('q')}")
+            return pending.result()
+        
+        logger.info(f"Search cache miss for query: {params.get('q')}")
+        try:
+            response = self._fetch(params, fetch)
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(response)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return response
+    
+    def _fetch(
+        self,
+        params: dict[str, Any],
+        fetch: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Fetch and store a response, falling back to a stale entry on errors.
+        
+        Args:
+            params: SerpAPI request parameters
+            fetch: Callable performing the actual SerpAPI request
+        
+        Returns:
+            SerpAPI response dictionary
+        """
+        try:
+            response = fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            stale = self.get(params, allow_stale=True)
+            if stale is not None:
+                logger.warning(f"Search failed ({e}), serving stale cached response")
+                return stale
+            raise
+        
+        if "error" in response:
+            with self._lock:
+                self._stats["errors"] += 1
+            stale = self.get(params, allow_stale=True)
+            if stale is not None:
+                logger.warning(
+                    f"SerpAPI returned an error ({response['error']}), "
+                    "serving stale cached response"
+                )
+                return stale
+            return response
+        
+        self.set(params, response)
+        return response
+    
+    def stats(self) -> dict[str, int]:
+        """
+        Return hit/miss counters.
+        
+        Returns:
+            Dictionary of counters plus the current in-memory entry count
+        """
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory)}
+    
+    def clear(self) -> int:
+        """
+        Remove all cached responses from both tiers.
+        
+        Returns:
+            Number of files deleted from disk
+        """
+        with self._lock:
+            self._memory.clear()
+        
+        deleted = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError as e:
+                logger.error(f"Error deleting {path}: {e}")
+        return deleted
+
+
+# Global search cache instance
+search_cache = SearchCache()
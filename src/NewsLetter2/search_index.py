@@ -0,0 +1,214 @@
+# =============================================================================
+#  Filename: search_index.py
+#
+#  Short Description: SQLite FTS5 full-text index of cached editions
+#
+#  Creation date: 2025-10-12
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Full-text search over the edition archive.
+
+Every cached edition is indexed as one document for its editorial and one
+per article (title, source, summary and detailed text) in an SQLite FTS5
+table. The index is updated incrementally: saving an edition replaces only
+that edition's documents, and the checksum of each indexed edition is kept
+so reconciliation with the edition index re-reads only changed editions.
+Queries are answered from the inverted index with BM25 ranking, so their
+cost grows with the number of matches, not the size of the archive.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from NewsLetter2.models import Newsletter, SearchHit
+
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    title,
+    body,
+    date UNINDEXED,
+    article UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS indexed_editions (
+    date TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL
+);
+"""
+
+_DATE_FORMAT = "%Y-%m-%d"
+
+# BM25 weights of the title and body columns
+_TITLE_WEIGHT = 5.0
+_BODY_WEIGHT = 1.0
+
+# Number of tokens in a result snippet
+_SNIPPET_TOKENS = 16
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text typed by a reader into an FTS5 MATCH expression.
+    
+    Every word must match; quoting each one keeps FTS5 operators and
+    punctuation in the input from being interpreted. The last word also
+    matches as a prefix so results appear while typing.
+    
+    Args:
+        text: Search box input
+    
+    Returns:
+        MATCH expression, or None if the input has no searchable words
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """FTS5 index of editorial and article text, one document per section."""
+    
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the search index.
+        
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One connection shared by all threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+    
+    def index_edition(self, date: datetime, checksum: str, newsletter: Newsletter) -> None:
+        """
+        Replace the documents of one edition.
+        
+        Args:
+            date: Edition date
+            checksum: Checksum of the cached edition file
+            newsletter: Edition contents
+        """
+        date_str = date.strftime(_DATE_FORMAT)
+        editorial = newsletter.editorial
+        rows = [
+            (
+                editorial.headline,
+                "\n\n".join(
+                    (
+                        editorial.narrative,
+                        editorial.trend_analysis,
+                        editorial.product_leader_insights,
+                        editorial.competition_analysis,
+                    )
+                ),
+                date_str,
+                None,
+            )
+        ]
+        for idx, article in enumerate(newsletter.articles):
+            rows.append(
+                (
+                    article.title,
+                    "\n\n".join(
+                        (article.source, article.short_summary, article.detailed_article)
+                    ),
+                    date_str,
+                    idx,
+                )
+            )
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE date = ?", (date_str,))
+            self._conn.executemany(
+                "INSERT INTO documents (title, body, date, article) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO indexed_editions (date, checksum) VALUES (?, ?)",
+                (date_str, checksum),
+            )
+    
+    def remove(self, date: datetime) -> None:
+        """
+        Remove the documents of one edition.
+        
+        Args:
+            date: Edition date
+        """
+        date_str = date.strftime(_DATE_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE date = ?", (date_str,))
+            self._conn.execute("DELETE FROM indexed_editions WHERE date = ?", (date_str,))
+    
+    def checksums(self) -> dict[str, str]:
+        """Return the checksum of every indexed edition by YYYY-MM-DD date."""
+        with self._lock:
+            rows = self._conn.execute("SELECT date, checksum FROM indexed_editions").fetchall()
+        return dict(rows)
+    
+    def search(self, text: str, limit: int = 20) -> list[SearchHit]:
+        """
+        Find the sections best matching a free-text query.
+        
+        Args:
+            text: Search box input
+            limit: Maximum number of hits to return
+        
+        Returns:
+            Hits ranked by BM25, best first
+        """
+        query = build_match_query(text)
+        if query is None:
+            return []
+        
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, article, title, "
+                "snippet(documents, 1, '**', '**', '…', ?), "
+                "bm25(documents, ?, ?) AS score "
+                "FROM documents WHERE documents MATCH ? "
+                "ORDER BY score LIMIT ?",
+                (_SNIPPET_TOKENS, _TITLE_WEIGHT, _BODY_WEIGHT, query, limit),
+            ).fetchall()
+        
+        return [
+            SearchHit(
+                date=datetime.strptime(date, _DATE_FORMAT),
+                article_index=article,
+                title=title,
+                snippet=snippet,
+                score=score,
+            )
+            for date, article, title, snippet, score in rows
+        ]
+    
+    def optimize(self) -> None:
+        """Merge the index b-trees, e.g. after a bulk backfill."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO documents (documents) VALUES ('optimize')")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+        logger.debug(f"Search index closed: {self.db_path}")
@@ -0,0 +1,322 @@
+# =============================================================================
+#  Filename: static_export.py
+#
+#  Short Description: Static HTML export of cached newsletter editions
+#
+#  Creation date: 2025-10-12
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Static HTML exporter for cached editions.
+
+Renders each cached Newsletter into a landing page plus one page per
+article, styled with the same CSS as the Streamlit app, so editions can be
+served by any web server without running a Streamlit script per reader.
+An edition is re-rendered only when its checksum in the edition index
+changes. Topics other than the default one are exported to a subdirectory
+named after the topic key.
+
+Usage:
+    uv run python -m NewsLetter2.static_export [--out site] [--limit N] [--topic KEY]
+"""
+
+import argparse
+import html
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+from markdown_it import MarkdownIt
+
+from NewsLetter2.cache_manager import CacheManager, cache_manager
+from NewsLetter2.models import Newsletter, ProcessedNewsArticle, Topic
+from NewsLetter2.styles import NEWSLETTER_CSS, STATIC_PAGE_CSS
+from NewsLetter2.thumbnails import ThumbnailCache, thumbnail_cache
+from NewsLetter2.topics import DEFAULT_TOPIC, cache_namespace, get_topic
+
+
+# Output directory of the static site
+EXPORT_DIR = os.getenv("NEWSLETTER_EXPORT_DIR", "site")
+
+# Export every edition right after it is generated
+STATIC_EXPORT = os.getenv("NEWSLETTER_STATIC_EXPORT", "0") == "1"
+
+# Raw HTML in model output is escaped, never passed through
+_markdown = MarkdownIt("commonmark", {"html": False})
+
+_CHECKSUM_FILE = ".checksum"
+
+
+def _escape(text: Optional[str]) -> str:
+    """Escape text for use in HTML content and attributes."""
+    return html.escape(str(text or ""), quote=True)
+
+
+def _page(title: str, body: str, css_path: str) -> str:
+    """
+    Wrap page content in a complete HTML document.
+    
+    Args:
+        title: Document title
+        body: Inner HTML of the page
+        css_path: Relative URL of the shared stylesheet
+    
+    Returns:
+        Complete HTML document
+    """
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n<head>\n'
+        '<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{_escape(title)}</title>\n"
+        f'<link rel="stylesheet" href="{css_path}">\n'
+        "</head>\n<body>\n"
+        f'<div class="page">\n{body}\n</div>\n'
+        "</body>\n</html>\n"
+    )
+
+
+class StaticExporter:
+    """Renders cached editions into a static HTML site."""
+    
+    def __init__(
+        self,
+        manager: CacheManager = cache_manager,
+        out_dir: str = EXPORT_DIR,
+        thumbnails: ThumbnailCache = thumbnail_cache,
+        topic: Topic = DEFAULT_TOPIC,
+    ):
+        """
+        Initialize static exporter.
+        
+        Args:
+            manager: Cache manager the editions are read from
+            out_dir: Output directory of the static site
+            thumbnails: Local thumbnail cache images are copied from
+            topic: Newsletter topic named in the page titles
+        """
+        self.manager = manager
+        self.out_dir = Path(out_dir)
+        self.thumbnails = thumbnails
+        self.topic = topic
+    
+    def _write(self, path: Path, content: str) -> None:
+        """Atomically write a text file (concurrent exports may share it)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    def _image(self, url: Optional[str], prefix: str) -> str:
+        """
+        Copy a locally cached thumbnail into the site and return its img tag.
+        
+        Args:
+            url: Thumbnail source URL
+            prefix: Relative path from the page to the site root
+        
+        Returns:
+            HTML img tag (of the source URL if the thumbnail was never
+            fetched), or an empty string if the article has no image
+        """
+        local = self.thumbnails.local_path(url)
+        if local is None:
+            return f'<img src="{_escape(url)}" alt="">' if url else ""
+        target = self.out_dir / "thumbnails" / local.name
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                shutil.copyfile(local, tmp_path)
+                os.replace(tmp_path, target)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        return f'<img src="{prefix}thumbnails/{local.name}" alt="">'
+    
+    def _render_landing(self, newsletter: Newsletter, edition_key: str) -> str:
+        """Render the landing page of an edition."""
+        editorial = newsletter.editorial
+        cards = []
+        for idx, article in enumerate(newsletter.articles, start=1):
+            cards.append(
+                '<div class="news-card">\n'
+                f"{self._image(article.thumbnail, '../')}\n"
+                f"<h3>{_escape(article.title)}</h3>\n"
+                f'<div class="caption">📍 {_escape(article.source)}</div>\n'
+                f"{_markdown.render(article.short_summary)}"
+                f'<a class="button" href="articles/{idx:02d}.html">📖 Read Full Analysis →</a>\n'
+                "</div>"
+            )
+        
+        body = (
+            f'<div class="main-header">🚀 {_escape(self.topic.name)} AI Newsletter</div>\n'
+            f'<div class="sub-header">Edition • {newsletter.generated_at.strftime("%B %d, %Y")}</div>\n'
+            '<div class="editorial-box">\n'
+            f"<h2>📰 {_escape(editorial.headline)}</h2>\n"
+            "<h3>📝 Executive Summary</h3>\n"
+            f"{_markdown.render(editorial.narrative)}"
+            "<details><summary>📊 Trend Analysis - Market Patterns &amp; Insights</summary>\n"
+            f"{_markdown.render(editorial.trend_analysis)}</details>\n"
+            "<details><summary>💡 Product Leader Insights - Strategic Recommendations</summary>\n"
+            f"{_markdown.render(editorial.product_leader_insights)}</details>\n"
+            f"<details><summary>⚔️ {_escape(self.topic.name)} vs Competition - Competitive Landscape</summary>\n"
+            f"{_markdown.render(editorial.competition_analysis)}</details>\n"
+            "</div>\n"
+            '<div class="section-divider"></div>\n'
+            f"<h2>📡 Latest {_escape(self.topic.name)} News</h2>\n"
+            f'<div class="news-grid">\n{chr(10).join(cards)}\n</div>\n'
+            '<p class="caption"><a href="../index.html">← All editions</a></p>'
+        )
+        return _page(f"{self.topic.name} AI Newsletter • {edition_key}", body, "../styles.css")
+    
+    def _render_article(self, article: ProcessedNewsArticle, edition_key: str) -> str:
+        """Render the page of one article."""
+        published = (
+            f'<div class="caption">Published: {_escape(article.published_date)}</div>\n'
+            if article.published_date else ""
+        )
+        body = (
+            '<p><a href="../index.html">← Back to Newsletter</a></p>\n'
+            '<div class="section-divider"></div>\n'
+            f'<div class="news-title">{_escape(article.title)}</div>\n'
+            f'<div class="news-source">{_escape(article.source)}</div>\n'
+            f"{published}"
+            f"{self._image(article.thumbnail, '../../')}\n"
+            '<div class="section-divider"></div>\n'
+            "<h3>📋 Executive Summary</h3>\n"
+            f'<div class="summary-box">{_markdown.render(article.short_summary)}</div>\n'
+            "<h3>📊 In-Depth Analysis &amp; Strategic Implications</h3>\n"
+            f"{_markdown.render(article.detailed_article)}"
+            "<hr>\n"
+            "<h3>🔗 Read the Original Article</h3>\n"
+            f"<p>For complete details and additional context, visit the full article at "
+            f"<strong>{_escape(article.source)}</strong>:</p>\n"
+            f'<p><a href="{_escape(article.url)}">{_escape(article.url)}</a></p>'
+        )
+        return _page(f"{article.title} • {edition_key}", body, "../../styles.css")
+    
+    def _render_archive(self) -> str:
+        """Render the site index listing every exported edition."""
+        items = []
+        for record in self.manager.list_editions():
+            edition_key = record.date.strftime("%Y-%m-%d")
+            if (self.out_dir / edition_key / "index.html").exists():
+                items.append(
+                    f'<li><a href="{edition_key}/index.html">{edition_key}</a> — '
+                    f"{_escape(record.headline)}</li>"
+                )
+        body = (
+            f'<div class="main-header">🚀 {_escape(self.topic.name)} AI Newsletter</div>\n'
+            '<div class="sub-header">Edition archive</div>\n'
+            f'<ul class="edition-list">\n{chr(10).join(items)}\n</ul>'
+        )
+        return _page(f"{self.topic.name} AI Newsletter", body, "styles.css")
+    
+    def export_edition(self, date: Optional[datetime] = None, force: bool = False) -> bool:
+        """
+        Render one cached edition, unless it is unchanged since the last export.
+        
+        Args:
+            date: Edition date (defaults to today)
+            force: Re-render even if the edition checksum is unchanged
+        
+        Returns:
+            True if the edition was (re)rendered
+        """
+        record = self.manager.get_edition(date)
+        if record is None:
+            logger.warning(f"No cached edition to export for {date or 'today'}")
+            return False
+        
+        edition_key = record.date.strftime("%Y-%m-%d")
+        edition_dir = self.out_dir / edition_key
+        checksum_path = edition_dir / _CHECKSUM_FILE
+        if not force and checksum_path.exists() and checksum_path.read_text() == record.checksum:
+            return False
+        
+        newsletter = self.manager.load_from_cache(record.date)
+        if newsletter is None:
+            return False
+        
+        self._write(self.out_dir / "styles.css", NEWSLETTER_CSS + STATIC_PAGE_CSS)
+        for idx, article in enumerate(newsletter.articles, start=1):
+            self._write(
+                edition_dir / "articles" / f"{idx:02d}.html",
+                self._render_article(article, edition_key),
+            )
+        self._write(edition_dir / "index.html", self._render_landing(newsletter, edition_key))
+        
+        # Written last: an interrupted export is redone on the next run
+        self._write(checksum_path, record.checksum)
+        self._write(self.out_dir / "index.html", self._render_archive())
+        
+        logger.info(f"Exported edition {edition_key} to {edition_dir}")
+        return True
+    
+    def export_all(self, limit: Optional[int] = None, force: bool = False) -> int:
+        """
+        Render every cached edition that changed since the last export.
+        
+        Args:
+            limit: Only consider the most recent editions
+            force: Re-render unchanged editions too
+        
+        Returns:
+            Number of editions (re)rendered
+        """
+        exported = sum(
+            self.export_edition(record.date, force=force)
+            for record in self.manager.list_editions(limit=limit)
+        )
+        logger.info(f"Static export: {exported} editions rendered into {self.out_dir}")
+        return exported
+
+
+# Global static exporter instance
+static_exporter = StaticExporter()
+
+
+def exporter_for(topic: Topic, out_dir: str = EXPORT_DIR) -> StaticExporter:
+    """
+    Return a static exporter for the editions of a topic.
+    
+    Args:
+        topic: Newsletter topic
+        out_dir: Output directory of the default topic's site
+    
+    Returns:
+        Exporter writing to out_dir, or to out_dir/<key> for other topics
+    """
+    namespace = cache_namespace(topic)
+    if namespace is None:
+        return static_exporter if out_dir == EXPORT_DIR else StaticExporter(out_dir=out_dir)
+    return StaticExporter(
+        cache_manager.namespace(namespace),
+        out_dir=str(Path(out_dir) / topic.key),
+        topic=topic,
+    )
+
+
+def main() -> None:
+    """Export cached editions from the command line."""
+    parser = argparse.ArgumentParser(description="Export cached editions as static HTML")
+    parser.add_argument("--out", default=EXPORT_DIR, help="Output directory")
+    parser.add_argument("--limit", type=int, default=None, help="Most recent editions only")
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged editions")
+    parser.add_argument("--topic", default=None, help="Topic key (defaults to the default topic)")
+    args = parser.parse_args()
+    
+    exporter_for(get_topic(args.topic), out_dir=args.out).export_all(limit=args.limit, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# =============================================================================
+#  Filename: streaming.py
+#
+#  Short Description: Stage-by-stage publication of a newsletter in progress
+#
+#  Creation date: 2025-10-09
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Progressive publication of pipeline results.
+
+The pipeline publishes each stage output to an EditionStream as soon as it is
+available: the raw articles, every processed article as it completes, and
+finally the editorial. Readers (the Streamlit UI) take consistent snapshots
+at any time and render whatever is already there.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from loguru import logger
+
+from NewsLetter2.models import (
+    Editorial,
+    Newsletter,
+    PartialNewsletter,
+    ProcessedNewsArticle,
+    RawNewsArticle,
+)
+
+
+class EditionStream:
+    """Thread-safe accumulator of stage outputs for one generation run."""
+    
+    def __init__(self):
+        """Initialize an empty stream."""
+        self._lock = threading.Lock()
+        self._partial = PartialNewsletter()
+        self._newsletter: Optional[Newsletter] = None
+        self._done = threading.Event()
+        self._listeners: list[Callable[[str, PartialNewsletter], None]] = []
+    
+    def subscribe(self, listener: Callable[[str, PartialNewsletter], None]) -> None:
+        """
+        Register a callback invoked with (event, snapshot) after every update.
+        
+        Args:
+            listener: Callback; exceptions it raises are logged and ignored
+        """
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def _notify(self, event: str) -> None:
+        """Invoke listeners with a snapshot after an update."""
+        snapshot = self.snapshot()
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event, snapshot)
+            except Exception as e:
+                logger.warning(f"Edition stream listener failed: {e}")
+    
+    def set_stage(self, stage: str) -> None:
+        """
+        Record the pipeline stage that is currently running.
+        
+        Args:
+            stage: Stage name (reporter, editor, senior_editor, ...)
+        """
+        with self._lock:
+            self._partial.stage = stage
+        self._notify("stage")
+    
+    def publish_raw_articles(self, articles: list[RawNewsArticle]) -> None:
+        """
+        Publish the Reporter's articles.
+        
+        Args:
+            articles: Raw articles in edition order
+        """
+        with self._lock:
+            self._partial.raw_articles = list(articles)
+            self._partial.articles = [None] * len(articles)
+        self._notify("raw_articles")
+    
+    def publish_article(self, index: int, article: ProcessedNewsArticle) -> None:
+        """
+        Publish one processed article.
+        
+        Args:
+            index: Position of the article in the edition
+            article: Processed article
+        """
+        with self._lock:
+            if index >= len(self._partial.articles):
+                self._partial.articles.extend([None] * (index + 1 - len(self._partial.articles)))
+            self._partial.articles[index] = article
+        self._notify("article")
+    
+    def publish_editorial(self, editorial: Editorial) -> None:
+        """
+        Publish the Senior Editor's editorial.
+        
+        Args:
+            editorial: Front-page editorial
+        """
+        with self._lock:
+            self._partial.editorial = editorial
+        self._notify("editorial")
+    
+    def complete(self, newsletter: Newsletter) -> None:
+        """
+        Mark the stream as finished with the final newsletter.
+        
+        Args:
+            newsletter: Validated, complete newsletter
+        """
+        with self._lock:
+            self._newsletter = newsletter
+            self._partial.stage = "done"
+        self._done.set()
+        self._notify("complete")
+    
+    def fail(self, error: BaseException) -> None:
+        """
+        Mark the stream as finished with an error.
+        
+        Args:
+            error: Exception that aborted generation
+        """
+        with self._lock:
+            self._partial.error = str(error)
+            self._partial.stage = "failed"
+        self._done.set()
+        self._notify("failed")
+    
+    def snapshot(self) -> PartialNewsletter:
+        """
+        Return a consistent copy of everything published so far.
+        
+        Returns:
+            PartialNewsletter snapshot safe to read from another thread
+        """
+        with self._lock:
+            return self._partial.model_copy(
+                update={
+                    "raw_articles": list(self._partial.raw_articles),
+                    "articles": list(self._partial.articles),
+                }
+            )
+    
+    @property
+    def done(self) -> bool:
+        """Whether generation has finished (successfully or not)."""
+        return self._done.is_set()
+    
+    @property
+    def newsletter(self) -> Optional[Newsletter]:
+        """Final newsletter, once generation completed successfully."""
+        with self._lock:
+            return self._newsletter
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until generation finishes.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if generation finished within the timeout
+        """
+        return self._done.wait(timeout)
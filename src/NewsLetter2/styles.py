@@ -0,0 +1,125 @@
+# =============================================================================
+#  Filename: styles.py
+#
+#  Short Description: Shared CSS for the Streamlit UI and static HTML export
+#
+#  Creation date: 2025-10-12
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Stylesheets shared by the Streamlit app and the static HTML exporter.
+
+NEWSLETTER_CSS holds the newsletter classes used by both renderers;
+STATIC_PAGE_CSS adds the page layout that Streamlit otherwise provides.
+"""
+
+
+# Newsletter styling shared by the Streamlit UI and the static pages
+NEWSLETTER_CSS = """
+.main-header {
+    font-size: 3rem;
+    font-weight: bold;
+    color: #76B900;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+.sub-header {
+    font-size: 1.2rem;
+    color: #666;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.editorial-box {
+    padding: 1rem 0;
+    border-left: 5px solid #76B900;
+    padding-left: 1.5rem;
+    margin-bottom: 2rem;
+}
+.news-card {
+    padding: 1rem 0;
+    margin-bottom: 1rem;
+}
+.news-title {
+    font-size: 1.3rem;
+    font-weight: 600;
+    color: #1a1a1a;
+    margin-bottom: 0.5rem;
+}
+.news-source {
+    font-size: 0.9rem;
+    color: #76B900;
+    margin-bottom: 0.5rem;
+}
+.section-divider {
+    height: 2px;
+    background: linear-gradient(to right, #76B900, transparent);
+    margin: 2rem 0;
+}
+"""
+
+# Page layout for static HTML pages (Streamlit's own layout is not available)
+STATIC_PAGE_CSS = """
+body {
+    font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif;
+    color: #31333f;
+    line-height: 1.6;
+    margin: 0;
+}
+.page {
+    max-width: 1100px;
+    margin: 0 auto;
+    padding: 2rem 1.5rem 4rem;
+}
+a {
+    color: #4a7a00;
+}
+img {
+    width: 100%;
+    height: auto;
+    border-radius: 0.5rem;
+}
+details {
+    border: 1px solid #e6e6e6;
+    border-radius: 0.5rem;
+    padding: 0.5rem 1rem;
+    margin-bottom: 0.75rem;
+}
+summary {
+    cursor: pointer;
+    font-weight: 600;
+}
+.news-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
+    gap: 2rem;
+}
+.news-source,
+.caption {
+    font-size: 0.9rem;
+    color: #808495;
+}
+.button {
+    display: block;
+    text-align: center;
+    padding: 0.5rem 1rem;
+    border-radius: 0.5rem;
+    background: #76B900;
+    color: #fff;
+    text-decoration: none;
+    font-weight: 600;
+}
+.summary-box {
+    background: #e8f1fb;
+    border-radius: 0.5rem;
+    padding: 1rem;
+}
+.edition-list {
+    list-style: none;
+    padding: 0;
+}
+.edition-list li {
+    padding: 0.5rem 0;
+    border-bottom: 1px solid #eee;
+}
+"""
@@ -15,31 +15,77 @@ from NewsLetter2.agents import (
     create_reporter_agent,
     create_senior_editor_agent,
 )
+from NewsLetter2.json_utils import parse_model_list
+from NewsLetter2.models import (
+    ArticleSummary,
+    DetailedArticle,
+    DraftArticle,
+    Editorial,
+    NewsletterDraft,
+    ProcessedNewsArticle,
+    RawNewsArticle,
+    ShortSummary,
+    Topic,
+)
+from NewsLetter2.token_budget import (
+    EDITOR_INPUT_BUDGET,
+    SENIOR_EDITOR_INPUT_BUDGET,
+    fit_to_budget,
+    truncate_to_tokens,
+)
+from NewsLetter2.topics import DEFAULT_TOPIC, possessive
 
 
-def create_reporter_task(reporter_agent) -> Task:
+def create_reporter_task(
+    reporter_agent,
+    article_count: int = 10,
+    ids_only: bool = False,
+    topic: Topic = DEFAULT_TOPIC,
+) -> Task:
     """
-    Create task for Reporter agent to collect NVIDIA news.
+    Create task for Reporter agent to collect news on a topic.
+    
+    The search tool shows candidates by short id; URLs, thumbnails and
+    alternate sources are rejoined from the id afterwards, so the model never
+    copies them.
     
     Args:
         reporter_agent: The Reporter Agent instance
+        article_count: Number of articles to select, in order of significance
+        ids_only: Answer with the selected ids only (the staged pipeline
+            rejoins everything else); otherwise include the text fields the
+            Editor needs
+        topic: Newsletter topic (defaults to NVIDIA)
         
     Returns:
         Task configured for news collection via SerpAPI
     """
+    if ids_only:
+        answer = "Return only the ids of the selected candidates, exactly as shown by the tool."
+        expected_output = (
+            f'A JSON object {{"ids": [...]}} with exactly {article_count} candidate ids, '
+            "most significant first."
+        )
+    else:
+        answer = (
+            "Return the selected articles with their id (exactly as shown by the tool), "
+            "title, source, snippet, and published_date."
+        )
+        expected_output = (
+            f"A list of exactly {article_count} raw news articles about {topic.name}, each containing: "
+            "id, title, source, snippet, and published_date. "
+            "Output should be in JSON format."
+        )
+    
     task = Task(
         description=(
-            "Use the SerpAPI tool to search for the 10 latest NVIDIA-related news articles. "
-            "Focus on: AI developments, GPU technologies, enterprise adoption, partnerships, "
-            "product launches, market movements, and competitive positioning. "
-            "Return a structured list of articles with title, source, URL, snippet, "
-            "thumbnail, and publication date."
-        ),
-        expected_output=(
-            "A list of exactly 10 raw news articles about NVIDIA, each containing: "
-            "title, source, url, snippet, thumbnail (if available), and published_date. "
-            "Output should be in JSON format."
+            f"Use the SerpAPI tool to search for the latest {topic.name}-related news articles. "
+            "The tool returns a de-duplicated pool of candidates from several queries; "
+            f"select the {article_count} most significant, distinct stories from it, "
+            "ordered from most to least significant. "
+            f"Focus on: {topic.focus}. {answer}"
         ),
+        expected_output=expected_output,
         agent=reporter_agent,
     )
     
@@ -47,33 +93,34 @@ def create_reporter_task(reporter_agent) -> Task:
     return task
 
 
-def create_editor_task(editor_agent, reporter_task) -> Task:
+def create_editor_task(editor_agent, reporter_task, topic: Topic = DEFAULT_TOPIC) -> Task:
     """
     Create task for Editor agent to summarize news articles.
     
     Args:
         editor_agent: The Editor Agent instance
         reporter_task: The Reporter task (for dependency chain)
+        topic: Newsletter topic (defaults to NVIDIA)
         
     Returns:
         Task configured for article summarization and detailed writing
     """
     task = Task(
         description=(
-            "Review the 10 NVIDIA news articles provided by the Reporter. "
+            f"Review the 10 {topic.name} news articles provided by the Reporter. "
             "For each article, write: "
             "1. A short_summary: 2-3 compelling sentences capturing the essence, "
             "   written for AI/tech leaders and product managers. "
             "2. A detailed_article: 20-30 sentences providing in-depth analysis, "
             "   covering implications for AI adoption, enterprise strategy, product "
-            "   management, and NVIDIA's market influence. "
+            f"   management, and {possessive(topic.name)} market influence. "
             "Maintain a professional, insightful tone that resonates with business "
             "decision-makers."
         ),
         expected_output=(
-            "A list of 10 processed news articles, each with: title, source, url, "
-            "thumbnail, short_summary (2-3 sentences), detailed_article (20-30 sentences), "
-            "and published_date. Output in JSON format."
+            "A list of 10 processed news articles, each with: id (copied from the Reporter), "
+            "title, short_summary (2-3 sentences), and detailed_article (20-30 sentences). "
+            "Output in JSON format."
         ),
         agent=editor_agent,
         context=[reporter_task],
@@ -83,42 +130,285 @@ def create_editor_task(editor_agent, reporter_task) -> Task:
     return task
 
 
-def create_senior_editor_task(senior_editor_agent, editor_task) -> Task:
+def create_senior_editor_task(senior_editor_agent, editor_task, topic: Topic = DEFAULT_TOPIC) -> Task:
     """
     Create task for Senior Editor to validate and write editorial.
     
+    The Senior Editor does not copy the Editor's articles back out. When the
+    Editor task finishes, a digest of its articles (trimmed to the stage
+    budget) is filled into this task's description, and the Senior Editor
+    answers with the editorial and the ids of the articles to publish. The
+    articles are joined in code by crew.assemble_newsletter.
+    
     Args:
         senior_editor_agent: The Senior Editor Agent instance
         editor_task: The Editor task (for dependency chain)
+        topic: Newsletter topic (defaults to NVIDIA)
         
     Returns:
         Task configured for validation, editorial writing, and trend analysis
     """
     task = Task(
-        description=(
-            "1. Verify the accuracy and coherence of all 10 summarized articles from the Editor. "
-            "2. Write an 800-1000 word front-page editorial with the following sections: "
-            "   - headline: Compelling title for the editorial "
-            "   - narrative: Clear story about NVIDIA's current position in AI landscape "
-            "   - trend_analysis: Patterns and themes across the 10 news stories "
-            "   - product_leader_insights: Actionable recommendations for enterprise adoption, "
-            "     product strategy, and market timing "
-            "   - competition_analysis: Comparison of NVIDIA with AMD, Intel, and hyperscalers "
-            "     (AWS, Azure, GCP) in terms of technology, market position, and strategy. "
-            "Tone should be authoritative, strategic, and forward-looking."
-        ),
+        description=_editorial_description(10, "(provided by the Editor)", topic, select_count=10),
         expected_output=(
-            "A complete Newsletter object in JSON format containing: "
+            "An editorial and article selection in JSON format containing: "
             "1. editorial: {headline, narrative, trend_analysis, product_leader_insights, "
-            "   competition_analysis, image_url, created_at} "
-            "2. articles: list of 10 validated ProcessedNewsArticle objects "
-            "3. generated_at: timestamp "
-            "4. edition_number: optional edition number"
+            "   competition_analysis, image_url} "
+            "2. article_ids: ids (shown in brackets) of the 10 articles to publish, "
+            "   in reading order"
         ),
         agent=senior_editor_agent,
-        context=[editor_task],
-        output_file="newsletter_output.json",
+        # The digest below replaces the Editor's full output as context
+        context=[],
+        output_pydantic=NewsletterDraft,
     )
     
+    def _digest_editor_output(output) -> None:
+        articles = parse_model_list(output.raw, DraftArticle)
+        headers = [
+            f"[{article.id}] {article.title}\n"
+            f"Summary: {article.short_summary}\n"
+            for article in articles
+        ]
+        digest = _budgeted_digest(headers, [article.detailed_article for article in articles], "Analysis")
+        task.description = _editorial_description(len(articles), digest, topic, select_count=10)
+    
+    # Runs when the Editor task finishes, before this task starts
+    editor_task.callback = _digest_editor_output
+    
     logger.info("Senior Editor task created")
     return task
+
+
+def create_article_editor_task(editor_agent, article: RawNewsArticle) -> Task:
+    """
+    Create task for Editor agent to summarize a single news article.
+    
+    Used by the parallel Editor pipeline, where every article gets its own
+    independent task so the summaries can be written concurrently. The
+    prompt does not name a topic: summaries are reused by URL across all
+    newsletters that cover the article.
+    
+    Args:
+        editor_agent: The Editor Agent instance
+        article: Raw article collected by the Reporter
+        
+    Returns:
+        Task producing an ArticleSummary for the given article
+    """
+    task = Task(
+        description=(
+            "Review the following news article and write: "
+            "1. A short_summary: 2-3 compelling sentences capturing the essence, "
+            "   written for AI/tech leaders and product managers. "
+            "2. A detailed_article: 20-30 sentences providing in-depth analysis, "
+            "   covering implications for AI adoption, enterprise strategy, product "
+            "   management, and the market position of the companies involved. "
+            "Maintain a professional, insightful tone that resonates with business "
+            "decision-makers.\n\n"
+            f"{_article_context(article)}"
+        ),
+        expected_output=(
+            "A JSON object with: short_summary (2-3 sentences) and "
+            "detailed_article (20-30 sentences)."
+        ),
+        agent=editor_agent,
+        output_pydantic=ArticleSummary,
+    )
+    
+    logger.info(f"Article editor task created: {article.title[:60]}")
+    return task
+
+
+def _article_context(article: RawNewsArticle) -> str:
+    """Return the article details given to the Editor."""
+    return (
+        f"Title: {article.title}\n"
+        f"Source: {article.source}\n"
+        f"Published: {article.published_date or 'unknown'}\n"
+        f"Snippet: {truncate_to_tokens(article.snippet, EDITOR_INPUT_BUDGET)}"
+    )
+
+
+def create_short_summary_task(editor_agent, article: RawNewsArticle) -> Task:
+    """
+    Create task for Editor agent to write only the short summary of an article.
+    
+    First pass of the pipelined Editor stage: the short summaries of all
+    articles are all the editorial needs, so it can start before the
+    detailed articles are written.
+    
+    Args:
+        editor_agent: The Editor Agent instance
+        article: Raw article collected by the Reporter
+        
+    Returns:
+        Task producing a ShortSummary for the given article
+    """
+    task = Task(
+        description=(
+            "Review the following news article and write a short_summary: 2-3 "
+            "compelling sentences capturing the essence, written for AI/tech "
+            "leaders and product managers.\n\n"
+            f"{_article_context(article)}"
+        ),
+        expected_output="A JSON object with: short_summary (2-3 sentences).",
+        agent=editor_agent,
+        output_pydantic=ShortSummary,
+    )
+    
+    logger.info(f"Short summary task created: {article.title[:60]}")
+    return task
+
+
+def create_detailed_article_task(editor_agent, article: RawNewsArticle, short_summary: str) -> Task:
+    """
+    Create task for Editor agent to write the detailed article of an article.
+    
+    Second pass of the pipelined Editor stage, run while the editorial is
+    being written. The short summary of the first pass is included so the
+    two texts agree.
+    
+    Args:
+        editor_agent: The Editor Agent instance
+        article: Raw article collected by the Reporter
+        short_summary: Short summary written in the first pass
+        
+    Returns:
+        Task producing a DetailedArticle for the given article
+    """
+    task = Task(
+        description=(
+            "Review the following news article and write a detailed_article: "
+            "20-30 sentences providing in-depth analysis, covering implications for "
+            "AI adoption, enterprise strategy, product management, and the market "
+            "position of the companies involved. Maintain a professional, insightful "
+            "tone that resonates with business decision-makers, consistent with the "
+            "short summary.\n\n"
+            f"{_article_context(article)}\n"
+            f"Short summary: {short_summary}"
+        ),
+        expected_output="A JSON object with: detailed_article (20-30 sentences).",
+        agent=editor_agent,
+        output_pydantic=DetailedArticle,
+    )
+    
+    logger.info(f"Detailed article task created: {article.title[:60]}")
+    return task
+
+
+def _editorial_description(
+    article_count: int,
+    article_digest: str,
+    topic: Topic,
+    select_count: int = 0,
+) -> str:
+    """Return the Senior Editor's instructions over an article digest."""
+    selection = (
+        f" 3. Choose the {select_count} articles to publish and list their ids "
+        "(shown in brackets) in reading order.\n\n"
+        if select_count
+        else "\n\n"
+    )
+    return (
+        f"1. Verify the accuracy and coherence of the {article_count} summarized "
+        "articles below. "
+        "2. Write an 800-1000 word front-page editorial with the following sections: "
+        "   - headline: Compelling title for the editorial "
+        f"   - narrative: Clear story about {possessive(topic.name)} current position in AI landscape "
+        "   - trend_analysis: Patterns and themes across the news stories "
+        "   - product_leader_insights: Actionable recommendations for enterprise adoption, "
+        "     product strategy, and market timing "
+        f"   - competition_analysis: Comparison of {topic.name} with {topic.competitors} "
+        "     in terms of technology, market position, and strategy. "
+        "Tone should be authoritative, strategic, and forward-looking."
+        f"{selection}"
+        f"Articles:\n{article_digest}"
+    )
+
+
+def _budgeted_digest(headers: list[str], texts: list[str], label: str) -> str:
+    """Join article headers with their texts, trimmed evenly to the Senior Editor budget."""
+    kept, texts = fit_to_budget(headers, texts, SENIOR_EDITOR_INPUT_BUDGET, stage="senior editor")
+    return "\n\n".join(
+        header + (f"{label}: {text}" if text else "")
+        for header, text in zip(headers[:kept], texts)
+    )
+
+
+def _editorial_task(senior_editor_agent, article_count: int, article_digest: str, topic: Topic) -> Task:
+    """Create the Senior Editor's editorial task over an article digest."""
+    task = Task(
+        description=_editorial_description(article_count, article_digest, topic),
+        expected_output=(
+            "An Editorial object in JSON format containing: headline, narrative, "
+            "trend_analysis, product_leader_insights, competition_analysis, image_url."
+        ),
+        agent=senior_editor_agent,
+        output_pydantic=Editorial,
+    )
+    
+    logger.info("Editorial task created")
+    return task
+
+
+def create_editorial_task(
+    senior_editor_agent,
+    articles: list[ProcessedNewsArticle],
+    topic: Topic = DEFAULT_TOPIC,
+) -> Task:
+    """
+    Create task for Senior Editor to write the editorial from finished articles.
+    
+    Used by the parallel Editor pipeline: the articles are already validated
+    objects, so only the Editorial is requested and the Newsletter is
+    assembled in code.
+    
+    Args:
+        senior_editor_agent: The Senior Editor Agent instance
+        articles: Processed articles produced by the Editor fan-out
+        topic: Newsletter topic (defaults to NVIDIA)
+        
+    Returns:
+        Task producing a structured Editorial
+    """
+    # Analyses are trimmed evenly when the articles exceed the stage budget
+    headers = [
+        f"[{idx}] {article.title} ({article.source})\n"
+        f"Summary: {article.short_summary}\n"
+        for idx, article in enumerate(articles, start=1)
+    ]
+    article_digest = _budgeted_digest(headers, [article.detailed_article for article in articles], "Analysis")
+    return _editorial_task(senior_editor_agent, len(articles), article_digest, topic)
+
+
+def create_summary_editorial_task(
+    senior_editor_agent,
+    articles: list[RawNewsArticle],
+    short_summaries: list[str],
+    topic: Topic = DEFAULT_TOPIC,
+) -> Task:
+    """
+    Create task for Senior Editor to write the editorial from short summaries.
+    
+    Used by the pipelined mode, where the editorial is written while the
+    detailed articles are still in progress. The Reporter's snippets stand
+    in for the detailed analyses.
+    
+    Args:
+        senior_editor_agent: The Senior Editor Agent instance
+        articles: Raw articles from the Reporter stage
+        short_summaries: Short summary of each article, in the same order
+        topic: Newsletter topic (defaults to NVIDIA)
+        
+    Returns:
+        Task producing a structured Editorial
+    """
+    # Snippets are trimmed evenly when the articles exceed the stage budget
+    headers = [
+        f"[{idx}] {article.title} ({article.source})\n"
+        f"Summary: {summary}\n"
+        for idx, (article, summary) in enumerate(zip(articles, short_summaries), start=1)
+    ]
+    article_digest = _budgeted_digest(headers, [article.snippet for article in articles], "Snippet")
+    return _editorial_task(senior_editor_agent, len(articles), article_digest, topic)
@@ -0,0 +1,260 @@
+# =============================================================================
+#  Filename: thumbnails.py
+#
+#  Short Description: Local, resized thumbnail cache for article images
+#
+#  Creation date: 2025-10-11
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Thumbnail proxy cache.
+
+Article thumbnails are downloaded once at generation time (concurrently,
+over the shared keep-alive session of NewsLetter2.http_pool),
+cropped and resized to card dimensions, and stored as content-addressed JPEG
+files under cache/thumbnails/. A manifest maps each source URL to its file,
+so the UI serves images from local disk and page renders never wait on
+third-party image hosts. The manifest is shared by every process using the
+directory: saves merge the entries on disk, and lookups re-read it when
+another process has changed it. Images that were never fetched are shown
+from their source URL.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+import requests
+from loguru import logger
+from PIL import Image, ImageOps
+
+from NewsLetter2.http_pool import http_pool
+from NewsLetter2.models import Newsletter
+
+
+# Directory holding resized thumbnails and their manifest
+THUMBNAIL_DIR = os.getenv("NEWSLETTER_THUMBNAIL_DIR", "cache/thumbnails")
+
+# Card dimensions thumbnails are cropped and resized to
+THUMBNAIL_WIDTH = int(os.getenv("NEWSLETTER_THUMBNAIL_WIDTH", "640"))
+THUMBNAIL_HEIGHT = int(os.getenv("NEWSLETTER_THUMBNAIL_HEIGHT", "360"))
+
+# Maximum number of concurrent downloads and per-download timeout (seconds)
+THUMBNAIL_CONCURRENCY = int(os.getenv("NEWSLETTER_THUMBNAIL_CONCURRENCY", "8"))
+THUMBNAIL_TIMEOUT = float(os.getenv("NEWSLETTER_THUMBNAIL_TIMEOUT", "5"))
+
+# Images larger than this are not downloaded
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+_MANIFEST_FILE = "manifest.json"
+
+_JPEG_QUALITY = 85
+
+
+class ThumbnailCache:
+    """Content-addressed store of resized thumbnails, keyed by source URL."""
+    
+    def __init__(
+        self,
+        cache_dir: str = THUMBNAIL_DIR,
+        size: tuple[int, int] = (THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT),
+    ):
+        """
+        Initialize thumbnail cache.
+        
+        Args:
+            cache_dir: Directory for thumbnail files and the manifest
+            size: (width, height) thumbnails are resized to
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.size = size
+        
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._manifest: dict[str, str] = {}
+        self._manifest_mtime: Optional[int] = None
+        self._refresh_manifest()
+        
+        logger.info(f"Thumbnail cache initialized with directory: {self.cache_dir}")
+    
+    def _refresh_manifest(self) -> None:
+        """Merge in the manifest on disk if it changed since it was last read."""
+        manifest_path = self.cache_dir / _MANIFEST_FILE
+        try:
+            mtime = manifest_path.stat().st_mtime_ns
+            with self._lock:
+                if mtime == self._manifest_mtime:
+                    return
+            on_disk = json.loads(manifest_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable thumbnail manifest: {e}")
+            return
+        
+        with self._lock:
+            self._manifest = {**on_disk, **self._manifest}
+            self._manifest_mtime = mtime
+    
+    def _save_manifest(self) -> None:
+        """Atomically write the URL-to-file manifest, merged with the one on disk."""
+        manifest_path = self.cache_dir / _MANIFEST_FILE
+        tmp_path = manifest_path.with_name(f"{_MANIFEST_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._save_lock:
+            self._refresh_manifest()
+            with self._lock:
+                content = json.dumps(self._manifest, indent=2, sort_keys=True)
+            try:
+                tmp_path.write_text(content)
+                os.replace(tmp_path, manifest_path)
+                mtime = manifest_path.stat().st_mtime_ns
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                self._manifest_mtime = mtime
+    
+    def local_path(self, url: Optional[str]) -> Optional[Path]:
+        """
+        Return the local thumbnail file for a source URL.
+        
+        Args:
+            url: Thumbnail URL of an article
+        
+        Returns:
+            Path of the resized thumbnail, or None if it was never downloaded
+        """
+        if not url:
+            return None
+        with self._lock:
+            filename = self._manifest.get(str(url))
+        if filename is None:
+            # Another process may have fetched it since the manifest was read
+            self._refresh_manifest()
+            with self._lock:
+                filename = self._manifest.get(str(url))
+        if filename is None:
+            return None
+        path = self.cache_dir / filename
+        return path if path.exists() else None
+    
+    def image_source(self, url: Optional[str]) -> Optional[str]:
+        """
+        Return where an article image is displayed from.
+        
+        Args:
+            url: Thumbnail URL of an article
+        
+        Returns:
+            Path of the local thumbnail, the source URL itself for images that
+            were never fetched, or None if the article has no image
+        """
+        local = self.local_path(url)
+        if local is not None:
+            return str(local)
+        return str(url) if url else None
+    
+    def _resize(self, content: bytes) -> bytes:
+        """
+        Crop and resize an image to the card dimensions.
+        
+        Args:
+            content: Original image bytes
+        
+        Returns:
+            JPEG bytes of the resized thumbnail
+        """
+        with Image.open(io.BytesIO(content)) as image:
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            thumbnail = ImageOps.fit(image, self.size, Image.Resampling.LANCZOS)
+        
+        output = io.BytesIO()
+        thumbnail.save(output, format="JPEG", quality=_JPEG_QUALITY, optimize=True)
+        return output.getvalue()
+    
+    def fetch(self, url: str, session: Optional[requests.Session] = None) -> Optional[Path]:
+        """
+        Download, resize and store one thumbnail (no-op if already cached).
+        
+        Args:
+            url: Thumbnail URL
+            session: HTTP session to download with (defaults to the shared
+                pooled session)
+        
+        Returns:
+            Path of the local thumbnail, or None if the download failed
+        """
+        existing = self.local_path(url)
+        if existing is not None:
+            return existing
+        
+        try:
+            response = (session or http_pool.session()).get(
+                url,
+                timeout=THUMBNAIL_TIMEOUT,
+                headers={"User-Agent": "NewsLetter2 thumbnail fetcher"},
+            )
+            response.raise_for_status()
+            if len(response.content) > MAX_IMAGE_BYTES:
+                raise ValueError(f"image larger than {MAX_IMAGE_BYTES} bytes")
+            thumbnail = self._resize(response.content)
+        except Exception as e:
+            logger.warning(f"Could not fetch thumbnail {url}: {e}")
+            return None
+        
+        # Content-addressed: identical images from different URLs share a file
+        filename = f"{hashlib.sha256(thumbnail).hexdigest()}.jpg"
+        path = self.cache_dir / filename
+        if not path.exists():
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(thumbnail)
+            os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._manifest[str(url)] = filename
+        return path
+    
+    def fetch_all(self, urls: Iterable[Optional[str]]) -> int:
+        """
+        Download all missing thumbnails concurrently.
+        
+        Args:
+            urls: Thumbnail URLs (None entries are skipped)
+        
+        Returns:
+            Number of thumbnails available locally afterwards
+        """
+        unique = list(dict.fromkeys(str(url) for url in urls if url))
+        if not unique:
+            return 0
+        
+        workers = max(1, min(THUMBNAIL_CONCURRENCY, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(self.fetch, unique))
+        
+        self._save_manifest()
+        available = sum(path is not None for path in paths)
+        logger.info(f"Thumbnails cached locally: {available}/{len(unique)}")
+        return available
+    
+    def cache_newsletter(self, newsletter: Newsletter) -> int:
+        """
+        Download the thumbnails of every article in a newsletter.
+        
+        Args:
+            newsletter: Newsletter whose article thumbnails are cached
+        
+        Returns:
+            Number of thumbnails available locally
+        """
+        return self.fetch_all(article.thumbnail for article in newsletter.articles)
+
+
+# Global thumbnail cache instance
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,166 @@
+# =============================================================================
+#  Filename: token_budget.py
+#
+#  Short Description: Tokenizer-aware counting and per-stage input budgets
+#
+#  Creation date: 2025-10-14
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Token budgeting for the text handed to each pipeline stage.
+
+Tokens are counted with the model's tiktoken encoding (falling back to a
+characters-per-token estimate when the encoding is unavailable). Inputs
+that exceed a stage budget are shrunk by trimming their expandable parts
+(snippets, detailed analyses) evenly, so every item keeps its identifying
+part and the budget is shared fairly between items.
+"""
+
+import os
+import threading
+from typing import Any
+
+from loguru import logger
+
+
+# Model whose tokenizer is used for counting
+TOKENIZER_MODEL = os.getenv("NEWSLETTER_TOKENIZER_MODEL", "gpt-4o-mini")
+
+# Per-stage input budgets in tokens (0 disables a budget)
+TOOL_OUTPUT_BUDGET = int(os.getenv("NEWSLETTER_BUDGET_TOOL_OUTPUT", "2500"))
+EDITOR_INPUT_BUDGET = int(os.getenv("NEWSLETTER_BUDGET_EDITOR_INPUT", "300"))
+SENIOR_EDITOR_INPUT_BUDGET = int(os.getenv("NEWSLETTER_BUDGET_SENIOR_EDITOR_INPUT", "6000"))
+
+# Estimate used when no tokenizer is available
+_CHARS_PER_TOKEN = 4
+
+# Expandable parts trimmed below this many tokens are dropped entirely
+_MIN_EXPANDABLE_TOKENS = 12
+
+_ELLIPSIS = "…"
+
+_encoding: Any = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding() -> Any:
+    """Load the tokenizer once; False when it cannot be loaded."""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                
+                _encoding = tiktoken.encoding_for_model(TOKENIZER_MODEL)
+            except Exception as e:
+                logger.warning(f"Tokenizer unavailable ({e}), estimating token counts")
+                _encoding = False
+        return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text with the model tokenizer.
+    
+    Args:
+        text: Text to count
+    
+    Returns:
+        Number of tokens (estimated if no tokenizer is available)
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, len(text) // _CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shorten a text to at most max_tokens tokens, cutting at a word boundary.
+    
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit (0 or less returns an empty string)
+    
+    Returns:
+        The text itself if it fits, otherwise a prefix ending with an ellipsis
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    
+    encoding = _get_encoding()
+    if encoding:
+        prefix = encoding.decode(encoding.encode(text, disallowed_special=())[: max_tokens - 1])
+    else:
+        prefix = text[: (max_tokens - 1) * _CHARS_PER_TOKEN]
+    
+    # Drop the partial last word
+    if " " in prefix:
+        prefix = prefix.rsplit(" ", 1)[0]
+    return prefix.rstrip(" ,;:.") + _ELLIPSIS
+
+
+def fit_to_budget(
+    fixed: list[str],
+    expandable: list[str],
+    budget: int,
+    stage: str = "",
+) -> tuple[int, list[str]]:
+    """
+    Trim the expandable parts of items so that all items fit in a budget.
+    
+    Each item consists of a fixed part that is always kept (e.g. id and
+    title) and an expandable part (e.g. snippet or analysis). The tokens left
+    after the fixed parts are shared by water-filling: short expandable parts
+    are kept whole and the remainder is split evenly among the longer ones.
+    If the fixed parts alone exceed the budget, trailing items are dropped.
+    
+    Args:
+        fixed: Fixed part of each item, in priority order
+        expandable: Expandable part of each item
+        budget: Total token budget (0 disables budgeting)
+        stage: Stage name used in the log message
+    
+    Returns:
+        Number of items kept, and the (possibly trimmed) expandable parts of
+        the kept items
+    """
+    if budget <= 0:
+        return len(fixed), list(expandable)
+    
+    fixed_tokens = [count_tokens(text) for text in fixed]
+    kept = len(fixed)
+    while kept and sum(fixed_tokens[:kept]) > budget:
+        kept -= 1
+    
+    sizes = [count_tokens(text) for text in expandable[:kept]]
+    remaining = budget - sum(fixed_tokens[:kept])
+    total = sum(fixed_tokens) + sum(count_tokens(text) for text in expandable)
+    if sum(sizes) <= remaining and kept == len(fixed):
+        return kept, list(expandable)
+    
+    # Water-filling: the smallest parts are kept whole while they fit in an
+    # even share of what is left
+    limits = [0] * kept
+    order = sorted(range(kept), key=lambda idx: sizes[idx])
+    for position, idx in enumerate(order):
+        share = remaining // (kept - position)
+        limits[idx] = min(sizes[idx], share)
+        remaining -= limits[idx]
+    
+    trimmed = [
+        text if limit >= size else (truncate_to_tokens(text, limit) if limit >= _MIN_EXPANDABLE_TOKENS else "")
+        for text, size, limit in zip(expandable, sizes, limits)
+    ]
+    
+    logger.info(
+        f"Token budget{f' ({stage})' if stage else ''}: input of ~{total} tokens "
+        f"trimmed to {budget}, {kept}/{len(fixed)} items kept"
+    )
+    return kept, trimmed
+
@@ -7,64 +7,457 @@
 #  Author: Shrinivas Deshpande
 # =============================================================================
 
+import hashlib
 import os
-from typing import Any
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from typing import Any, Iterator, Optional
 
 from crewai.tools import tool
 from loguru import logger
 from serpapi import GoogleSearch
 
+from NewsLetter2.dedup import collapse_near_duplicate_dicts
+from NewsLetter2.http_pool import http_pool
+from NewsLetter2.metrics import metrics
+from NewsLetter2.models import Topic
+from NewsLetter2.resilience import RETRY_STATUSES, ServiceError, parse_retry_after, serpapi_service
+from NewsLetter2.search_cache import search_cache
+from NewsLetter2.token_budget import TOOL_OUTPUT_BUDGET, count_tokens, fit_to_budget
+from NewsLetter2.topics import DEFAULT_TOPIC
+from NewsLetter2.url_utils import canonicalize_url
 
-@tool("Search Latest NVIDIA AI News")
-def search_nvidia_news(query: str = "NVIDIA AI GPU technology news") -> list[dict[str, Any]]:
+
+# Maximum number of de-duplicated candidates handed to the Reporter
+CANDIDATE_POOL_SIZE = int(os.getenv("NEWSLETTER_SEARCH_POOL_SIZE", "30"))
+
+# Maximum number of SerpAPI requests in flight at once
+SEARCH_CONCURRENCY = int(os.getenv("NEWSLETTER_SEARCH_CONCURRENCY", "8"))
+
+# Seconds before a SerpAPI request is abandoned (and retried)
+SEARCH_TIMEOUT = float(os.getenv("NEWSLETTER_SEARCH_TIMEOUT", "30"))
+
+# Days of news (ending on the edition date) searched for a backfilled edition
+BACKFILL_WINDOW_DAYS = int(os.getenv("NEWSLETTER_BACKFILL_WINDOW_DAYS", "2"))
+
+# Publication window applied to searches while a past edition is generated
+_search_window: ContextVar[Optional[tuple[datetime, datetime]]] = ContextVar(
+    "search_window", default=None
+)
+
+# Candidates remembered outside a candidate_scope() (e.g. direct tool calls)
+_CANDIDATE_REGISTRY_SIZE = 1024
+
+# Hex digits of a candidate id; lengthened in steps of two on a collision
+_CANDIDATE_ID_LENGTH = 6
+
+# Search tool of each topic, created on first use
+_search_tools: dict[str, Any] = {}
+_search_tools_lock = threading.Lock()
+
+
+class CandidateRegistry:
+    """Candidate records shown to the model, keyed by their short ids."""
+    
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Initialize candidate registry.
+        
+        Args:
+            max_size: Maximum number of candidates kept, oldest dropped first
+                (None keeps all of them)
+        """
+        self.max_size = max_size
+        self._articles: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, article: dict[str, Any]) -> str:
+        """
+        Remember a candidate record and return its id.
+        
+        The id is the start of the SHA-1 of the canonical URL. When it is
+        already taken by another URL, a longer prefix is used, so an id
+        never resolves to the wrong article.
+        
+        Args:
+            article: Raw article dictionary
+        
+        Returns:
+            Id of the article, the same for every registration of its URL
+        """
+        canonical = canonicalize_url(article["url"])
+        with self._lock:
+            article_id = self._ids.get(canonical)
+            if article_id is None:
+                digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+                length = _CANDIDATE_ID_LENGTH
+                while digest[:length] in self._articles:
+                    length += 2
+                if length > _CANDIDATE_ID_LENGTH:
+                    logger.warning(f"Candidate id collision, using {digest[:length]} for {canonical}")
+                article_id = digest[:length]
+                self._ids[canonical] = article_id
+            
+            self._articles[article_id] = article
+            self._articles.move_to_end(article_id)
+            while self.max_size is not None and len(self._articles) > self.max_size:
+                _, old = self._articles.popitem(last=False)
+                self._ids.pop(canonicalize_url(old["url"]), None)
+        return article_id
+    
+    def resolve(self, article_id: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a candidate record by id.
+        
+        Args:
+            article_id: Id the model referred to
+        
+        Returns:
+            Raw article dictionary, or None if the id is unknown
+        """
+        with self._lock:
+            return self._articles.get(article_id)
+    
+    def records(self) -> list[dict[str, Any]]:
+        """Return the registered candidate records, oldest registration first."""
+        with self._lock:
+            return list(self._articles.values())
+    
+    def __len__(self) -> int:
+        """Return the number of registered candidates."""
+        with self._lock:
+            return len(self._articles)
+
+
+# Candidate registry of the running generation (see candidate_scope)
+_candidate_registry: ContextVar[Optional[CandidateRegistry]] = ContextVar(
+    "candidate_registry", default=None
+)
+
+# Global fallback candidate registry instance for calls outside a scope
+_default_candidates = CandidateRegistry(max_size=_CANDIDATE_REGISTRY_SIZE)
+
+
+@contextmanager
+def candidate_scope() -> Iterator[CandidateRegistry]:
+    """
+    Give the generation running in this context its own candidate registry.
+    
+    Ids registered by the search tool stay resolvable until the scope ends,
+    however many candidates other generations register meanwhile.
+    
+    Yields:
+        Registry of the scope
     """
-    Searches for the 10 latest NVIDIA AI and technology-related news articles.
-    Focus areas: GPUs, AI platforms, enterprise adoption, partnerships,
-    product launches, and financial/market impact.
+    registry = CandidateRegistry()
+    token = _candidate_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _candidate_registry.reset(token)
+
+
+def _current_candidates() -> CandidateRegistry:
+    """Return the registry of the active scope, or the process-wide one."""
+    registry = _candidate_registry.get()
+    return _default_candidates if registry is None else registry
+
+
+@contextmanager
+def search_window(edition_date: datetime, days: int = BACKFILL_WINDOW_DAYS) -> Iterator[None]:
+    """
+    Restrict searches in this context to news published before an edition date.
+    
+    Used when generating past editions: every query gets Google's after:/before:
+    operators, so the Reporter sees the news of those days instead of today's.
     
     Args:
-        query: Search query (default focuses on NVIDIA AI/GPU news)
-        
+        edition_date: Date of the edition being generated
+        days: Number of days of news (ending on edition_date) to search
+    """
+    day = edition_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    token = _search_window.set((day - timedelta(days=max(1, days) - 1), day))
+    try:
+        yield
+    finally:
+        _search_window.reset(token)
+
+
+def _windowed_query(query: str) -> str:
+    """Append the active search window, if any, to a query."""
+    window = _search_window.get()
+    if window is None:
+        return query
+    start, end = window
+    # Both operators exclude the day they name
+    before = end + timedelta(days=1)
+    after = start - timedelta(days=1)
+    return f"{query} after:{after:%Y-%m-%d} before:{before:%Y-%m-%d}"
+
+
+def _fetch_news_results(query: str, api_key: str) -> list[dict[str, Any]]:
+    """
+    Run one Google News query through SerpAPI (via the search cache).
+    
+    Args:
+        query: Search query
+        api_key: SerpAPI key
+    
     Returns:
-        List of up to 10 raw news articles with title, source, URL, snippet,
-        thumbnail, and publication date
+        Raw news_results items for the query
     """
-    api_key = os.getenv("SERP_API_KEY", "")
+    params = {
+        "engine": "google_news",
+        "q": query,
+        "api_key": api_key,
+        "num": 10,
+        "gl": "us",
+        "hl": "en",
+    }
     
-    if not api_key:
-        logger.error("SERP_API_KEY not found in environment")
-        raise ValueError("SERP_API_KEY environment variable is required")
+    def _send() -> dict[str, Any]:
+        # GoogleSearch only builds the request; the pooled session sends it
+        url, query_params = GoogleSearch({**params, "output": "json"}).construct_url()
+        http_response = http_pool.session().get(url, params=query_params, timeout=SEARCH_TIMEOUT)
+        if http_response.status_code in RETRY_STATUSES:
+            raise ServiceError(
+                "SerpAPI",
+                http_response.status_code,
+                parse_retry_after(http_response.headers.get("Retry-After")),
+            )
+        return http_response.json()
     
-    try:
-        params = {
-            "engine": "google_news",
-            "q": query,
-            "api_key": api_key,
-            "num": 10,
-            "gl": "us",
-            "hl": "en",
-        }
-        
-        search = GoogleSearch(params)
-        results = search.get_dict()
+    def _request() -> dict[str, Any]:
+        # Only actual SerpAPI round trips are timed; cache hits skip this
+        with metrics.span("serpapi_request", attributes={"query": query}) as span:
+            response = serpapi_service.call(_send, span=span)
+            if "error" in response:
+                span.status = "error"
+                span.error = str(response["error"])
+            return response
+    
+    # Served from the search cache when an identical query ran recently
+    results = search_cache.get_or_fetch(params, _request)
+    
+    if "error" in results:
+        logger.warning(f"SerpAPI error for query '{query}': {results['error']}")
+    
+    return results.get("news_results", [])[:10]
+
+
+def _to_article(item: dict[str, Any]) -> dict[str, Any]:
+    """Convert a SerpAPI news item into the raw article dictionary format."""
+    return {
+        "title": item.get("title", ""),
+        "source": item.get("source", {}).get("name", "Unknown Source"),
+        "url": item.get("link", ""),
+        "snippet": item.get("snippet", ""),
+        "thumbnail": item.get("thumbnail"),
+        "published_date": item.get("date"),
+    }
+
+
+def register_candidates(articles: list[dict[str, Any]]) -> list[str]:
+    """
+    Remember full candidate records so the model can refer to them by id.
+    
+    Args:
+        articles: Raw article dictionaries
+    
+    Returns:
+        Id of each article
+    """
+    registry = _current_candidates()
+    return [registry.register(article) for article in articles]
+
+
+def resolve_candidate(item: Any) -> Optional[dict[str, Any]]:
+    """
+    Rejoin a Reporter selection with the full candidate record.
+    
+    Args:
+        item: Candidate id, or a dictionary with an "id" key (other keys
+            are kept) or a complete article dictionary
+    
+    Returns:
+        Raw article dictionary, or None if the id is unknown
+    """
+    if isinstance(item, str):
+        item = {"id": item}
+    if not isinstance(item, dict):
+        return None
+    
+    article_id = str(item.get("id", "")).strip()
+    if not article_id:
+        return item if item.get("url") else None
+    
+    candidate = _current_candidates().resolve(article_id)
+    if candidate is None:
+        logger.warning(f"Unknown candidate id from the model: {article_id}")
+        return None
+    
+    # Model-written text fields never override the original record
+    extra = {k: v for k, v in item.items() if k != "id" and k not in candidate}
+    return {**candidate, **extra}
+
+
+def candidate_pool() -> list[dict[str, Any]]:
+    """
+    Return the candidates shown to the model in the current scope.
+    
+    Returns:
+        Raw article dictionaries in the order the search tool ranked them
+    """
+    return _current_candidates().records()
+
+
+def encode_candidates(articles: list[dict[str, Any]], budget: int = TOOL_OUTPUT_BUDGET) -> str:
+    """
+    Encode candidates as a compact table for the model.
+    
+    Only the fields the Reporter needs to rank stories are included; URLs
+    and thumbnails are replaced by short ids that are rejoined afterwards.
+    Snippets are trimmed to keep the table within the token budget.
+    
+    Args:
+        articles: Raw article dictionaries in rank order
+        budget: Token budget of the encoded table (0 disables it)
+    
+    Returns:
+        One "id|source|date|title|snippet" line per candidate
+    """
+    ids = register_candidates(articles)
+    
+    def _clean(text: Any) -> str:
+        return " ".join(str(text or "").replace("|", "/").split())
+    
+    fixed = [
+        f"{article_id}|{_clean(a.get('source'))}|{_clean(a.get('published_date'))}|{_clean(a.get('title'))}|"
+        for article_id, a in zip(ids, articles)
+    ]
+    snippets = [_clean(a.get("snippet")) for a in articles]
+    header = "id|source|date|title|snippet"
+    
+    kept, snippets = fit_to_budget(
+        fixed, snippets, budget - count_tokens(header) if budget else 0, stage="tool output"
+    )
+    return "\n".join([header, *(f + snippet for f, snippet in zip(fixed[:kept], snippets))])
+
+
+def search_news_pool(
+    queries: list[str],
+    api_key: str,
+    pool_size: int = CANDIDATE_POOL_SIZE,
+) -> list[dict[str, Any]]:
+    """
+    Run several queries concurrently and merge them into one candidate pool.
+    
+    Results are interleaved by rank (first hit of every query, then second
+    hits, ...), de-duplicated on their canonical URL, and syndicated copies
+    of the same story are collapsed, so the pool favours the top distinct
+    stories of each query.
+    
+    Args:
+        queries: Search queries to issue
+        api_key: SerpAPI key
+        pool_size: Maximum number of candidates to return
+    
+    Returns:
+        De-duplicated list of raw article dictionaries
+    """
+    # Resolved here: the context is not inherited by the worker threads
+    queries = [_windowed_query(query) for query in queries]
+    
+    workers = max(1, min(SEARCH_CONCURRENCY, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        per_query = list(executor.map(lambda q: _fetch_news_results(q, api_key), queries))
+    
+    articles: list[dict[str, Any]] = []
+    seen_urls: set[str] = set()
+    for ranked_items in zip_longest(*per_query):
+        for item in ranked_items:
+            if item is None or not item.get("link"):
+                continue
+            canonical = canonicalize_url(item["link"])
+            if canonical in seen_urls:
+                continue
+            seen_urls.add(canonical)
+            articles.append(_to_article(item))
+    
+    articles = collapse_near_duplicate_dicts(articles)
+    
+    total = sum(len(items) for items in per_query)
+    logger.info(
+        f"Merged {total} results from {len(queries)} queries into "
+        f"{len(articles)} unique articles"
+    )
+    return articles[:pool_size]
+
+
+def create_search_tool(topic: Topic = DEFAULT_TOPIC) -> Any:
+    """
+    Return the news search tool of a topic (one instance per topic).
+    
+    The tool runs the model's query together with the topic's configured
+    queries. Queries shared by several topics are served from the same
+    search cache entries.
+    
+    Args:
+        topic: Newsletter topic to search news for
+    
+    Returns:
+        CrewAI tool returning the candidate table
+    """
+    with _search_tools_lock:
+        if topic.key in _search_tools:
+            return _search_tools[topic.key]
         
-        news_results = results.get("news_results", [])[:10]
+        def search_news(query: str = topic.queries[0]) -> str:
+            api_key = os.getenv("SERP_API_KEY", "")
+            
+            if not api_key:
+                logger.error("SERP_API_KEY not found in environment")
+                raise ValueError("SERP_API_KEY environment variable is required")
+            
+            try:
+                queries = list(dict.fromkeys([query, *topic.queries]))
+                with metrics.span("tool", {"query": query}, tool="search_news", topic=topic.key) as span:
+                    articles = search_news_pool(queries, api_key)
+                    encoded = encode_candidates(articles)
+                    span.attributes["articles"] = len(articles)
+                    span.attributes["output_tokens"] = count_tokens(encoded)
+                
+                logger.info(f"Retrieved {len(articles)} {topic.name} news articles from SerpAPI")
+                return encoded
+            
+            except Exception as e:
+                logger.error(f"Error searching {topic.name} news: {e}")
+                raise
         
-        articles: list[dict[str, Any]] = []
-        for item in news_results:
-            article = {
-                "title": item.get("title", ""),
-                "source": item.get("source", {}).get("name", "Unknown Source"),
-                "url": item.get("link", ""),
-                "snippet": item.get("snippet", ""),
-                "thumbnail": item.get("thumbnail"),
-                "published_date": item.get("date"),
-            }
-            articles.append(article)
+        # CrewAI shows the docstring to the model as the tool description
+        search_news.__doc__ = textwrap.dedent(f"""
+        Searches for the latest {topic.name} AI and technology-related news articles.
+        Runs the given query together with the configured topic queries
+        concurrently and returns a de-duplicated candidate pool to select the
+        10 best stories from.
         
-        logger.info(f"Retrieved {len(articles)} NVIDIA news articles from SerpAPI")
-        return articles
+        Args:
+            query: Search query (default: "{topic.queries[0]}")
         
-    except Exception as e:
-        logger.error(f"Error searching NVIDIA news: {e}")
-        raise
+        Returns:
+            Candidate table with one "id|source|date|title|snippet" line per
+            article; refer to the selected articles by their id
+        """)
+        _search_tools[topic.key] = tool(f"Search Latest {topic.name} AI News")(search_news)
+        return _search_tools[topic.key]
+
+
+# Search tool of the default topic
+search_nvidia_news = create_search_tool(DEFAULT_TOPIC)
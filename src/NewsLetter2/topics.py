@@ -0,0 +1,200 @@
+# =============================================================================
+#  Filename: topics.py
+#
+#  Short Description: Registry of newsletter topics run by the engine
+#
+#  Creation date: 2025-10-15
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Newsletter topics (companies or themes) served by one engine.
+
+Each Topic supplies the names, search queries, focus areas and competitors
+the agents and tasks are parameterized with. NVIDIA, AMD and hyperscalers
+are built in; more topics (or overrides of built-in ones) can be added in a
+JSON file with a list of Topic objects. All topics share the search cache,
+the LLM cache and the URL-level article store, while their editions are
+cached in separate CacheManager namespaces. The default topic keeps the
+top-level cache directory, so existing archives stay in place.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from NewsLetter2.models import Topic
+
+
+# JSON file with additional topics (a list of Topic objects)
+TOPICS_FILE = os.getenv("NEWSLETTER_TOPICS_FILE", "topics.json")
+
+# Comma-separated keys of the topics offered by the app and "--topics all"
+ENABLED_TOPICS = os.getenv("NEWSLETTER_TOPICS", "nvidia")
+
+# Topic whose editions live in the top-level cache directory
+DEFAULT_TOPIC_KEY = "nvidia"
+
+_NVIDIA_QUERIES = (
+    "NVIDIA AI GPU technology news",
+    "NVIDIA partnership announcement",
+    "NVIDIA earnings market stock",
+    "NVIDIA data center enterprise AI platform",
+    "NVIDIA product launch",
+)
+
+BUILTIN_TOPICS = (
+    Topic(
+        key="nvidia",
+        name="NVIDIA",
+        # ';'-separated NEWSLETTER_SEARCH_QUERIES replaces the built-in queries
+        queries=tuple(
+            q.strip() for q in os.getenv("NEWSLETTER_SEARCH_QUERIES", "").split(";") if q.strip()
+        ) or _NVIDIA_QUERIES,
+        focus=(
+            "AI developments, GPU technologies, enterprise adoption, partnerships, "
+            "product launches, market movements, and competitive positioning"
+        ),
+        competitors="AMD, Intel, and hyperscalers (AWS, Azure, GCP)",
+    ),
+    Topic(
+        key="amd",
+        name="AMD",
+        queries=(
+            "AMD AI GPU Instinct news",
+            "AMD partnership announcement",
+            "AMD earnings market stock",
+            "AMD EPYC data center AI",
+            "AMD product launch",
+        ),
+        focus=(
+            "AI accelerators, data center CPUs, enterprise adoption, partnerships, "
+            "product launches, market movements, and competitive positioning"
+        ),
+        competitors="NVIDIA, Intel, and hyperscalers' in-house chips (AWS, Azure, GCP)",
+    ),
+    Topic(
+        key="hyperscalers",
+        name="Hyperscalers",
+        queries=(
+            "AWS Azure Google Cloud AI infrastructure news",
+            "hyperscaler AI data center capex",
+            "AWS Trainium Google TPU Microsoft Maia AI chips",
+            "cloud AI partnership announcement",
+            "NVIDIA data center enterprise AI platform",
+        ),
+        focus=(
+            "AI infrastructure spending, custom AI chips, cloud AI platforms, partnerships, "
+            "data center build-outs, market movements, and competitive positioning"
+        ),
+        competitors="NVIDIA, AMD, and GPU clouds such as CoreWeave and Oracle",
+    ),
+)
+
+
+def load_topics(path: str = TOPICS_FILE) -> dict[str, Topic]:
+    """
+    Load the built-in topics plus those of a topics file.
+    
+    Args:
+        path: JSON file with a list of Topic objects (optional)
+    
+    Returns:
+        Topics by key; file entries replace built-in topics with the same key
+    """
+    topics = {topic.key: topic for topic in BUILTIN_TOPICS}
+    
+    topics_file = Path(path)
+    if topics_file.exists():
+        try:
+            for item in json.loads(topics_file.read_text()):
+                topic = Topic.model_validate(item)
+                topics[topic.key] = topic
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring invalid topics file {topics_file}: {e}")
+    
+    return topics
+
+
+# Global topic registry
+TOPICS = load_topics()
+
+DEFAULT_TOPIC = TOPICS[DEFAULT_TOPIC_KEY]
+
+
+def get_topic(key: Optional[str] = None) -> Topic:
+    """
+    Look up a topic by key.
+    
+    Args:
+        key: Topic key (None for the default topic)
+    
+    Returns:
+        The topic
+    
+    Raises:
+        ValueError: If no topic has this key
+    """
+    if not key:
+        return DEFAULT_TOPIC
+    try:
+        return TOPICS[key]
+    except KeyError:
+        raise ValueError(f"Unknown topic '{key}' (known: {', '.join(TOPICS)})") from None
+
+
+def enabled_topics() -> list[Topic]:
+    """
+    Return the topics enabled with NEWSLETTER_TOPICS, default topic first.
+    
+    Returns:
+        Enabled topics (unknown keys are skipped with a warning)
+    """
+    topics = []
+    for key in dict.fromkeys(k.strip() for k in ENABLED_TOPICS.split(",") if k.strip()):
+        if key in TOPICS:
+            topics.append(TOPICS[key])
+        else:
+            logger.warning(f"Skipping unknown topic in NEWSLETTER_TOPICS: {key}")
+    topics.sort(key=lambda topic: topic.key != DEFAULT_TOPIC_KEY)
+    return topics or [DEFAULT_TOPIC]
+
+
+def parse_topics(spec: str) -> list[Topic]:
+    """
+    Parse a comma-separated list of topic keys.
+    
+    Args:
+        spec: Topic keys, or "all" for every enabled topic
+    
+    Returns:
+        Distinct topics in the given order
+    
+    Raises:
+        ValueError: If a key is unknown
+    """
+    if spec.strip() == "all":
+        return enabled_topics()
+    keys = dict.fromkeys(k.strip() for k in spec.split(",") if k.strip())
+    return [get_topic(key) for key in keys]
+
+
+def cache_namespace(topic: Topic) -> Optional[str]:
+    """
+    Return the CacheManager namespace of a topic's editions.
+    
+    Args:
+        topic: Newsletter topic
+    
+    Returns:
+        None for the default topic (top-level cache), else the topic key
+    """
+    return None if topic.key == DEFAULT_TOPIC_KEY else topic.key
+
+
+def possessive(name: str) -> str:
+    """Return the possessive form of a name ("NVIDIA's", "Hyperscalers'")."""
+    return f"{name}'" if name.endswith("s") else f"{name}'s"
@@ -0,0 +1,75 @@
+# =============================================================================
+#  Filename: url_utils.py
+#
+#  Short Description: URL canonicalization for article de-duplication
+#
+#  Creation date: 2025-10-08
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+URL helpers shared by search, de-duplication and caching.
+
+The same story is often returned with different tracking parameters,
+schemes or trailing slashes; canonical URLs let those copies compare equal.
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Query parameters that only track the referrer and never change the page
+_TRACKING_PARAMS = {
+    "cmpid",
+    "fbclid",
+    "gclid",
+    "guccounter",
+    "mc_cid",
+    "mc_eid",
+    "ocid",
+    "ref",
+    "ref_src",
+    "smid",
+    "taid",
+}
+_TRACKING_PREFIXES = ("utm_",)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so different links to the same page compare equal.
+    
+    Lower-cases the host, drops "www.", default ports, fragments, tracking
+    parameters and trailing slashes, sorts the remaining query parameters,
+    and treats http and https as the same scheme.
+    
+    Args:
+        url: Article URL as returned by the search API
+    
+    Returns:
+        Canonical form of the URL (the input unchanged if it cannot be parsed)
+    """
+    url = str(url).strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS
+        and not key.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    query.sort()
+    
+    path = parts.path.rstrip("/") or "/"
+    
+    return urlunsplit(("https", host, path, urlencode(query), ""))
@@ -0,0 +1,67 @@
+# =============================================================================
+#  Filename: conftest.py
+#
+#  Short Description: Shared pytest setup for the NewsLetter2 test suite
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+"""
+Shared test setup.
+
+The application reads its settings from the environment and keeps its caches
+under ./cache when its modules are first imported, so the tests run from an
+empty temporary working directory, with dummy API keys and without telemetry
+or the metrics file.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+
+os.environ.update(
+    {
+        "OPENAI_API_KEY": "sk-test",
+        "SERP_API_KEY": "test",
+        "NEWSLETTER_METRICS_FILE": "",
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+        "CREWAI_TESTING": "true",
+    }
+)
+
+
+def pytest_configure(config):
+    """Run the session from an empty working directory (before modules are imported)."""
+    workdir = tempfile.mkdtemp(prefix="newsletter_tests_")
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    os.chdir(workdir)
+
+
+def make_newsletter(topic: str = "Blackwell"):
+    """Build a complete ten-article edition with non-ASCII text."""
+    # Imported here so the package is loaded after the environment is set
+    from NewsLetter2.models import Editorial, Newsletter, ProcessedNewsArticle
+    
+    editorial = Editorial(
+        headline=f"{topic} ramps across the data center",
+        narrative=f"{topic} shipments dominated the week — demand still outpaces supply.",
+        trend_analysis="Inference workloads keep shifting spend toward accelerators.",
+        product_leader_insights="Plan capacity around liquid-cooled racks.",
+        competition_analysis="AMD and custom silicon narrow the gap on price.",
+    )
+    articles = [
+        ProcessedNewsArticle(
+            title=f"Story {idx}: {topic} update",
+            source=f"Source {idx}",
+            url=f"https://news.example.com/{topic.lower()}/{idx}",
+            short_summary=f"Summary of story {idx} about {topic}.",
+            detailed_article=f"Détails № {idx}: " + " ".join([f"{topic} paragraph {idx}."] * (idx + 1)),
+        )
+        for idx in range(10)
+    ]
+    return Newsletter(editorial=editorial, articles=articles, edition_number=7)
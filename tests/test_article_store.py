@@ -0,0 +1,83 @@
+# =============================================================================
+#  Filename: test_article_store.py
+#
+#  Short Description: Tests of article reuse across cached editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2 import pipeline
+from NewsLetter2.article_store import ArticleStore
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.models import ArticleSummary, ProcessedNewsArticle, RawNewsArticle
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CacheManager(cache_dir=str(tmp_path))
+
+
+def test_articles_of_cached_editions_are_found_by_url(manager):
+    manager.save_to_cache(make_newsletter(), date=datetime(2025, 10, 1))
+    store = ArticleStore(manager)
+    
+    assert store.refresh() == 1
+    assert len(store) == 10
+    article = store.get("https://news.example.com/blackwell/3?utm_source=feed")
+    assert article.short_summary == "Summary of story 3 about Blackwell."
+    assert store.get("https://news.example.com/other") is None
+
+
+def test_newer_editions_take_precedence(manager):
+    older = make_newsletter()
+    newer = make_newsletter()
+    newer.articles[0].short_summary = "Updated summary."
+    manager.save_to_cache(older, date=datetime(2025, 10, 1))
+    manager.save_to_cache(newer, date=datetime(2025, 10, 2))
+    store = ArticleStore(manager)
+    
+    store.refresh()
+    
+    assert store.get("https://news.example.com/blackwell/0").short_summary == "Updated summary."
+
+
+def test_only_new_or_changed_editions_are_read(manager):
+    manager.save_to_cache(make_newsletter(), date=datetime(2025, 10, 1))
+    store = ArticleStore(manager)
+    store.refresh()
+    
+    assert store.refresh() == 0
+    
+    manager.namespace("amd").save_to_cache(make_newsletter("MI355"), date=datetime(2025, 10, 2))
+    assert store.refresh() == 1
+    assert store.get("https://news.example.com/mi355/0") is not None
+    assert len(store) == 20
+
+
+def test_only_new_urls_are_summarized(manager, monkeypatch):
+    manager.save_to_cache(make_newsletter(), date=datetime(2025, 10, 1))
+    monkeypatch.setattr(pipeline, "article_store", ArticleStore(manager))
+    summarized = []
+    
+    def summarize(llm, article):
+        summarized.append(str(article.url))
+        summary = ArticleSummary(short_summary="Fresh.", detailed_article="Fresh analysis.")
+        return ProcessedNewsArticle.from_raw(article, summary)
+    
+    monkeypatch.setattr(pipeline, "summarize_article", summarize)
+    urls = ["https://news.example.com/blackwell/1", "https://news.example.com/new/1"]
+    raw = [RawNewsArticle(title=f"Story {n}", source="Wire", url=url, snippet="...") for n, url in enumerate(urls)]
+    published = []
+    
+    articles = pipeline.summarize_articles_incremental(None, raw, on_article=lambda idx, _: published.append(idx))
+    
+    assert summarized == ["https://news.example.com/new/1"]
+    assert [article.short_summary for article in articles] == ["Summary of story 1 about Blackwell.", "Fresh."]
+    assert sorted(published) == [0, 1]
+    assert pipeline.article_store.get("https://news.example.com/new/1").short_summary == "Fresh."
@@ -0,0 +1,96 @@
+# =============================================================================
+#  Filename: test_backfill.py
+#
+#  Short Description: Tests of the batch backfill of past editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2 import backfill as backfill_module
+from NewsLetter2 import crew as crew_module
+from NewsLetter2.backfill import MAX_BACKFILL_DAYS, backfill_editions, parse_dates
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.topics import get_topic
+
+
+def test_a_range_includes_both_ends():
+    assert parse_dates("2025-09-29..2025-10-02") == [
+        datetime(2025, 9, 29), datetime(2025, 9, 30), datetime(2025, 10, 1), datetime(2025, 10, 2)
+    ]
+
+
+def test_a_list_is_sorted_and_deduplicated():
+    assert parse_dates("2025-10-02, 2025-10-01,2025-10-02,") == [datetime(2025, 10, 1), datetime(2025, 10, 2)]
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("2025-10-02..2025-10-01", "ends before it starts"),
+        ("2024-01-01..2025-12-31", f"exceeds {MAX_BACKFILL_DAYS}"),
+        ("2025-13-01", "does not match|unconverted|month"),
+        ("yesterday..2025-10-01", "does not match"),
+    ],
+)
+def test_invalid_specs_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_dates(spec)
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    manager = CacheManager(cache_dir=str(tmp_path))
+    monkeypatch.setattr(backfill_module, "cache_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Fake generation recording its calls; the edition of October 3 fails."""
+    calls = []
+    
+    def generate(parallel_editor=None, edition_date=None, topic=None):
+        calls.append((topic.key, edition_date))
+        if edition_date == datetime(2025, 10, 3):
+            raise RuntimeError("search quota exhausted")
+        return make_newsletter()
+    
+    monkeypatch.setattr(crew_module, "run_newsletter_generation", generate)
+    return calls
+
+
+def test_cached_dates_are_skipped_and_failures_reported(manager, calls):
+    manager.save_to_cache(make_newsletter(), date=datetime(2025, 10, 1))
+    reported = []
+    
+    results = backfill_editions(parse_dates("2025-10-01..2025-10-03"), workers=2, on_result=reported.append)
+    
+    assert [result.status for result in results] == ["skipped", "generated", "failed"]
+    assert results[1].articles == 10
+    assert results[2].error == "search quota exhausted"
+    assert sorted(calls) == [("nvidia", datetime(2025, 10, 2)), ("nvidia", datetime(2025, 10, 3))]
+    assert len(reported) == 3
+
+
+def test_forced_backfills_regenerate_every_topic_and_date(manager, calls):
+    manager.save_to_cache(make_newsletter(), date=datetime(2025, 10, 1))
+    topics = [get_topic("nvidia"), get_topic("amd")]
+    
+    results = backfill_editions([datetime(2025, 10, 1)], topics=topics, force=True)
+    
+    assert [(result.topic, result.status) for result in results] == [("nvidia", "generated"), ("amd", "generated")]
+    assert sorted(calls) == [("amd", datetime(2025, 10, 1)), ("nvidia", datetime(2025, 10, 1))]
+
+
+def test_todays_edition_uses_the_current_news(manager, calls):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    
+    backfill_editions([today])
+    
+    assert calls == [("nvidia", None)]
@@ -0,0 +1,207 @@
+# =============================================================================
+#  Filename: test_crew.py
+#
+#  Short Description: Tests of the sequential crew's Senior Editor hand-off
+#                     and of saving generated editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2 import cache_manager as cache_manager_module
+from NewsLetter2 import crew as crew_module
+from NewsLetter2 import pipeline as pipeline_module
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.crew import (
+    assemble_newsletter,
+    check_reporter_output,
+    create_newsletter_crew,
+    run_newsletter_generation,
+)
+from NewsLetter2.models import DraftArticle, NewsletterDraft
+from NewsLetter2.tools import candidate_scope, register_candidates
+
+
+def _candidates(count: int) -> list[dict]:
+    return [
+        {
+            "title": f"Story {n}",
+            "source": "Wire",
+            "url": f"https://news.example.com/story/{n}",
+            "snippet": f"Snippet {n}",
+        }
+        for n in range(count)
+    ]
+
+
+def _editor_articles(ids: list[str]) -> list[DraftArticle]:
+    return [
+        DraftArticle(
+            id=article_id,
+            title=f"Editor title {n}",
+            short_summary=f"Summary {n}.",
+            detailed_article=f"Analysis {n}. " * 20,
+        )
+        for n, article_id in enumerate(ids)
+    ]
+
+
+@pytest.fixture
+def scope():
+    with candidate_scope():
+        yield
+
+
+def test_articles_follow_the_senior_editor_selection(scope):
+    ids = register_candidates(_candidates(12))
+    editor_articles = _editor_articles(ids)
+    chosen = list(reversed(ids[2:]))
+    draft = NewsletterDraft(editorial=make_newsletter().editorial, article_ids=chosen)
+    
+    newsletter = assemble_newsletter(draft, editor_articles)
+    
+    assert [article.title for article in newsletter.articles] == [f"Story {ids.index(i)}" for i in chosen]
+    assert newsletter.articles[0].short_summary == "Summary 11."
+    assert str(newsletter.articles[0].url) == "https://news.example.com/story/11"
+
+
+def test_a_short_selection_is_topped_up_in_editor_order(scope):
+    ids = register_candidates(_candidates(12))
+    draft = NewsletterDraft(
+        editorial=make_newsletter().editorial,
+        article_ids=[ids[5], "ffffff", ids[5], ids[3]],
+    )
+    
+    newsletter = assemble_newsletter(draft, _editor_articles(ids))
+    
+    assert [article.title for article in newsletter.articles] == [
+        f"Story {n}" for n in (5, 3, 0, 1, 2, 4, 6, 7, 8, 9)
+    ]
+
+
+def test_unknown_candidates_raise(scope):
+    ids = register_candidates(_candidates(10))
+    editor_articles = _editor_articles(ids[:9] + ["abcdef"])
+    draft = NewsletterDraft(editorial=make_newsletter().editorial, article_ids=ids)
+    
+    with pytest.raises(ValueError, match="abcdef"):
+        assemble_newsletter(draft, editor_articles)
+
+
+def test_senior_editor_sees_a_digest_instead_of_the_editor_output(scope):
+    crew = create_newsletter_crew()
+    _, editor_task, senior_editor_task = crew.tasks
+    assert senior_editor_task.context == []
+    
+    ids = register_candidates(_candidates(10))
+    editor_articles = _editor_articles(ids)
+    raw = json.dumps([article.model_dump() for article in editor_articles])
+    editor_task.callback(SimpleNamespace(raw=raw))
+    
+    description = senior_editor_task.description
+    assert f"[{ids[0]}] Editor title 0\nSummary: Summary 0.\nAnalysis: Analysis 0." in description
+    assert "article_ids" in senior_editor_task.expected_output
+    assert '"detailed_article"' not in description
+
+
+def test_a_short_reporter_answer_is_backfilled_before_the_editor(scope):
+    crew = create_newsletter_crew()
+    reporter_task = crew.tasks[0]
+    assert reporter_task.callback is check_reporter_output
+    
+    ids = register_candidates(_candidates(12))
+    output = SimpleNamespace(raw=json.dumps({"articles": [{"id": ids[4], "title": "Rewritten"}]}))
+    check_reporter_output(output)
+    
+    articles = json.loads(output.raw)
+    assert [article["id"] for article in articles] == [ids[4]] + ids[:4] + ids[5:10]
+    assert articles[0]["title"] == "Story 4"
+
+
+def test_a_reporter_answer_that_cannot_fill_an_edition_stops_the_crew(scope):
+    ids = register_candidates(_candidates(6))
+    
+    with pytest.raises(ValueError, match="Only 6 distinct articles"):
+        check_reporter_output(SimpleNamespace(raw=json.dumps(ids)))
+
+
+@pytest.fixture
+def generated(monkeypatch, tmp_path):
+    """Generation whose pipeline returns a finished newsletter, cached under tmp_path."""
+    manager = CacheManager(cache_dir=str(tmp_path))
+    monkeypatch.setattr(cache_manager_module, "cache_manager", manager)
+    monkeypatch.setattr(crew_module, "create_stage_llms", lambda: {})
+    monkeypatch.setattr(pipeline_module, "run_parallel_pipeline", lambda llms, **kwargs: make_newsletter())
+    return manager
+
+
+def test_a_thumbnail_failure_keeps_the_generated_edition(generated, monkeypatch):
+    def fail(newsletter):
+        raise FileNotFoundError("manifest.json.tmp")
+    
+    monkeypatch.setattr(crew_module.thumbnail_cache, "cache_newsletter", fail)
+    
+    newsletter = run_newsletter_generation(parallel_editor=True, edition_date=datetime(2025, 10, 1))
+    
+    assert generated.load_from_cache(datetime(2025, 10, 1)) == newsletter
+
+
+def test_an_export_failure_keeps_the_generated_edition(generated, monkeypatch):
+    def fail(topic):
+        raise OSError("site is read-only")
+    
+    monkeypatch.setattr(crew_module, "STATIC_EXPORT", True)
+    monkeypatch.setattr(crew_module, "exporter_for", fail)
+    
+    newsletter = run_newsletter_generation(parallel_editor=True, edition_date=datetime(2025, 10, 2))
+    
+    assert generated.load_from_cache(datetime(2025, 10, 2)) == newsletter
+
+
+def test_past_editions_are_dated_by_their_edition_date(generated):
+    newsletter = run_newsletter_generation(parallel_editor=True, edition_date=datetime(2025, 9, 30))
+    
+    assert newsletter.generated_at == datetime(2025, 9, 30)
+    assert generated.load_from_cache(datetime(2025, 9, 30)).generated_at == datetime(2025, 9, 30)
+    assert generated.get_edition(datetime(2025, 9, 30)).generated_at == datetime(2025, 9, 30)
+
+
+def test_the_sequential_crew_hands_the_newsletter_over_in_memory(generated, monkeypatch):
+    class _Crew:
+        """Stands in for the sequential crew, answering with its task outputs."""
+        
+        def __init__(self):
+            self.tasks = [None, SimpleNamespace(output=None)]
+        
+        def kickoff(self):
+            ids = register_candidates(_candidates(10))
+            editor_raw = json.dumps([article.model_dump() for article in _editor_articles(ids)])
+            self.tasks[1].output = SimpleNamespace(raw=f"```json\n{editor_raw}\n```")
+            draft = NewsletterDraft(editorial=make_newsletter().editorial, article_ids=list(reversed(ids)))
+            return SimpleNamespace(pydantic=draft, raw="")
+    
+    monkeypatch.setattr(crew_module, "create_newsletter_crew", lambda topic: _Crew())
+    
+    newsletter = run_newsletter_generation(parallel_editor=False, edition_date=datetime(2025, 9, 29))
+    
+    assert [article.title for article in newsletter.articles] == [f"Story {n}" for n in range(9, -1, -1)]
+    assert newsletter.articles[0].short_summary == "Summary 9."
+    assert generated.load_from_cache(datetime(2025, 9, 29)) == newsletter
+    assert not Path("newsletter_output.json").exists()
+
+
+def test_legacy_json_editions_with_code_fences_load(tmp_path):
+    manager = CacheManager(cache_dir=str(tmp_path), cache_format="json")
+    newsletter = make_newsletter()
+    path = tmp_path / f"{manager._get_cache_path(datetime(2025, 9, 1)).stem}.json"
+    path.write_text(f"```json\n{newsletter.model_dump_json()}\n```")
+    
+    assert manager.load_from_cache(datetime(2025, 9, 1)) == newsletter
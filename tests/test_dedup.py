@@ -0,0 +1,114 @@
+# =============================================================================
+#  Filename: test_dedup.py
+#
+#  Short Description: Tests of SimHash near-duplicate story detection
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+from pathlib import Path
+
+import pytest
+
+from NewsLetter2.dedup import (
+    NEAR_DUP_MAX_DISTANCE,
+    collapse_near_duplicate_dicts,
+    collapse_near_duplicates,
+    find_duplicate_groups,
+    hamming_distance,
+    simhash,
+    story_text,
+)
+from NewsLetter2.models import RawNewsArticle
+
+
+FIXTURE = Path(__file__).parents[1] / "benchmarks" / "fixtures" / "google_news_nvidia.json"
+
+
+@pytest.fixture(scope="module")
+def news_results():
+    return json.loads(FIXTURE.read_text())["news_results"]
+
+
+def _fingerprint(item):
+    return simhash(story_text(item["title"], item["snippet"]))
+
+
+def _story(news_results, story):
+    return [item for item in news_results if item["_story"] == story]
+
+
+def test_simhash_is_stable_and_ignores_case_and_stopwords():
+    text = "NVIDIA ships the Blackwell GPU to cloud providers"
+    assert simhash(text) == simhash(text)
+    assert simhash(text) == simhash("nvidia ships Blackwell GPU to the cloud providers")
+    assert simhash("") == 0
+
+
+def test_hamming_distance():
+    assert hamming_distance(0b1010, 0b1010) == 0
+    assert hamming_distance(0b1010, 0b0101) == 4
+
+
+def test_syndicated_copies_are_within_the_threshold(news_results):
+    copies = _story(news_results, "blackwell-ramp")
+    anchor = _fingerprint(copies[0])
+    distances = [hamming_distance(anchor, _fingerprint(item)) for item in copies[1:]]
+    assert max(distances) <= NEAR_DUP_MAX_DISTANCE
+
+
+def test_distinct_stories_are_beyond_the_threshold(news_results):
+    fingerprints = [(item["_story"], _fingerprint(item)) for item in news_results]
+    closest = min(
+        hamming_distance(a, b)
+        for i, (story_a, a) in enumerate(fingerprints)
+        for story_b, b in fingerprints[i + 1:]
+        if story_a != story_b
+    )
+    assert closest > NEAR_DUP_MAX_DISTANCE
+
+
+def test_groups_never_mix_stories(news_results):
+    groups = find_duplicate_groups(story_text(item["title"], item["snippet"]) for item in news_results)
+    assert all(len({news_results[idx]["_story"] for idx in group}) == 1 for group in groups)
+    assert len(groups) < len(news_results)
+
+
+def test_a_tighter_threshold_splits_looser_copies(news_results):
+    texts = [story_text(item["title"], item["snippet"]) for item in _story(news_results, "blackwell-ramp")]
+    assert len(find_duplicate_groups(texts)) == 1
+    assert len(find_duplicate_groups(texts, max_distance=0)) > 1
+
+
+def test_collapse_keeps_the_highest_ranked_copy(news_results):
+    copies = _story(news_results, "blackwell-ramp")
+    articles = [
+        RawNewsArticle(
+            title=item["title"],
+            source=item["source"]["name"],
+            url=item["link"],
+            snippet=item["snippet"],
+        )
+        for item in copies
+    ]
+    
+    collapsed = collapse_near_duplicates(articles)
+    
+    assert len(collapsed) == 1
+    assert collapsed[0].url == articles[0].url
+    assert [str(alt.url) for alt in collapsed[0].alternate_sources] == [str(a.url) for a in articles[1:]]
+
+
+def test_collapse_dicts_lists_alternate_sources(news_results):
+    items = [
+        {"title": item["title"], "snippet": item["snippet"], "source": item["source"]["name"], "url": item["link"]}
+        for item in _story(news_results, "blackwell-ramp") + _story(news_results, "openai-deal")[:1]
+    ]
+    
+    collapsed = collapse_near_duplicate_dicts(items)
+    
+    assert [item["url"] for item in collapsed] == [items[0]["url"], items[-1]["url"]]
+    assert len(collapsed[0]["alternate_sources"]) == len(items) - 2
+    assert "alternate_sources" not in collapsed[1]
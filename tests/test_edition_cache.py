@@ -0,0 +1,103 @@
+# =============================================================================
+#  Filename: test_edition_cache.py
+#
+#  Short Description: Tests of the process-wide cache of parsed editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.edition_cache import SharedEditionCache
+
+
+EDITION_KEY = "2025-10-03"
+EDITION_DATE = datetime(2025, 10, 3)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), cache_format="block")
+    manager.save_to_cache(make_newsletter(), EDITION_DATE)
+    return manager
+
+
+def _wait_for_waiters(cache, count):
+    """Wait until count sessions are waiting on the in-flight load."""
+    deadline = time.monotonic() + 5
+    while cache.stats()["hits"] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_preview_is_parsed_once_and_shared(manager):
+    cache = SharedEditionCache(manager)
+    first = cache.get_preview(EDITION_KEY)
+    
+    assert cache.get_preview(EDITION_KEY) is first
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert cache.get_preview("2025-10-04") is None
+
+
+def test_a_regenerated_edition_is_reloaded(manager):
+    cache = SharedEditionCache(manager)
+    first = cache.get_article(EDITION_KEY, 0)
+    manager.save_to_cache(make_newsletter("Rubin"), EDITION_DATE)
+    
+    assert cache.get_article(EDITION_KEY, 0) != first
+    assert cache.get_article(EDITION_KEY, 0).title.endswith("Rubin update")
+
+
+def test_concurrent_misses_share_one_load(manager, monkeypatch):
+    cache = SharedEditionCache(manager)
+    release = threading.Event()
+    calls = []
+    load_preview = manager.load_preview
+    
+    def slow_load(date):
+        calls.append(date)
+        release.wait(5)
+        return load_preview(date)
+    
+    monkeypatch.setattr(manager, "load_preview", slow_load)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get_preview, EDITION_KEY) for _ in range(4)]
+        _wait_for_waiters(cache, 3)
+        release.set()
+        previews = [future.result() for future in futures]
+    
+    assert len(calls) == 1
+    assert all(preview is previews[0] for preview in previews)
+
+
+def test_a_failed_load_reaches_waiters_and_is_retried(manager, monkeypatch):
+    cache = SharedEditionCache(manager)
+    release = threading.Event()
+    calls = []
+    
+    def failing_load(date):
+        calls.append(date)
+        release.wait(5)
+        raise OSError("disk gone")
+    
+    monkeypatch.setattr(manager, "load_preview", failing_load)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(cache.get_preview, EDITION_KEY) for _ in range(3)]
+        _wait_for_waiters(cache, 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(OSError, match="disk gone"):
+                future.result()
+    
+    assert len(calls) == 1
+    assert cache._loading == {}
+    
+    monkeypatch.undo()
+    assert cache.get_preview(EDITION_KEY) is not None
@@ -0,0 +1,89 @@
+# =============================================================================
+#  Filename: test_edition_format.py
+#
+#  Short Description: Tests of the compressed block edition format
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import threading
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.edition_format import (
+    MAGIC,
+    decode_edition,
+    encode_edition,
+    read_article,
+    read_edition,
+    read_preview,
+)
+from NewsLetter2.models import NewsletterPreview
+
+
+@pytest.fixture
+def edition_file(tmp_path):
+    newsletter = make_newsletter()
+    path = tmp_path / "edition.nlz"
+    path.write_bytes(encode_edition(newsletter))
+    return newsletter, path
+
+
+def test_encode_decode_round_trip():
+    newsletter = make_newsletter()
+    content = encode_edition(newsletter)
+    
+    assert content.startswith(MAGIC)
+    assert decode_edition(content) == newsletter
+
+
+def test_read_edition_from_file(edition_file):
+    newsletter, path = edition_file
+    assert read_edition(path) == newsletter
+
+
+def test_preview_reads_the_header_only(edition_file):
+    newsletter, path = edition_file
+    assert read_preview(path) == NewsletterPreview.from_newsletter(newsletter)
+
+
+def test_every_article_block_inflates_on_its_own(edition_file):
+    newsletter, path = edition_file
+    for idx, article in enumerate(newsletter.articles):
+        assert read_article(path, idx) == article
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "edition.nlz"
+    path.write_bytes(b'{"editorial": {}}')
+    
+    with pytest.raises(ValueError):
+        decode_edition(path.read_bytes())
+    with pytest.raises(ValueError):
+        read_preview(path)
+
+
+def test_concurrent_saves_of_one_date(tmp_path):
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), cache_format="block")
+    date = datetime(2025, 10, 3)
+    editions = [make_newsletter(topic) for topic in ("Blackwell", "Rubin", "Hopper", "Grace")]
+    start = threading.Barrier(len(editions))
+    results = []
+    
+    def save(newsletter):
+        start.wait()
+        results.append(manager.save_to_cache(newsletter, date))
+    
+    threads = [threading.Thread(target=save, args=(newsletter,)) for newsletter in editions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [True] * len(editions)
+    assert manager.load_from_cache(date) in editions
+    assert not list((tmp_path / "cache").glob("*.tmp"))
@@ -0,0 +1,89 @@
+# =============================================================================
+#  Filename: test_edition_index.py
+#
+#  Short Description: Tests of the SQLite index of cached editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from datetime import datetime
+
+import pytest
+
+from NewsLetter2.edition_index import EditionIndex
+from NewsLetter2.models import EditionRecord
+
+
+def _record(day: int, **changes) -> EditionRecord:
+    values = dict(
+        date=datetime(2025, 10, day),
+        path=f"cache/newsletter_2025-10-{day:02d}.nlb",
+        size=1000 + day,
+        checksum=f"{day:064x}",
+        article_count=10,
+        headline=f"Headline {day}",
+        generated_at=datetime(2025, 10, day, 6, 30),
+    )
+    values.update(changes)
+    return EditionRecord(**values)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = EditionIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+def test_upsert_and_get_round_trip(index):
+    record = _record(3)
+    index.upsert(record)
+    
+    assert index.get(datetime(2025, 10, 3)) == record
+    assert index.exists(datetime(2025, 10, 3))
+    assert index.get(datetime(2025, 10, 4)) is None
+    assert not index.exists(datetime(2025, 10, 4))
+
+
+def test_upsert_replaces_the_entry_of_a_date(index):
+    index.upsert(_record(3))
+    index.upsert(_record(3, checksum="f" * 64, headline=None, generated_at=None))
+    
+    assert len(index) == 1
+    record = index.get(datetime(2025, 10, 3))
+    assert record.checksum == "f" * 64
+    assert record.headline is None
+    assert record.generated_at is None
+
+
+def test_list_is_newest_first_with_range_and_limit(index):
+    for day in (5, 1, 9, 3, 7):
+        index.upsert(_record(day))
+    
+    assert [r.date.day for r in index.list()] == [9, 7, 5, 3, 1]
+    assert [r.date.day for r in index.list(limit=2)] == [9, 7]
+    assert [r.date.day for r in index.list(start=datetime(2025, 10, 3), end=datetime(2025, 10, 7))] == [7, 5, 3]
+    assert index.dates() == {f"2025-10-{day:02d}" for day in (1, 3, 5, 7, 9)}
+
+
+def test_remove(index):
+    index.upsert(_record(3))
+    index.upsert(_record(4))
+    index.remove(datetime(2025, 10, 3))
+    
+    assert index.dates() == {"2025-10-04"}
+    index.remove(datetime(2025, 10, 3))
+    assert len(index) == 1
+
+
+def test_entries_survive_reopening(tmp_path):
+    index = EditionIndex(tmp_path / "index.db")
+    index.upsert(_record(3))
+    index.close()
+    
+    reopened = EditionIndex(tmp_path / "index.db")
+    try:
+        assert reopened.get(datetime(2025, 10, 3)) == _record(3)
+    finally:
+        reopened.close()
@@ -0,0 +1,99 @@
+# =============================================================================
+#  Filename: test_http_pool.py
+#
+#  Short Description: Tests of the shared keep-alive HTTP clients
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from NewsLetter2 import http_pool as http_pool_module
+from NewsLetter2.http_pool import http_pool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small body over a persistent connection."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+    
+    def do_GET(self) -> None:
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool():
+    http_pool.close()
+    yield http_pool
+    http_pool.close()
+
+
+def _delta(before: dict, after: dict, client: str) -> tuple[int, int]:
+    return (
+        after[client]["requests"] - before[client]["requests"],
+        after[client]["connections"] - before[client]["connections"],
+    )
+
+
+def test_the_session_reuses_its_connection(pool, url):
+    before = pool.stats()
+    session = pool.session()
+    
+    for _ in range(3):
+        assert session.get(url, timeout=5).status_code == 200
+    
+    assert pool.session() is session
+    assert _delta(before, pool.stats(), "session") == (3, 1)
+
+
+def test_the_llm_client_reuses_its_connection(pool, url):
+    before = pool.stats()
+    client = pool.llm_client()
+    
+    for _ in range(3):
+        assert client.get(url).status_code == 200
+    
+    assert pool.llm_client() is client
+    assert _delta(before, pool.stats(), "llm") == (3, 1)
+
+
+def test_litellm_uses_the_shared_client_until_closed(pool):
+    litellm = pytest.importorskip("litellm")
+    
+    assert pool.install_litellm()
+    client = pool.llm_client()
+    assert litellm.client_session is client
+    
+    pool.close()
+    assert litellm.client_session is None
+    assert client.is_closed
+    assert pool.llm_client() is not client
+
+
+def test_the_pool_works_without_litellm(pool, monkeypatch):
+    monkeypatch.setattr(http_pool_module, "litellm", None)
+    
+    assert not pool.install_litellm()
+    pool.llm_client()
+    pool.close()
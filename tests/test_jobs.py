@@ -0,0 +1,108 @@
+# =============================================================================
+#  Filename: test_jobs.py
+#
+#  Short Description: Tests of the background generation job queue and the
+#                     stale-while-revalidate refresh
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from NewsLetter2 import crew
+from NewsLetter2 import jobs as jobs_module
+from NewsLetter2.jobs import JobManager
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """Hold every generation until the returned event is set."""
+    event = threading.Event()
+    
+    def generate(**kwargs):
+        event.wait(10)
+        raise RuntimeError("stopped by test")
+    
+    monkeypatch.setattr(crew, "run_newsletter_generation", generate)
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(jobs_dir=str(tmp_path / "jobs"), max_workers=2)
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+
+def test_submit_returns_the_active_job(manager, release):
+    first = manager.submit("nvidia")
+    assert manager.submit("nvidia").job_id == first.job_id
+    assert manager.refresh("nvidia").job_id == first.job_id
+
+
+def test_concurrent_submits_queue_one_job(manager, release):
+    start = threading.Barrier(8)
+    
+    def submit(refresh):
+        start.wait()
+        return manager.refresh("nvidia") if refresh else manager.submit("nvidia")
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        jobs = list(pool.map(submit, [i % 2 == 0 for i in range(8)]))
+    
+    assert len({job.job_id for job in jobs}) == 1
+    assert len(manager.list_jobs(limit=10)) == 1
+
+
+def test_a_finished_job_allows_a_new_submit(manager, release):
+    first = manager.submit("nvidia")
+    release.set()
+    deadline = time.monotonic() + 10
+    while not manager.get(first.job_id).finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert manager.get(first.job_id).status == "failed"
+    assert manager.submit("nvidia").job_id != first.job_id
+
+
+def _wait_finished(manager: JobManager, job_id: str) -> None:
+    deadline = time.monotonic() + 10
+    while not manager.get(job_id).finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_a_refresh_is_queued_once_and_flagged(manager, release):
+    job = manager.refresh("nvidia")
+    
+    assert job.refresh
+    assert manager.refresh("nvidia").job_id == job.job_id
+    assert not manager.submit("amd").refresh
+
+
+def test_refreshes_can_be_disabled(manager, release, monkeypatch):
+    monkeypatch.setattr(jobs_module, "STALE_REFRESH", False)
+    
+    assert manager.refresh("nvidia") is None
+    assert manager.active_job("nvidia") is None
+
+
+def test_a_failed_refresh_is_retried_after_the_back_off(manager, release, monkeypatch):
+    job = manager.refresh("nvidia")
+    release.set()
+    _wait_finished(manager, job.job_id)
+    
+    assert manager.get(job.job_id).status == "failed"
+    assert manager.refresh("nvidia") is None
+    # A generation requested by a reader is not held back
+    requested = manager.submit("nvidia")
+    assert not requested.refresh
+    
+    monkeypatch.setattr(jobs_module, "REFRESH_RETRY_SECONDS", 0)
+    _wait_finished(manager, requested.job_id)
+    assert manager.refresh("nvidia").job_id != job.job_id
@@ -0,0 +1,76 @@
+# =============================================================================
+#  Filename: test_json_utils.py
+#
+#  Short Description: Tests of JSON extraction from model output
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from NewsLetter2.json_utils import extract_json, parse_model_list, parse_model_output, strip_code_fences
+from NewsLetter2.models import ArticleSummary
+
+
+SUMMARY = {"short_summary": "NVIDIA ships Blackwell.", "detailed_article": "In depth."}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1}',
+        '```json\n{"a": 1}\n```',
+        '```\n{"a": 1}\n```',
+        'Here is the JSON you asked for: {"a": 1}',
+        '{"a": 1}\nLet me know if you need anything else.',
+        'Thought: done\nFinal Answer: {"a": 1} (all fields filled in)',
+    ],
+)
+def test_extract_json_tolerates_fences_and_surrounding_text(text):
+    assert extract_json(text) == {"a": 1}
+
+
+def test_extract_json_reads_arrays_and_skips_stray_brackets():
+    assert extract_json('Articles [see below]: [{"id": "a1"}, {"id": "b2"}]') == [{"id": "a1"}, {"id": "b2"}]
+
+
+def test_extract_json_without_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("I could not find any articles today.")
+
+
+def test_strip_code_fences_leaves_plain_text():
+    assert strip_code_fences("  plain  ") == "plain"
+
+
+def test_parse_model_output_prefers_structured_output():
+    structured = ArticleSummary(**SUMMARY)
+    output = SimpleNamespace(pydantic=structured, raw="not json")
+    assert parse_model_output(output, ArticleSummary) is structured
+
+
+def test_parse_model_output_falls_back_to_raw_json():
+    output = SimpleNamespace(pydantic=None, raw=f"```json\n{json.dumps(SUMMARY)}\n```")
+    assert parse_model_output(output, ArticleSummary) == ArticleSummary(**SUMMARY)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps([SUMMARY, SUMMARY]),
+        f"Here you go:\n```json\n{json.dumps({'articles': [SUMMARY, SUMMARY]})}\n```",
+    ],
+)
+def test_parse_model_list_reads_bare_and_wrapped_lists(text):
+    assert parse_model_list(text, ArticleSummary) == [ArticleSummary(**SUMMARY)] * 2
+
+
+def test_parse_model_list_without_a_list_raises():
+    with pytest.raises(ValueError):
+        parse_model_list(json.dumps({"editorial": SUMMARY}), ArticleSummary)
+    with pytest.raises(ValueError):
+        parse_model_list(json.dumps([{"short_summary": "only"}]), ArticleSummary)
@@ -0,0 +1,97 @@
+# =============================================================================
+#  Filename: test_llm_cache.py
+#
+#  Short Description: Tests of the LLM completion cache
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import os
+
+import pytest
+
+from NewsLetter2.llm_cache import CachedLLM, CompletionCache, InstrumentedLLM
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are the Editor."},
+    {"role": "user", "content": "Summarize: NVIDIA ships Blackwell"},
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompletionCache(cache_dir=str(tmp_path), max_bytes=10_000)
+
+
+def test_key_is_deterministic():
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    key = CompletionCache.make_key("gpt-4o-mini", 0.7, MESSAGES, stop=["Observation:"], seed=None)
+    assert key == CompletionCache.make_key("gpt-4o-mini", 0.7, reordered, seed=None, stop=["Observation:"])
+    assert len(key) == 64
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"model": "gpt-4o"},
+        {"temperature": 0.0},
+        {"messages": MESSAGES[:1]},
+        {"stop": ["Final Answer:"]},
+    ],
+)
+def test_key_changes_with_every_input(change):
+    request = {"model": "gpt-4o-mini", "temperature": 0.7, "messages": MESSAGES, "stop": ["Observation:"]}
+    assert CompletionCache.make_key(**request) != CompletionCache.make_key(**{**request, **change})
+
+
+def test_round_trip_and_counters(cache):
+    key = cache.make_key("gpt-4o-mini", 0.7, MESSAGES)
+    assert cache.get(key) is None
+    cache.set(key, "Final Answer: ok", "gpt-4o-mini")
+    assert cache.get(key) == "Final Answer: ok"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert not list(cache.cache_dir.glob("*.tmp"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = CompletionCache(cache_dir=str(tmp_path), max_bytes=3_500)
+    keys = [cache.make_key("gpt-4o-mini", 0.7, [{"role": "user", "content": str(i)}]) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.set(key, "x" * 1_000, "gpt-4o-mini")
+        # Older entries get older mtimes, the first one is read again below
+        os.utime(cache._entry_path(key), (1_000 + age, 1_000 + age))
+    os.utime(cache._entry_path(keys[0]), (2_000, 2_000))
+    
+    cache.set(cache.make_key("gpt-4o-mini", 0.7, []), "x" * 1_000, "gpt-4o-mini")
+    
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["bytes"] <= 3_500
+
+
+def test_cached_llm_serves_repeated_prompts_without_calling_the_api(cache, monkeypatch):
+    calls = []
+    
+    def fake_call(self, messages, tools, callbacks, available_functions, from_task, from_agent, cache):
+        calls.append(cache)
+        return "Final Answer: summary"
+    
+    monkeypatch.setattr(InstrumentedLLM, "_instrumented_call", fake_call)
+    llm = CachedLLM(model="gpt-4o-mini", temperature=0.7, api_key="sk-test", cache=cache, deterministic=False)
+    
+    assert llm.call(MESSAGES) == "Final Answer: summary"
+    assert llm.call(MESSAGES) == "Final Answer: summary"
+    assert calls == ["miss"]
+    
+    llm.call(MESSAGES[:1])
+    assert calls == ["miss", "miss"]
+
+
+def test_deterministic_mode_pins_temperature_and_seed(cache):
+    llm = CachedLLM(model="gpt-4o-mini", temperature=0.9, api_key="sk-test", cache=cache, deterministic=True)
+    assert llm.temperature == 0.0
+    assert llm.seed is not None
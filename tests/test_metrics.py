@@ -0,0 +1,101 @@
+# =============================================================================
+#  Filename: test_metrics.py
+#
+#  Short Description: Tests of span recording, rotation and Prometheus export
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+import socket
+import urllib.request
+
+import pytest
+
+from NewsLetter2.metrics import MetricsRegistry
+
+
+def test_spans_are_aggregated_and_rendered():
+    registry = MetricsRegistry(path=None)
+    with registry.span("llm", model="gpt-4o-mini") as span:
+        span.add_tokens(120, 30)
+        span.retry()
+    with pytest.raises(RuntimeError):
+        with registry.span("llm", model="gpt-4o-mini"):
+            raise RuntimeError("boom")
+    
+    text = registry.render_prometheus()
+    
+    labels = '{span="llm",model="gpt-4o-mini"}'
+    assert f"newsletter_span_duration_seconds_count{labels} 2" in text
+    assert f"newsletter_span_errors_total{labels} 1" in text
+    assert f"newsletter_span_retries_total{labels} 1" in text
+    assert 'newsletter_span_tokens_total{span="llm",model="gpt-4o-mini",kind="prompt"} 120' in text
+
+
+def test_nested_spans_record_their_parent(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.jsonl")
+    with registry.span("generation") as outer:
+        with registry.span("stage", stage="editor"):
+            pass
+    
+    lines = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["stage", "generation"]
+    assert lines[0]["parent_id"] == outer.span_id
+
+
+def test_file_is_rotated_at_the_size_cap(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    registry = MetricsRegistry(path, max_bytes=1000)
+    for _ in range(20):
+        with registry.span("tool"):
+            pass
+    
+    assert registry.rotated_path.stat().st_size >= 1000
+    assert not path.exists() or path.stat().st_size < 1000
+    assert set(tmp_path.iterdir()) <= {path, registry.rotated_path}
+
+
+def test_replay_follows_rotation(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    writer = MetricsRegistry(path, max_bytes=1000)
+    reader = MetricsRegistry(path)
+    
+    written = 0
+    while not path.exists() or path.stat().st_size < 500:
+        with writer.span("tool"):
+            written += 1
+    assert reader.replay() == written
+    
+    # The rest of the rotated file is read before the new file
+    before = written
+    while not (writer.rotated_path.exists() and path.exists()):
+        with writer.span("tool"):
+            written += 1
+    
+    assert reader.replay() == written - before
+    assert reader._series[("tool", ())].count == written
+
+
+def test_endpoint_binds_to_loopback_by_default():
+    registry = MetricsRegistry(path=None)
+    with registry.span("tool"):
+        pass
+    
+    assert registry.start_http_server(port=0) is False
+    assert registry.start_http_server(port=_free_port())
+    try:
+        host, port = registry._server.server_address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert b'newsletter_span_duration_seconds_count{span="tool"} 1' in response.read()
+    finally:
+        registry._server.shutdown()
+        registry._server.server_close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,147 @@
+# =============================================================================
+#  Filename: test_model_routing.py
+#
+#  Short Description: Tests of per-stage model routing and its fallback
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+
+import pytest
+
+from NewsLetter2 import llm_cache as llm_cache_module
+from NewsLetter2 import model_routing as model_routing_module
+from NewsLetter2.llm_cache import CachedLLM, CompletionCache, InstrumentedLLM
+from NewsLetter2.model_routing import DEFAULT_ROUTE, ModelRouter, load_routes
+from NewsLetter2.models import ModelRoute
+
+
+MESSAGES = [{"role": "user", "content": "Write the editorial"}]
+
+
+class _Clock:
+    """Stand-in for the time module with a manually advanced monotonic()."""
+    
+    def __init__(self):
+        self.now = 1_000.0
+    
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(model_routing_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def router(clock):
+    routes = load_routes("missing.json")
+    routes["senior_editor"] = ModelRoute(
+        model="gpt-4o", fallback_model="gpt-4o-mini", latency_budget_s=45
+    )
+    return ModelRouter(routes, cooldown=300)
+
+
+def test_load_routes_applies_overrides(tmp_path):
+    models_file = tmp_path / "models.json"
+    models_file.write_text(json.dumps({
+        "editor": {"model": "gpt-4o-mini", "temperature": 0.3},
+        "publisher": {"model": "gpt-4o"},
+    }))
+    
+    routes = load_routes(str(models_file))
+    
+    assert routes["editor"].model == "gpt-4o-mini"
+    assert routes["editor"].temperature == 0.3
+    assert "publisher" not in routes
+    assert routes["reporter"] == DEFAULT_ROUTE
+
+
+def test_an_invalid_models_file_keeps_the_defaults(tmp_path):
+    models_file = tmp_path / "models.json"
+    models_file.write_text('{"editor": {"temperature": 9}}')
+    
+    assert load_routes(str(models_file)) == load_routes("missing.json")
+
+
+def test_unknown_stages_are_rejected(router):
+    assert router.route(None) == DEFAULT_ROUTE
+    with pytest.raises(ValueError, match="Unknown stage"):
+        router.route("publisher")
+
+
+def test_calls_within_budget_stay_on_the_primary(router):
+    router.record("senior_editor", 45)
+    router.record("editor", 600)
+    
+    assert not router.use_fallback("senior_editor")
+    assert not router.use_fallback("editor")
+
+
+def test_an_overrun_switches_the_stage_until_the_cooldown_ends(router, clock):
+    router.record("senior_editor", 46)
+    
+    assert router.use_fallback("senior_editor")
+    assert router.use_fallback("senior_editor")
+    assert router.stats()["senior_editor"] == {
+        "model": "gpt-4o",
+        "fallback_model": "gpt-4o-mini",
+        "on_fallback": True,
+        "fallback_calls": 2,
+    }
+    
+    clock.now += 300
+    assert not router.use_fallback("senior_editor")
+    assert not router.stats()["senior_editor"]["on_fallback"]
+
+
+@pytest.fixture
+def llms(router, tmp_path, monkeypatch):
+    """Primary and fallback CachedLLM sharing one completion cache; calls answer with their model."""
+    
+    def fake_call(self, messages, tools, callbacks, available_functions, from_task, from_agent, cache):
+        return f"Final Answer: {self.model}"
+    
+    monkeypatch.setattr(InstrumentedLLM, "_instrumented_call", fake_call)
+    monkeypatch.setattr(llm_cache_module, "model_router", router)
+    cache = CompletionCache(cache_dir=str(tmp_path), max_bytes=100_000)
+    fallback = CachedLLM(model="gpt-4o-mini", temperature=0.7, api_key="sk-test", cache=cache, deterministic=False)
+    primary = CachedLLM(
+        model="gpt-4o",
+        temperature=0.7,
+        api_key="sk-test",
+        cache=cache,
+        deterministic=False,
+        stage="senior_editor",
+        fallback=fallback,
+    )
+    return primary, fallback, cache
+
+
+def test_fallback_answers_are_not_cached_for_the_primary_model(llms, router, clock):
+    primary, fallback, cache = llms
+    router.record("senior_editor", 60)
+    
+    assert primary.call(MESSAGES) == "Final Answer: gpt-4o-mini"
+    assert cache.get(primary._cache_key(MESSAGES, None)) is None
+    assert cache.get(fallback._cache_key(MESSAGES, None)) == "Final Answer: gpt-4o-mini"
+    
+    # Once the stage recovers the primary model answers, and is cached
+    clock.now += 300
+    assert primary.call(MESSAGES) == "Final Answer: gpt-4o"
+    assert primary.call(MESSAGES) == "Final Answer: gpt-4o"
+    assert cache.get(primary._cache_key(MESSAGES, None)) == "Final Answer: gpt-4o"
+
+
+def test_primary_cache_hits_are_not_served_while_on_the_fallback(llms, router):
+    primary, fallback, cache = llms
+    assert primary.call(MESSAGES) == "Final Answer: gpt-4o"
+    
+    router.record("senior_editor", 60)
+    
+    assert primary.call(MESSAGES) == "Final Answer: gpt-4o-mini"
@@ -0,0 +1,222 @@
+# =============================================================================
+#  Filename: test_pipeline.py
+#
+#  Short Description: Tests of the staged pipeline's Reporter selection, its
+#                     prompts and of pipelines sharing articles
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import json
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from NewsLetter2 import pipeline
+from NewsLetter2.article_store import ArticleStore
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.models import ArticleSummary, Editorial, ProcessedNewsArticle, RawNewsArticle, Topic
+from NewsLetter2.pipeline import (
+    ARTICLES_PER_EDITION,
+    collect_raw_articles,
+    run_pipelined_stages,
+    select_articles,
+    summarize_article,
+    write_detailed_article,
+    write_editorial,
+    write_editorial_from_summaries,
+    write_short_summary,
+)
+from NewsLetter2.tools import candidate_scope, register_candidates
+
+
+def _candidates(count: int) -> list[dict]:
+    topics = ["earnings", "datacenter", "robotics", "automotive", "gaming", "networking",
+              "healthcare", "quantum", "software", "supply", "policy", "research",
+              "partnership", "chips", "cloud", "energy"]
+    return [
+        {
+            "title": f"{topics[n].capitalize()} headline number {n}",
+            "source": f"Outlet {n}",
+            "url": f"https://news.example.com/{topics[n]}/{n}",
+            "snippet": f"Distinct {topics[n]} coverage with its own details {n}.",
+        }
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def scope():
+    with candidate_scope():
+        yield
+
+
+def test_a_full_selection_keeps_reporter_order(scope):
+    ids = register_candidates(_candidates(14))
+    
+    articles = select_articles(list(reversed(ids)))
+    
+    assert [article.source for article in articles] == [f"Outlet {n}" for n in range(13, 3, -1)]
+
+
+def test_a_short_selection_is_backfilled_from_the_pool(scope):
+    ids = register_candidates(_candidates(14))
+    
+    articles = select_articles([ids[9], "ffffff", ids[9], {"id": ids[2]}, ids[12]])
+    
+    assert len(articles) == ARTICLES_PER_EDITION
+    assert [article.source for article in articles] == [
+        f"Outlet {n}" for n in (9, 2, 12, 0, 1, 3, 4, 5, 6, 7)
+    ]
+
+
+def test_an_exhausted_pool_raises_before_any_llm_stage(scope):
+    ids = register_candidates(_candidates(8))
+    
+    with pytest.raises(ValueError, match="Only 8 distinct articles"):
+        select_articles(ids)
+
+
+def _raw(name: str) -> RawNewsArticle:
+    return RawNewsArticle(
+        title=f"Story {name}",
+        source="Outlet",
+        url=f"https://news.example.com/{name}",
+        snippet=f"Snippet of {name}.",
+    )
+
+
+def test_pipelines_sharing_articles_in_either_order_both_finish(monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline, "article_store", ArticleStore(CacheManager(str(tmp_path))))
+    short_calls: Counter = Counter()
+    detail_calls: Counter = Counter()
+    editorials: dict[str, list[str]] = {}
+    first_claimed = threading.Event()
+    second_editorial = threading.Event()
+    waits: list[bool] = []
+    
+    def write_short_summary(llm, article):
+        short_calls[article.title] += 1
+        first_claimed.set()
+        return f"Short {article.title}"
+    
+    def write_detailed_article(llm, article, short_summary):
+        detail_calls[article.title] += 1
+        if article.title.startswith("Story shared"):
+            # The owner's detail pass only ends once the other editorial started
+            waits.append(second_editorial.wait(5))
+        summary = ArticleSummary(short_summary=short_summary, detailed_article=f"Detail {article.title}")
+        return ProcessedNewsArticle.from_raw(article, summary)
+    
+    def write_editorial_from_summaries(llm, articles, short_summaries, topic):
+        name = articles[0].title
+        editorials[name] = short_summaries
+        if name == "Story shared-1":
+            second_editorial.set()
+        return Editorial(
+            headline=name,
+            narrative="N",
+            trend_analysis="T",
+            product_leader_insights="P",
+            competition_analysis="C",
+        )
+    
+    monkeypatch.setattr(pipeline, "write_short_summary", write_short_summary)
+    monkeypatch.setattr(pipeline, "write_detailed_article", write_detailed_article)
+    monkeypatch.setattr(pipeline, "write_editorial_from_summaries", write_editorial_from_summaries)
+    
+    first = [_raw("shared-0"), _raw("first"), _raw("shared-1")]
+    second = [_raw("shared-1"), _raw("second"), _raw("shared-0")]
+    llms = {"editor": None, "senior_editor": None}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first_run = executor.submit(run_pipelined_stages, llms, first, 2, True)
+        assert first_claimed.wait(5)
+        second_run = executor.submit(run_pipelined_stages, llms, second, 2, True)
+        first_articles, _ = first_run.result(timeout=10)
+        second_articles, _ = second_run.result(timeout=10)
+    
+    assert waits == [True, True]
+    assert editorials["Story shared-1"] == ["Short Story shared-1", "Short Story second", "Short Story shared-0"]
+    assert [article.detailed_article for article in second_articles] == [
+        "Detail Story shared-1", "Detail Story second", "Detail Story shared-0"
+    ]
+    assert [article.title for article in first_articles] == ["Story shared-0", "Story first", "Story shared-1"]
+    # Every shared article was written once, by the pipeline that claimed it
+    assert all(count == 1 for count in short_calls.values())
+    assert all(count == 1 for count in detail_calls.values())
+
+
+ROBOTICS = Topic(
+    key="robotics",
+    name="Robotics",
+    queries=("humanoid robot news",),
+    focus="humanoid robots and factory automation",
+    competitors="Boston Dynamics and Tesla Optimus",
+)
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Record the prompt of every single-task crew and answer it with a fixed JSON reply."""
+    recorded: list[str] = []
+    reply = {
+        "short_summary": "Short.",
+        "detailed_article": "Detailed.",
+        "headline": "H",
+        "narrative": "N",
+        "trend_analysis": "T",
+        "product_leader_insights": "P",
+        "competition_analysis": "C",
+    }
+    
+    def run(agent, task):
+        recorded.append("\n".join([agent.role, agent.goal, agent.backstory, task.description]))
+        return SimpleNamespace(pydantic=None, raw=json.dumps(reply))
+    
+    monkeypatch.setattr(pipeline, "_run_single_task_crew", run)
+    return recorded
+
+
+def test_article_summaries_do_not_name_a_topic(prompts):
+    article = _raw("chips")
+    
+    summarize_article(None, article)
+    write_short_summary(None, article)
+    write_detailed_article(None, article, "Short.")
+    
+    assert len(prompts) == 3
+    assert not any("NVIDIA" in prompt or "Robotics" in prompt for prompt in prompts)
+
+
+def test_the_editorial_is_written_for_the_topic(prompts):
+    article = _raw("chips")
+    processed = ProcessedNewsArticle.from_raw(
+        article, ArticleSummary(short_summary="Short.", detailed_article="Detailed.")
+    )
+    
+    write_editorial(None, [processed], ROBOTICS)
+    write_editorial_from_summaries(None, [article], ["Short."], ROBOTICS)
+    
+    assert len(prompts) == 2
+    for prompt in prompts:
+        assert "Robotics" in prompt
+        assert "Boston Dynamics and Tesla Optimus" in prompt
+        assert "NVIDIA" not in prompt
+
+
+def test_the_reporter_searches_the_topic(prompts, monkeypatch):
+    def stop(agent, task):
+        prompts.append("\n".join([agent.goal, agent.backstory, task.description]))
+        raise RuntimeError("stop after the prompt")
+    
+    monkeypatch.setattr(pipeline, "_run_single_task_crew", stop)
+    
+    with pytest.raises(RuntimeError):
+        collect_raw_articles(None, ROBOTICS)
+    
+    assert "humanoid robots and factory automation" in prompts[0]
+    assert "NVIDIA" not in prompts[0]
@@ -0,0 +1,257 @@
+# =============================================================================
+#  Filename: test_resilience.py
+#
+#  Short Description: Tests of rate limiting, retries and circuit breaking
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import email.utils
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from NewsLetter2 import resilience as resilience_module
+from NewsLetter2.metrics import Span
+from NewsLetter2.resilience import (
+    RETRY_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    ExternalService,
+    RateLimiter,
+    ServiceError,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class _Clock:
+    """Stand-in for the time module whose sleep() advances monotonic()."""
+    
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps: list[float] = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resilience_module, "time", clock)
+    return clock
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers GET / with the next scripted status (200 once the script is used up)."""
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+    
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            status = server.script.pop(0) if server.script else 200
+        body = json.dumps({"status": status}).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "2")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.script = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server):
+    """Return one request to the stub, raising like the SerpAPI tool does."""
+    
+    def send():
+        response = requests.get(f"http://127.0.0.1:{server.server_address[1]}/", timeout=5)
+        if response.status_code in RETRY_STATUSES:
+            raise ServiceError(
+                "Stub",
+                response.status_code,
+                parse_retry_after(response.headers.get("Retry-After")),
+            )
+        response.raise_for_status()
+        return response.json()
+    
+    return send
+
+
+def _service(attempts: int = 5, failures: int = 3) -> ExternalService:
+    return ExternalService(
+        "Stub",
+        RateLimiter(0),
+        CircuitBreaker("Stub", failure_threshold=failures, cooldown_seconds=60),
+        attempts=attempts,
+        base_delay=0,
+    )
+
+
+def test_token_bucket_refills_and_goes_into_debt(clock):
+    bucket = TokenBucket(60)
+    
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    clock.now += 0.5
+    assert bucket.reserve(1) == pytest.approx(1.5)
+    
+    # Refill stops at the capacity
+    clock.now += 1_000
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_token_bucket_clamps_requests_and_can_be_disabled(clock):
+    assert TokenBucket(60).reserve(1_000) == 0.0
+    assert TokenBucket(0).reserve(1_000) == 0.0
+
+
+def test_rate_limiter_pause_holds_back_every_caller(clock):
+    limiter = RateLimiter(0)
+    limiter.pause(3)
+    
+    assert limiter.acquire() == pytest.approx(3)
+    assert limiter.acquire() == 0.0
+    assert clock.sleeps == [3]
+
+
+def test_circuit_breaker_cycle(clock):
+    breaker = CircuitBreaker("Stub", failure_threshold=2, cooldown_seconds=10)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    # After the cool-down a single probe is let through
+    clock.now += 10
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_a_failed_probe_reopens_the_circuit(clock):
+    breaker = CircuitBreaker("Stub", failure_threshold=2, cooldown_seconds=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+    breaker.record_failure()
+    
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(email.utils.format_datetime(when, usegmt=True)) == pytest.approx(30, abs=2)
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(email.utils.format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_retry_after_headers_of_client_errors_are_honoured(clock):
+    error = RuntimeError("rate limited")
+    error.status_code = 429
+    error.response = SimpleNamespace(status_code=429, headers={"retry-after-ms": "1500"})
+    calls = []
+    
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise error
+        return "ok"
+    
+    assert _service().call(flaky) == "ok"
+    assert clock.sleeps == [1.5]
+
+
+def test_throttled_calls_are_retried_after_retry_after(clock, stub):
+    stub.script = [429, 429]
+    service = _service()
+    span = Span(name="serpapi_request")
+    
+    assert service.call(_request(stub), span=span) == {"status": 200}
+    
+    assert stub.requests == 3
+    assert clock.sleeps == [2.0, 2.0]
+    assert span.retries == 2
+    stats = service.stats()
+    assert (stats["throttled"], stats["retries"], stats["failures"]) == (2, 2, 0)
+    assert stats["state"] == "closed"
+
+
+def test_throttled_calls_give_up_after_the_last_attempt(clock, stub):
+    stub.script = [429] * 10
+    service = _service(attempts=3)
+    
+    with pytest.raises(ServiceError) as raised:
+        service.call(_request(stub))
+    
+    assert raised.value.status_code == 429
+    assert stub.requests == 3
+    assert service.stats()["retries"] == 2
+    assert service.breaker.state == "closed"
+
+
+def test_server_errors_open_the_circuit(clock, stub):
+    stub.script = [503] * 10
+    service = _service(attempts=5, failures=2)
+    
+    with pytest.raises(ServiceError):
+        service.call(_request(stub))
+    assert stub.requests == 2
+    assert service.breaker.state == "open"
+    
+    with pytest.raises(CircuitOpenError):
+        service.call(_request(stub))
+    assert stub.requests == 2
+    assert service.stats()["rejected"] == 1
+
+
+def test_client_errors_are_not_retried(clock, stub):
+    stub.script = [404]
+    service = _service()
+    
+    with pytest.raises(requests.HTTPError):
+        service.call(_request(stub))
+    assert stub.requests == 1
+    assert service.stats()["retries"] == 0
@@ -0,0 +1,144 @@
+# =============================================================================
+#  Filename: test_search_cache.py
+#
+#  Short Description: Tests of the two-tier SerpAPI response cache
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import threading
+import time
+
+import pytest
+
+from NewsLetter2 import search_cache as search_cache_module
+from NewsLetter2.search_cache import SearchCache
+
+
+PARAMS = {"engine": "google_news", "q": "NVIDIA  AI", "api_key": "secret"}
+RESPONSE = {"news_results": [{"title": "Blackwell ships"}]}
+
+
+class _Clock:
+    """Stand-in for the time module with a settable time()."""
+    
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(search_cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(cache_dir=str(tmp_path), ttl_seconds=60, max_stale_seconds=600)
+
+
+def test_key_ignores_credentials_case_and_whitespace(cache):
+    variant = {"Q": "NVIDIA AI", "engine": "google_news", "api_key": "other", "output": "json"}
+    assert cache.make_key(PARAMS) == cache.make_key(variant)
+    assert cache.make_key(PARAMS) != cache.make_key({**PARAMS, "q": "AMD AI"})
+
+
+def test_fresh_entry_is_served_until_ttl(cache, clock):
+    cache.set(PARAMS, RESPONSE)
+    clock.now += 59
+    assert cache.get(PARAMS) == RESPONSE
+    clock.now += 2
+    assert cache.get(PARAMS) is None
+    assert cache.get(PARAMS, allow_stale=True) == RESPONSE
+    clock.now += 600
+    assert cache.get(PARAMS, allow_stale=True) is None
+
+
+def test_entry_survives_in_disk_tier(cache, tmp_path, clock):
+    cache.set(PARAMS, RESPONSE)
+    reloaded = SearchCache(cache_dir=str(tmp_path), ttl_seconds=60)
+    assert reloaded.get(PARAMS) == RESPONSE
+    assert reloaded.stats()["disk_hits"] == 1
+
+
+def test_fetch_error_serves_stale_entry(cache, clock):
+    cache.set(PARAMS, RESPONSE)
+    clock.now += 120
+    
+    def failing_fetch():
+        raise ConnectionError("SerpAPI unreachable")
+    
+    assert cache.get_or_fetch(PARAMS, failing_fetch) == RESPONSE
+    assert cache.get_or_fetch(PARAMS, lambda: {"error": "quota exceeded"}) == RESPONSE
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_fetch_error_without_stale_entry_is_raised(cache):
+    def failing_fetch():
+        raise ConnectionError("SerpAPI unreachable")
+    
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch(PARAMS, failing_fetch)
+
+
+def test_concurrent_misses_are_coalesced(cache):
+    calls = []
+    release = threading.Event()
+    
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return RESPONSE
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch(PARAMS, slow_fetch)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    # Let the followers find the in-flight fetch before it completes
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert results == [RESPONSE] * 4
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_failed_fetch_is_raised_to_waiters_and_not_cached(cache):
+    release = threading.Event()
+    errors = []
+    
+    def failing_fetch():
+        release.wait(5)
+        raise ConnectionError("SerpAPI unreachable")
+    
+    def search():
+        try:
+            cache.get_or_fetch(PARAMS, failing_fetch)
+        except ConnectionError as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=search) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(errors) == 2
+    assert cache.get_or_fetch(PARAMS, lambda: RESPONSE) == RESPONSE
@@ -0,0 +1,79 @@
+# =============================================================================
+#  Filename: test_search_index.py
+#
+#  Short Description: Tests of the FTS5 full-text index of cached editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2.search_index import SearchIndex, build_match_query
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(tmp_path / "search.db")
+    yield index
+    index.close()
+
+
+def test_match_query_quotes_words_and_prefixes_the_last():
+    assert build_match_query("Blackwell GPU") == '"Blackwell" "GPU"*'
+    assert build_match_query('NVLink OR "chips" -AMD') == '"NVLink" "OR" "chips" "AMD"*'
+    assert build_match_query("  ?! ") is None
+
+
+def test_title_matches_rank_above_body_matches(index):
+    newsletter = make_newsletter("Hopper")
+    newsletter.articles[4].title = "Rubin roadmap revealed"
+    newsletter.articles[7].detailed_article += " A brief mention of Rubin."
+    index.index_edition(datetime(2025, 10, 3), "a" * 64, newsletter)
+    
+    hits = index.search("rubin")
+    
+    assert [hit.article_index for hit in hits] == [4, 7]
+    assert hits[0].score < hits[1].score
+    assert "**Rubin**" in hits[1].snippet
+
+
+def test_editorial_is_indexed_without_an_article_index(index):
+    index.index_edition(datetime(2025, 10, 3), "a" * 64, make_newsletter())
+    
+    hits = index.search("liquid cooled racks")
+    
+    assert len(hits) == 1
+    assert hits[0].article_index is None
+    assert hits[0].title == "Blackwell ramps across the data center"
+
+
+def test_porter_stemming_and_prefix_search(index):
+    index.index_edition(datetime(2025, 10, 3), "a" * 64, make_newsletter())
+    
+    assert index.search("ramping")
+    assert index.search("accel")
+    assert index.search("no such words anywhere") == []
+
+
+def test_reindexing_replaces_an_edition(index):
+    date = datetime(2025, 10, 3)
+    index.index_edition(date, "a" * 64, make_newsletter("Hopper"))
+    index.index_edition(date, "b" * 64, make_newsletter("Rubin"))
+    index.index_edition(datetime(2025, 10, 4), "c" * 64, make_newsletter("Grace"))
+    
+    assert index.search("hopper") == []
+    assert {hit.date for hit in index.search("rubin")} == {date}
+    assert index.checksums() == {"2025-10-03": "b" * 64, "2025-10-04": "c" * 64}
+    
+    index.remove(date)
+    assert index.search("rubin") == []
+    assert index.checksums() == {"2025-10-04": "c" * 64}
+
+
+def test_limit(index):
+    index.index_edition(datetime(2025, 10, 3), "a" * 64, make_newsletter())
+    assert len(index.search("story", limit=3)) == 3
@@ -0,0 +1,98 @@
+# =============================================================================
+#  Filename: test_static_export.py
+#
+#  Short Description: Tests of the static HTML export of cached editions
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2.cache_manager import CacheManager
+from NewsLetter2.static_export import StaticExporter
+from NewsLetter2.thumbnails import ThumbnailCache
+
+
+DATE = datetime(2025, 10, 1)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CacheManager(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def exporter(manager, tmp_path):
+    thumbnails = ThumbnailCache(cache_dir=str(tmp_path / "thumbnails"))
+    return StaticExporter(manager, out_dir=str(tmp_path / "site"), thumbnails=thumbnails)
+
+
+def test_an_edition_is_rendered_once_until_it_changes(manager, exporter):
+    manager.save_to_cache(make_newsletter(), date=DATE)
+    
+    assert exporter.export_edition(DATE)
+    
+    edition_dir = exporter.out_dir / "2025-10-01"
+    landing = (edition_dir / "index.html").read_text(encoding="utf-8")
+    assert "Blackwell ramps across the data center" in landing
+    assert 'href="articles/10.html"' in landing
+    article = (edition_dir / "articles" / "01.html").read_text(encoding="utf-8")
+    assert "Détails № 0" in article
+    assert '2025-10-01/index.html' in (exporter.out_dir / "index.html").read_text(encoding="utf-8")
+    assert (exporter.out_dir / "styles.css").exists()
+    
+    assert not exporter.export_edition(DATE)
+    assert exporter.export_edition(DATE, force=True)
+    
+    manager.save_to_cache(make_newsletter("Rubin"), date=DATE)
+    assert exporter.export_edition(DATE)
+    assert "Rubin ramps" in (edition_dir / "index.html").read_text(encoding="utf-8")
+
+
+def test_missing_editions_are_not_exported(exporter):
+    assert not exporter.export_edition(DATE)
+
+
+def test_model_html_is_escaped(manager, exporter):
+    newsletter = make_newsletter()
+    newsletter.editorial.narrative = "<script>alert(1)</script> **bold**"
+    manager.save_to_cache(newsletter, date=DATE)
+    
+    exporter.export_edition(DATE)
+    
+    landing = (exporter.out_dir / "2025-10-01" / "index.html").read_text(encoding="utf-8")
+    assert "<script>" not in landing
+    assert "&lt;script&gt;" in landing
+    assert "<strong>bold</strong>" in landing
+
+
+def test_unfetched_thumbnails_link_to_their_source(manager, exporter):
+    newsletter = make_newsletter()
+    newsletter.articles[0].thumbnail = "https://img.example.com/a.png?w=1&h=2"
+    manager.save_to_cache(newsletter, date=DATE)
+    
+    exporter.export_edition(DATE)
+    
+    article = (exporter.out_dir / "2025-10-01" / "articles" / "01.html").read_text(encoding="utf-8")
+    assert '<img src="https://img.example.com/a.png?w=1&amp;h=2" alt="">' in article
+
+
+def test_concurrent_exports_share_the_site_files(manager, exporter):
+    dates = [datetime(2025, 10, day) for day in range(1, 9)]
+    for date in dates:
+        manager.save_to_cache(make_newsletter(f"Topic{date.day}"), date=date)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        exported = list(executor.map(exporter.export_edition, dates))
+    
+    assert all(exported)
+    assert not list(exporter.out_dir.rglob("*.tmp"))
+    # The archive written last may predate other exports; a re-export lists all
+    exporter.export_edition(dates[0], force=True)
+    archive = (exporter.out_dir / "index.html").read_text(encoding="utf-8")
+    assert all(f"{date:%Y-%m-%d}/index.html" in archive for date in dates)
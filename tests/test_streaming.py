@@ -0,0 +1,127 @@
+# =============================================================================
+#  Filename: test_streaming.py
+#
+#  Short Description: Tests of the progressive publication of an edition
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import pytest
+from conftest import make_newsletter
+
+from NewsLetter2 import pipeline
+from NewsLetter2.models import ArticleSummary, ProcessedNewsArticle, RawNewsArticle
+from NewsLetter2.streaming import EditionStream
+
+
+def _raw(count: int) -> list[RawNewsArticle]:
+    return [
+        RawNewsArticle(title=f"Story {n}", source="Wire", url=f"https://news.example.com/{n}", snippet="...")
+        for n in range(count)
+    ]
+
+
+def _processed(article: RawNewsArticle) -> ProcessedNewsArticle:
+    return ProcessedNewsArticle.from_raw(
+        article, ArticleSummary(short_summary="Short.", detailed_article="Detailed.")
+    )
+
+
+def test_snapshots_show_what_is_published_so_far():
+    stream = EditionStream()
+    raw = _raw(3)
+    
+    stream.set_stage("editor")
+    stream.publish_raw_articles(raw)
+    stream.publish_article(2, _processed(raw[2]))
+    snapshot = stream.snapshot()
+    
+    assert snapshot.stage == "editor"
+    assert [article is not None for article in snapshot.articles] == [False, False, True]
+    assert snapshot.editorial is None
+    
+    # Snapshots are copies, unaffected by later updates
+    stream.publish_article(0, _processed(raw[0]))
+    assert snapshot.articles[0] is None
+    assert stream.snapshot().articles[0] is not None
+
+
+def test_listeners_get_every_event_and_their_errors_are_ignored():
+    stream = EditionStream()
+    events = []
+    
+    def broken(event, snapshot):
+        raise RuntimeError("listener bug")
+    
+    stream.subscribe(broken)
+    stream.subscribe(lambda event, snapshot: events.append((event, snapshot.stage)))
+    newsletter = make_newsletter()
+    
+    stream.set_stage("senior_editor")
+    stream.publish_editorial(newsletter.editorial)
+    stream.complete(newsletter)
+    
+    assert events == [("stage", "senior_editor"), ("editorial", "senior_editor"), ("complete", "done")]
+    assert stream.done
+    assert stream.wait(0)
+    assert stream.newsletter is newsletter
+
+
+def test_a_failed_generation_finishes_the_stream():
+    stream = EditionStream()
+    
+    stream.fail(RuntimeError("search quota exhausted"))
+    
+    assert stream.wait(0)
+    assert stream.newsletter is None
+    assert (stream.snapshot().stage, stream.snapshot().error) == ("failed", "search quota exhausted")
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Staged pipeline whose stages return fixed results instantly."""
+    newsletter = make_newsletter()
+    raw = _raw(10)
+    monkeypatch.setattr(pipeline, "collect_raw_articles", lambda llm, topic: raw)
+    monkeypatch.setattr(pipeline.thumbnail_cache, "fetch_all", lambda urls: 0)
+    monkeypatch.setattr(pipeline, "summarize_article", lambda llm, article: _processed(article))
+    monkeypatch.setattr(pipeline, "write_editorial", lambda llm, articles, topic: newsletter.editorial)
+    return raw
+
+
+def test_the_pipeline_publishes_each_stage_as_it_completes(stages):
+    stream = EditionStream()
+    events = []
+    stream.subscribe(lambda event, snapshot: events.append((event, snapshot)))
+    llms = {"reporter": None, "editor": None, "senior_editor": None}
+    
+    newsletter = pipeline.run_parallel_pipeline(llms, incremental=False, stream=stream, pipelined=False)
+    
+    names = [event for event, _ in events]
+    assert names.index("raw_articles") < names.index("article")
+    assert names.count("article") == 10
+    assert max(i for i, name in enumerate(names) if name == "article") < names.index("editorial")
+    assert names[-1] == "complete"
+    
+    first_article = next(snapshot for event, snapshot in events if event == "article")
+    assert len(first_article.raw_articles) == 10
+    assert first_article.editorial is None
+    assert stream.newsletter is newsletter
+    assert [article.title for article in newsletter.articles] == [article.title for article in stages]
+
+
+def test_a_failing_stage_fails_the_stream(stages, monkeypatch):
+    def fail(llm, articles, topic):
+        raise RuntimeError("model unavailable")
+    
+    monkeypatch.setattr(pipeline, "write_editorial", fail)
+    stream = EditionStream()
+    llms = {"reporter": None, "editor": None, "senior_editor": None}
+    
+    with pytest.raises(RuntimeError):
+        pipeline.run_parallel_pipeline(llms, incremental=False, stream=stream, pipelined=False)
+    
+    assert stream.done
+    assert stream.snapshot().error == "model unavailable"
+    assert sum(article is not None for article in stream.snapshot().articles) == 10
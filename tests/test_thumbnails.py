@@ -0,0 +1,122 @@
+# =============================================================================
+#  Filename: test_thumbnails.py
+#
+#  Short Description: Tests of the local thumbnail cache and its manifest
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import io
+import json
+import threading
+
+import pytest
+from PIL import Image
+
+from NewsLetter2.thumbnails import ThumbnailCache
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.content = content
+    
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _Session:
+    """Serves a differently coloured PNG for every URL."""
+    
+    def get(self, url, timeout=None, headers=None):
+        image = Image.new("RGB", (1200, 400), (sum(url.encode()) % 256, 80, 160))
+        output = io.BytesIO()
+        image.save(output, format="PNG")
+        return _Response(output.getvalue())
+
+
+def _cache(path) -> ThumbnailCache:
+    return ThumbnailCache(cache_dir=str(path), size=(64, 36))
+
+
+def test_fetch_resizes_and_records_the_thumbnail(tmp_path):
+    cache = _cache(tmp_path)
+    
+    path = cache.fetch("https://img.example.com/a.png", session=_Session())
+    
+    assert cache.local_path("https://img.example.com/a.png") == path
+    with Image.open(path) as image:
+        assert (image.format, image.size) == ("JPEG", (64, 36))
+    assert cache.fetch("https://img.example.com/a.png", session=None) == path
+
+
+def test_failed_downloads_are_skipped(tmp_path):
+    class _Broken:
+        def get(self, url, timeout=None, headers=None):
+            raise OSError("connection refused")
+    
+    cache = _cache(tmp_path)
+    
+    assert cache.fetch("https://img.example.com/a.png", session=_Broken()) is None
+    assert cache.local_path("https://img.example.com/a.png") is None
+
+
+def test_concurrent_manifest_saves_do_not_collide(tmp_path):
+    cache = _cache(tmp_path)
+    errors = []
+    
+    def save(worker: int) -> None:
+        for n in range(50):
+            with cache._lock:
+                cache._manifest[f"https://img.example.com/{worker}/{n}.png"] = f"{worker}-{n}.jpg"
+            try:
+                cache._save_manifest()
+            except OSError as e:
+                errors.append(e)
+    
+    threads = [threading.Thread(target=save, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert len(json.loads((tmp_path / "manifest.json").read_text())) == 200
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_thumbnails_fetched_by_another_process_are_found(tmp_path):
+    reader = _cache(tmp_path)
+    writer = _cache(tmp_path)
+    assert reader.local_path("https://img.example.com/a.png") is None
+    
+    path = writer.fetch("https://img.example.com/a.png", session=_Session())
+    writer._save_manifest()
+    
+    assert reader.local_path("https://img.example.com/a.png") == path
+
+
+def test_saves_merge_the_manifest_on_disk(tmp_path):
+    first = _cache(tmp_path)
+    second = _cache(tmp_path)
+    
+    first.fetch("https://img.example.com/a.png", session=_Session())
+    first._save_manifest()
+    second.fetch("https://img.example.com/b.png", session=_Session())
+    second._save_manifest()
+    
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert sorted(manifest) == ["https://img.example.com/a.png", "https://img.example.com/b.png"]
+
+
+@pytest.mark.parametrize("url", [None, ""])
+def test_articles_without_an_image_have_no_source(tmp_path, url):
+    assert _cache(tmp_path).image_source(url) is None
+
+
+def test_unfetched_images_are_shown_from_their_source(tmp_path):
+    cache = _cache(tmp_path)
+    path = cache.fetch("https://img.example.com/a.png", session=_Session())
+    
+    assert cache.image_source("https://img.example.com/a.png") == str(path)
+    assert cache.image_source("https://img.example.com/b.png") == "https://img.example.com/b.png"
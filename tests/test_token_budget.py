@@ -0,0 +1,76 @@
+# =============================================================================
+#  Filename: test_token_budget.py
+#
+#  Short Description: Tests of token counting and water-filling budgets
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+from NewsLetter2.token_budget import count_tokens, fit_to_budget, truncate_to_tokens
+
+
+def _words(count: int) -> str:
+    return " ".join(f"word{n % 50}" for n in range(count))
+
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("NVIDIA ships Blackwell") < count_tokens(_words(40))
+
+
+def test_truncate_to_tokens():
+    text = _words(200)
+    short = truncate_to_tokens(text, 30)
+    
+    assert short.endswith("…")
+    assert count_tokens(short) <= 30
+    assert text.startswith(short[:-1])
+    assert truncate_to_tokens("short text", 30) == "short text"
+    assert truncate_to_tokens(text, 0) == ""
+
+
+def test_disabled_or_sufficient_budget_keeps_everything():
+    fixed = ["a|", "b|"]
+    expandable = [_words(50), _words(60)]
+    
+    assert fit_to_budget(fixed, expandable, 0) == (2, expandable)
+    assert fit_to_budget(fixed, expandable, 10_000) == (2, expandable)
+
+
+def test_water_filling_keeps_short_parts_and_splits_the_rest_evenly():
+    fixed = ["[1] Title one\n", "[2] Title two\n", "[3] Title three\n"]
+    short = "A short snippet."
+    expandable = [short, _words(400), _words(300)]
+    budget = sum(count_tokens(text) for text in fixed) + count_tokens(short) + 200
+    
+    kept, trimmed = fit_to_budget(fixed, expandable, budget)
+    
+    assert kept == 3
+    assert trimmed[0] == short
+    sizes = [count_tokens(text) for text in trimmed[1:]]
+    assert all(80 <= size <= 100 for size in sizes)
+    assert sum(count_tokens(text) for text in fixed + trimmed) <= budget
+
+
+def test_shares_below_the_minimum_are_dropped():
+    fixed = [f"[{n}] Title\n" for n in range(10)]
+    expandable = [_words(100)] * 10
+    budget = sum(count_tokens(text) for text in fixed) + 50
+    
+    kept, trimmed = fit_to_budget(fixed, expandable, budget)
+    
+    assert kept == 10
+    assert trimmed == [""] * 10
+
+
+def test_trailing_items_are_dropped_when_fixed_parts_exceed_the_budget():
+    fixed = [_words(20) for _ in range(5)]
+    expandable = [_words(20) for _ in range(5)]
+    budget = count_tokens(fixed[0]) * 3 + 5
+    
+    kept, trimmed = fit_to_budget(fixed, expandable, budget)
+    
+    assert kept == 3
+    assert len(trimmed) == 3
+    assert trimmed == ["", "", ""]
@@ -0,0 +1,99 @@
+# =============================================================================
+#  Filename: test_tools.py
+#
+#  Short Description: Tests of the candidate id registry of the search tool
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import hashlib
+import threading
+
+from NewsLetter2 import tools
+from NewsLetter2.tools import CandidateRegistry, candidate_scope, register_candidates, resolve_candidate
+from NewsLetter2.url_utils import canonicalize_url
+
+
+def _article(n: int) -> dict:
+    return {"title": f"Story {n}", "source": "Wire", "url": f"https://news.example.com/story/{n}"}
+
+
+def _colliding_articles() -> tuple[dict, dict]:
+    """Find two articles whose URLs share the first six hex digits of their hash."""
+    seen: dict[str, dict] = {}
+    n = 0
+    while True:
+        article = _article(n)
+        prefix = hashlib.sha1(canonicalize_url(article["url"]).encode("utf-8")).hexdigest()[:6]
+        if prefix in seen:
+            return seen[prefix], article
+        seen[prefix] = article
+        n += 1
+
+
+def test_ids_are_stable_and_canonical():
+    registry = CandidateRegistry()
+    first = registry.register(_article(1))
+    
+    assert len(first) == 6
+    assert registry.register({**_article(1), "url": "https://news.example.com/story/1?utm_source=x"}) == first
+    assert registry.register(_article(2)) != first
+    assert len(registry) == 2
+
+
+def test_a_colliding_id_is_lengthened():
+    a, b = _colliding_articles()
+    registry = CandidateRegistry()
+    id_a = registry.register(a)
+    id_b = registry.register(b)
+    
+    assert len(id_b) == 8 and id_b.startswith(id_a)
+    assert registry.resolve(id_a) is a
+    assert registry.resolve(id_b) is b
+    assert registry.register(b) == id_b
+
+
+def test_the_bounded_registry_evicts_the_oldest():
+    registry = CandidateRegistry(max_size=2)
+    ids = [registry.register(_article(n)) for n in range(3)]
+    
+    assert registry.resolve(ids[0]) is None
+    assert registry.resolve(ids[2])["title"] == "Story 2"
+
+
+def test_a_scope_is_not_evicted_by_other_generations():
+    results = {}
+    registered = threading.Event()
+    flooded = threading.Event()
+    
+    def generation():
+        with candidate_scope():
+            ids = register_candidates([_article(n) for n in range(10)])
+            registered.set()
+            flooded.wait(5)
+            results["scoped"] = [resolve_candidate(article_id) for article_id in ids]
+    
+    thread = threading.Thread(target=generation)
+    thread.start()
+    registered.wait(5)
+    
+    # Far more candidates than the process-wide registry holds
+    ids = register_candidates([_article(n) for n in range(100, 100 + tools._CANDIDATE_REGISTRY_SIZE + 10)])
+    flooded.set()
+    thread.join()
+    
+    assert [record["title"] for record in results["scoped"]] == [f"Story {n}" for n in range(10)]
+    assert resolve_candidate(ids[0]) is None
+    assert resolve_candidate(ids[-1])["title"].startswith("Story")
+
+
+def test_resolve_keeps_record_fields_over_model_text():
+    with candidate_scope():
+        (article_id,) = register_candidates([_article(1)])
+        record = resolve_candidate({"id": article_id, "title": "Rewritten", "why": "Big news"})
+    
+    assert record["title"] == "Story 1"
+    assert record["why"] == "Big news"
+    assert resolve_candidate({"url": "https://example.com/a"}) == {"url": "https://example.com/a"}
+    assert resolve_candidate("ffffffffffff") is None
@@ -0,0 +1,45 @@
+# =============================================================================
+#  Filename: test_url_utils.py
+#
+#  Short Description: Tests of URL canonicalization
+#
+#  Creation date: 2025-10-16
+#  Author: Shrinivas Deshpande
+# =============================================================================
+
+import pytest
+
+from NewsLetter2.url_utils import canonicalize_url
+
+
+CANONICAL = "https://example.com/news/blackwell"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/news/blackwell",
+        "http://example.com/news/blackwell",
+        "https://www.Example.COM/news/blackwell/",
+        "https://example.com:443/news/blackwell#comments",
+        "https://example.com/news/blackwell?utm_source=google&utm_medium=news",
+        "https://example.com/news/blackwell?fbclid=abc&ref=homepage",
+        "  https://example.com/news/blackwell  ",
+    ],
+)
+def test_variants_of_one_page_are_equal(url):
+    assert canonicalize_url(url) == CANONICAL
+
+
+def test_meaningful_query_is_kept_and_sorted():
+    assert canonicalize_url("https://example.com/a?page=2&id=7&utm_campaign=x") == "https://example.com/a?id=7&page=2"
+
+
+def test_different_pages_stay_different():
+    assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url("https://example.com/a?id=2")
+    assert canonicalize_url("https://example.com:8080/a") != canonicalize_url("https://example.com/a")
+
+
+@pytest.mark.parametrize("url", ["not a url", "/relative/path", ""])
+def test_unparseable_input_is_returned_unchanged(url):
+    assert canonicalize_url(url) == url